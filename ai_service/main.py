@@ -6,9 +6,12 @@ Dies ist der Haupt-Endpunkt für den KI-Dienst, der als serverloser Container
 in der Google Cloud laufen soll. Er verwendet FastAPI, um einen Webserver bereitzustellen.
 """
 
+import asyncio
+import json
 import logging
 import sys
 import os
+import threading
 
 from pathlib import Path
 from pydantic import BaseModel
@@ -18,7 +21,10 @@ from pydantic import BaseModel
 project_root = Path(__file__).resolve().parent.parent
 sys.path.append(str(project_root))
 
-from fastapi import FastAPI, HTTPException
+import anyio
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 # Importiere den bestehenden InferenceService
 from class_folder.core.inference_service import InferenceService
 
@@ -38,6 +44,11 @@ app = FastAPI(
 # Wenn keine Anfragen mehr kommen, wird der Container heruntergefahren (Skalierung auf Null).
 
 inference_service: InferenceService | None = None
+# Adapterwechsel und Generierung teilen sich ein Modell und dürfen sich nicht überlappen,
+# auch nicht mit einem laufenden Stream.
+generation_lock = threading.Lock()
+GENERATION_LOCK_POLL_SECONDS = 0.02  # Wartetakt eines Streams auf den Generierungs-Lock
+
 @app.on_event("startup")
 def load_model():
     """Wird beim Start der FastAPI-Anwendung ausgeführt, um das Modell zu laden."""
@@ -83,11 +94,8 @@ async def generate_text(request: InferenceRequest):
         logger.info(f"🎯 Anfrage für Welt '{request.world_name}' mit Adapter-Typ '{request.adapter_type}' erhalten.")
         logger.info(f"📝 Prompt-Preview (erste 200 Zeichen): {request.prompt[:200]}...")
         
-        # Lade den passenden Adapter für die Anfrage
-        inference_service.switch_to_adapter(request.adapter_type, request.world_name)
-        
-        # Generiere die Antwort
-        generated_text = inference_service.generate_story_response(request.prompt)
+        # Läuft im Threadpool, damit laufende Streams weiter bedient werden können
+        generated_text = await run_in_threadpool(_generate_locked, request)
         
         logger.info(f"✅ Antwort generiert ({len(generated_text)} Zeichen) für Adapter '{request.adapter_type}'")
         
@@ -99,6 +107,72 @@ async def generate_text(request: InferenceRequest):
         logger.error(f"❌ Fehler während der Inferenz: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Ein interner Fehler ist aufgetreten: {e}")
 
+def _generate_locked(request: InferenceRequest) -> str:
+    """Lädt den passenden Adapter und generiert die Antwort unter dem Generierungs-Lock."""
+    with generation_lock:
+        inference_service.switch_to_adapter(request.adapter_type, request.world_name)
+        return inference_service.generate_story_response(request.prompt)
+
+async def _acquire_generation_lock():
+    """
+    Wartet im Event-Loop auf den Generierungs-Lock. Ein blockierendes acquire im Threadpool
+    würde den Lock auch dann noch nehmen, wenn die Anfrage inzwischen abgebrochen wurde.
+    """
+    while not generation_lock.acquire(blocking=False):
+        await asyncio.sleep(GENERATION_LOCK_POLL_SECONDS)
+
+
+async def _stream_generation(request: InferenceRequest, http_request: Request):
+    """
+    Liefert die Antwort als NDJSON: eine Zeile {"token": ...} pro Textstück,
+    abschließend {"done": true, "generated_text": ...} mit dem vollständigen Text.
+    Der Lock wird explizit genommen und in jedem Fall freigegeben; trennt der Client
+    die Verbindung, wird der Stream des Modells geschlossen und die Generierung bricht ab.
+    """
+    chunks = []
+    await _acquire_generation_lock()
+    stream = None
+    try:
+        await run_in_threadpool(inference_service.switch_to_adapter, request.adapter_type, request.world_name)
+        stream = inference_service.generate_story_response_stream(request.prompt)
+        while True:
+            if await http_request.is_disconnected():
+                logger.info(f"Client hat die Verbindung getrennt, Generierung für '{request.world_name}' abgebrochen.")
+                return
+            # Jedes Textstück blockiert bis zum nächsten Token und wird daher im Threadpool geholt
+            chunk = await run_in_threadpool(next, stream, None)
+            if chunk is None:
+                break
+            chunks.append(chunk)
+            yield json.dumps({"token": chunk}, ensure_ascii=False) + "\n"
+    except Exception as e:
+        logger.error(f"❌ Fehler während der Streaming-Inferenz: {e}", exc_info=True)
+        yield json.dumps({"error": f"Ein interner Fehler ist aufgetreten: {e}"}, ensure_ascii=False) + "\n"
+        return
+    finally:
+        # Auch bei Abbruch (Cancel) den Generierungs-Thread beenden, bevor der Lock frei wird
+        with anyio.CancelScope(shield=True):
+            if stream is not None:
+                await run_in_threadpool(stream.close)
+            generation_lock.release()
+    generated_text = "".join(chunks).strip()
+    logger.info(f"✅ Antwort gestreamt ({len(generated_text)} Zeichen) für Adapter '{request.adapter_type}'")
+    yield json.dumps({"done": True, "generated_text": generated_text,
+                      "model_load_status": inference_service.load_status}, ensure_ascii=False) + "\n"
+
+@app.post("/generate/stream")
+async def generate_text_stream(request: InferenceRequest, http_request: Request):
+    """
+    Wie /generate, sendet den Text aber stückweise (NDJSON), sobald das Modell
+    ihn erzeugt. Das erste Textstück kommt nach dem ersten Token statt nach der
+    vollständigen Generierung.
+    """
+    if not inference_service or not inference_service.base_model_loaded:
+        raise HTTPException(status_code=503, detail="KI-Modell ist nicht verfügbar oder wird noch geladen.")
+
+    logger.info(f"🎯 Streaming-Anfrage für Welt '{request.world_name}' mit Adapter-Typ '{request.adapter_type}' erhalten.")
+    return StreamingResponse(_stream_generation(request, http_request), media_type="application/x-ndjson")
+
 @app.get("/health")
 async def health_check():
     """
@@ -0,0 +1,232 @@
+# class_folder/core/ai_service_client.py
+# -*- coding: utf-8 -*-
+
+"""
+Langlebiger, gepoolter HTTP-Client für die Kommunikation Backend -> KI-Dienst.
+Statt pro Anfrage einen neuen httpx.AsyncClient (und damit einen neuen
+TLS-Handshake) aufzubauen, wird ein Client beim Serverstart erzeugt und beim
+Herunterfahren geschlossen. Verbindungen werden per Keep-Alive wiederverwendet,
+HTTP/2 ist optional, und jede Phase (ANALYSIS/NARRATIVE) hat eigene Timeouts.
+"""
+
+import json
+import logging
+import time
+from typing import Optional, Dict, Any, AsyncIterator
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - nur für die Verfügbarkeitsprüfung von HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Lese-Timeouts pro Adapter-Typ in Sekunden. Analysen sind kurz, Erzählungen lang.
+DEFAULT_PHASE_TIMEOUTS = {
+    "ANALYSIS": 90.0,
+    "NARRATIVE": 240.0,
+}
+
+
+class AIServiceClient:
+    """Kapselt einen geteilten httpx.AsyncClient samt Pool-Statistiken."""
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 120.0,
+        http2: bool = False,
+        connect_timeout: float = 10.0,
+        pool_timeout: float = 30.0,
+        default_read_timeout: float = 300.0,
+        phase_timeouts: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            base_url: Basis-URL des KI-Dienstes.
+            max_connections: Maximale Anzahl gleichzeitiger Verbindungen im Pool.
+            max_keepalive_connections: Wie viele Leerlauf-Verbindungen offen gehalten werden.
+            keepalive_expiry: Nach so vielen Sekunden Leerlauf wird eine Verbindung geschlossen.
+            http2: HTTP/2 verwenden (benötigt das Paket 'h2').
+            connect_timeout: Timeout für den Verbindungsaufbau.
+            pool_timeout: Maximale Wartezeit auf eine freie Verbindung aus dem Pool.
+            default_read_timeout: Lese-Timeout für unbekannte Adapter-Typen.
+            phase_timeouts: Lese-Timeouts pro Adapter-Typ, überschreibt die Standardwerte.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 angefordert, aber das Paket 'h2' ist nicht installiert. Verwende HTTP/1.1.")
+            http2 = False
+        self.http2 = http2
+        self.connect_timeout = connect_timeout
+        self.pool_timeout = pool_timeout
+        self.default_read_timeout = default_read_timeout
+        self.phase_timeouts = {**DEFAULT_PHASE_TIMEOUTS, **(phase_timeouts or {})}
+        self.client: Optional[httpx.AsyncClient] = None
+
+        self.stats = {"requests": 0, "errors": 0, "timeouts": 0, "in_flight": 0, "max_in_flight": 0,
+                      "new_connections": 0}
+        self.phase_stats: Dict[str, Dict[str, float]] = {}
+
+    async def start(self):
+        """Erzeugt den geteilten Client. Wird beim Serverstart aufgerufen."""
+        if self.client is not None:
+            return
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=self.limits,
+            http2=self.http2,
+            timeout=self._timeout_for(None)
+        )
+        logger.info(f"AIServiceClient gestartet für {self.base_url} (HTTP/2: {self.http2}, "
+                    f"max. {self.limits.max_connections} Verbindungen, "
+                    f"{self.limits.max_keepalive_connections} Keep-Alive).")
+
+    async def close(self):
+        """Schließt alle Verbindungen. Wird beim Herunterfahren aufgerufen."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            logger.info("AIServiceClient geschlossen.")
+
+    def _timeout_for(self, adapter_type: Optional[str]) -> httpx.Timeout:
+        read_timeout = self.phase_timeouts.get(adapter_type, self.default_read_timeout)
+        return httpx.Timeout(read_timeout, connect=self.connect_timeout, pool=self.pool_timeout)
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        """httpcore-Trace-Hook: zählt neu aufgebaute Verbindungen (im Gegensatz zu wiederverwendeten)."""
+        if event_name == "connection.connect_tcp.complete":
+            self.stats["new_connections"] += 1
+
+    async def generate(self, prompt: str, world_name: str, adapter_type: str, headers: Optional[Dict[str, str]] = None) -> str:
+        """
+        Sendet eine Generierungs-Anfrage an den KI-Dienst und gibt den Text zurück.
+        httpx-Fehler werden an den Aufrufer weitergereicht.
+        """
+        request_data = {"prompt": prompt, "world_name": world_name, "adapter_type": adapter_type}
+        response = await self.request("POST", "/generate", adapter_type=adapter_type, json=request_data, headers=headers)
+        response.raise_for_status()
+        return response.json()["generated_text"]
+
+    async def generate_stream(self, prompt: str, world_name: str, adapter_type: str,
+                              headers: Optional[Dict[str, str]] = None) -> AsyncIterator[str]:
+        """
+        Streamt eine Generierung über /generate/stream und liefert die Textstücke,
+        sobald sie ankommen. httpx-Fehler werden an den Aufrufer weitergereicht,
+        ein vom Dienst gemeldeter Fehler als RuntimeError.
+        """
+        if self.client is None:
+            await self.start()
+
+        request_data = {"prompt": prompt, "world_name": world_name, "adapter_type": adapter_type}
+        phase = f"{adapter_type}_STREAM"
+        self.stats["requests"] += 1
+        self.stats["in_flight"] += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+        start = time.perf_counter()
+        first_chunk_seconds = None
+        try:
+            async with self.client.stream("POST", "/generate/stream", json=request_data, headers=headers,
+                                          timeout=self._timeout_for(adapter_type),
+                                          extensions={"trace": self._trace}) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    message = json.loads(line)
+                    if "error" in message:
+                        raise RuntimeError(message["error"])
+                    if message.get("done"):
+                        break
+                    if first_chunk_seconds is None:
+                        first_chunk_seconds = time.perf_counter() - start
+                    yield message.get("token", "")
+        except httpx.TimeoutException:
+            self.stats["timeouts"] += 1
+            self.stats["errors"] += 1
+            raise
+        except httpx.HTTPError:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self.stats["in_flight"] -= 1
+            self._record_phase(phase, time.perf_counter() - start, first_chunk_seconds)
+
+    async def request(self, method: str, path: str, adapter_type: Optional[str] = None,
+                      timeout: Optional[float] = None, **kwargs) -> httpx.Response:
+        """Führt eine beliebige Anfrage über den geteilten Client aus und erfasst Kennzahlen."""
+        if self.client is None:
+            await self.start()
+
+        phase = adapter_type or "OTHER"
+        request_timeout = httpx.Timeout(timeout) if timeout is not None else self._timeout_for(adapter_type)
+        self.stats["requests"] += 1
+        self.stats["in_flight"] += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+        start = time.perf_counter()
+        try:
+            return await self.client.request(method, path, timeout=request_timeout,
+                                             extensions={"trace": self._trace}, **kwargs)
+        except httpx.TimeoutException:
+            self.stats["timeouts"] += 1
+            self.stats["errors"] += 1
+            raise
+        except httpx.HTTPError:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self.stats["in_flight"] -= 1
+            self._record_phase(phase, time.perf_counter() - start)
+
+    def _record_phase(self, phase: str, seconds: float, first_chunk_seconds: Optional[float] = None):
+        entry = self.phase_stats.setdefault(phase, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+        entry["count"] += 1
+        entry["total_seconds"] += seconds
+        entry["max_seconds"] = max(entry["max_seconds"], seconds)
+        if first_chunk_seconds is not None:
+            # Zeit bis zum ersten Textstück (nur bei Streams)
+            entry["first_chunk_count"] = entry.get("first_chunk_count", 0) + 1
+            entry["total_first_chunk_seconds"] = entry.get("total_first_chunk_seconds", 0.0) + first_chunk_seconds
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Liest den Zustand des Verbindungspools aus (offene, belegte, freie Verbindungen)."""
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for c in connections if getattr(c, "is_idle", lambda: False)())
+        return {
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "busy_connections": len(connections) - idle,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Liefert Anfrage-, Phasen- und Pool-Kennzahlen zur Dimensionierung des Pools."""
+        phases = {
+            phase: {
+                "count": int(entry["count"]),
+                "avg_seconds": round(entry["total_seconds"] / entry["count"], 3) if entry["count"] else 0.0,
+                "max_seconds": round(entry["max_seconds"], 3),
+                **({"avg_first_chunk_seconds": round(entry["total_first_chunk_seconds"] / entry["first_chunk_count"], 3)}
+                   if entry.get("first_chunk_count") else {}),
+            }
+            for phase, entry in self.phase_stats.items()
+        }
+        return {
+            **self.stats,
+            "requests_on_reused_connections": max(0, self.stats["requests"] - self.stats["new_connections"]),
+            "http2": self.http2,
+            "phases": phases,
+            "pool": self.get_pool_stats(),
+        }
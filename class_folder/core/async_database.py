@@ -0,0 +1,186 @@
+# class_folder/core/async_database.py
+# -*- coding: utf-8 -*-
+
+"""
+Asynchrone Fassade vor dem synchronen Speicher (StorageBackend, in der Regel der
+DatabaseManager) für das FastAPI-Backend. Jeder Aufruf läuft in einem begrenzten
+Thread-Pool; jeder Worker-Thread besitzt eine eigene Verbindung (eigene
+DatabaseManager-Instanz bzw. Verbindung aus dem Pool von PostgresStorage). Eine langsame Abfrage
+(z.B. ein Export) belegt so nur einen Worker und blockiert weder den Event-Loop
+noch die übrigen Anfragen. Die Methoden des DatabaseManagers bleiben erhalten:
+aus `db_manager.get_world_info(1)` wird `await async_db.get_world_info(1)`.
+Zusammengehörige Zugriffe (z.B. die Schreibzugriffe eines Spielzugs in einer
+`unit_of_work`) laufen mit `run_in_worker` als ein Auftrag in einem Worker.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, List
+
+from .database_manager import DatabaseManager
+from .storage_backend import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+class _MethodStats:
+    """Wartezeit in der Warteschlange und Ausführungszeit einer DatabaseManager-Methode."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        self.total_exec_seconds = 0.0
+        self.max_exec_seconds = 0.0
+
+    def record(self, queue_seconds: float, exec_seconds: float, failed: bool):
+        self.calls += 1
+        self.errors += int(failed)
+        self.total_queue_seconds += queue_seconds
+        self.max_queue_seconds = max(self.max_queue_seconds, queue_seconds)
+        self.total_exec_seconds += exec_seconds
+        self.max_exec_seconds = max(self.max_exec_seconds, exec_seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_queue_ms": round(self.total_queue_seconds / self.calls * 1000, 2) if self.calls else 0.0,
+            "max_queue_ms": round(self.max_queue_seconds * 1000, 2),
+            "avg_exec_ms": round(self.total_exec_seconds / self.calls * 1000, 2) if self.calls else 0.0,
+            "max_exec_ms": round(self.max_exec_seconds * 1000, 2),
+        }
+
+
+class AsyncDatabaseManager:
+    """
+    Führt DatabaseManager-Methoden in einem Thread-Pool mit einer Verbindung pro Worker aus.
+    Unbekannte Attribute werden als awaitbare Methoden des DatabaseManagers aufgelöst.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_workers: int = 4,
+        manager_factory: Optional[Callable[[], StorageBackend]] = None,
+        storage: Optional[StorageBackend] = None
+    ):
+        """
+        Args:
+            db_path: Pfad zur SQLite-Datenbank (wie beim DatabaseManager).
+            max_workers: Anzahl der Worker-Threads und damit der gleichzeitig offenen Verbindungen.
+            manager_factory: Erzeugt den Speicher eines Workers; Standard ist DatabaseManager(db_path).
+            storage: Ein von allen Workern geteilter Speicher statt eines eigenen pro Worker. Er muss
+                     threadsicher sein (DatabaseManager: eine Verbindung pro Thread, PostgresStorage: Pool)
+                     und wird von `close` genau einmal geschlossen.
+        """
+        self.db_path = db_path if db_path is not None or storage is None else storage.db_path
+        self.max_workers = max_workers
+        self.storage = storage
+        self.manager_factory = manager_factory or (lambda: DatabaseManager(db_path))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._local = threading.local()
+        self._managers: List[StorageBackend] = []
+        self._lock = threading.Lock()  # Schützt _managers und die Statistiken (Worker-Threads)
+        self._method_stats: Dict[str, _MethodStats] = {}
+        self._queued = 0
+        self._running = 0
+        self._max_queued = 0
+        logger.info(f"AsyncDatabaseManager initialisiert ({max_workers} Worker, DB: {db_path}).")
+
+    def _thread_manager(self) -> StorageBackend:
+        """Gibt den DatabaseManager (und damit die Verbindung) des aktuellen Worker-Threads zurück."""
+        if self.storage is not None:
+            return self.storage
+        manager = getattr(self._local, "manager", None)
+        if manager is None:
+            manager = self._local.manager = self.manager_factory()
+            with self._lock:
+                self._managers.append(manager)
+        return manager
+
+    async def run(self, method_name: str, *args, **kwargs) -> Any:
+        """Führt `DatabaseManager.<method_name>(*args, **kwargs)` in einem Worker aus."""
+        return await self._submit(method_name, lambda: getattr(self._thread_manager(), method_name)(*args, **kwargs))
+
+    async def run_in_worker(self, label: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Führt eine beliebige synchrone Funktion in einem Worker aus, z.B. mehrere Zugriffe
+        samt `unit_of_work` am Stück. Die Funktion benutzt den Speicher direkt; die Statistik
+        führt sie unter `label`.
+        """
+        return await self._submit(label, lambda: func(*args, **kwargs))
+
+    async def _submit(self, label: str, call: Callable[[], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+
+        def job():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            failed = True
+            try:
+                result = call()
+                failed = False
+                return result
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._running -= 1
+                    stats = self._method_stats.setdefault(label, _MethodStats())
+                    stats.record(started_at - submitted_at, finished_at - started_at, failed)
+
+        return await loop.run_in_executor(self._executor, job)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        # Nur öffentliche Methoden werden durchgereicht; der DatabaseManager enthält alle
+        # Methoden von StorageBackend und zusätzlich die SQLite-spezifischen (Archiv, Snapshots)
+        if name.startswith("_") or not callable(getattr(DatabaseManager, name, None)):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return await self.run(name, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def close(self):
+        """Wartet auf laufende Aufrufe und schließt alle Worker-Verbindungen."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for manager in self._managers:
+                manager.close_connection()
+            self._managers.clear()
+        if self.storage is not None:
+            self.storage.close_connection()
+        logger.info("AsyncDatabaseManager geschlossen.")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Liefert Warteschlangen- und Ausführungszeiten, gesamt und pro Methode."""
+        with self._lock:
+            methods = {name: stats.to_dict() for name, stats in self._method_stats.items()}
+            calls = sum(s.calls for s in self._method_stats.values())
+            total_queue = sum(s.total_queue_seconds for s in self._method_stats.values())
+            total_exec = sum(s.total_exec_seconds for s in self._method_stats.values())
+            return {
+                "workers": self.max_workers,
+                "shared_storage": self.storage is not None,
+                "open_connections": len(self._managers),
+                "queued": self._queued,
+                "running": self._running,
+                "max_queued": self._max_queued,
+                "calls": calls,
+                "avg_queue_ms": round(total_queue / calls * 1000, 2) if calls else 0.0,
+                "avg_exec_ms": round(total_exec / calls * 1000, 2) if calls else 0.0,
+                "methods": methods,
+            }
@@ -0,0 +1,169 @@
+# class_folder/core/bulk_import.py
+# -*- coding: utf-8 -*-
+
+"""
+Massenimport von Events aus JSONL-Dateien (Batch-Dateien des Servers).
+Die Datei wird blockweise gelesen; jeder Block wird mit einem einzigen
+`executemany` in einer eigenen Transaktion geschrieben. Für sehr große Dateien
+können die Sekundärindizes und Trigger der events-Tabelle vorher entfernt und
+die Indizes danach in einem Durchgang neu aufgebaut werden. Wird vom DatabaseManager (Server/Tower)
+und vom TowerDatabaseManager verwendet.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Any, Callable, Dict, Iterator, List, Tuple
+
+from .db_migrations import has_fulltext_index, FULLTEXT_TABLE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000          # Zeilen pro Transaktion
+MAX_LOGGED_SKIPPED_LINES = 10      # Nur die ersten fehlerhaften Zeilen einzeln protokollieren
+
+INSERT_EVENT_SQL = """
+    INSERT OR IGNORE INTO events (event_id, world_id, player_input, ai_output, quality_label)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+class ImportReport:
+    """Ergebnis eines Imports: gelesene, neue, doppelte und übersprungene Zeilen sowie der Durchsatz."""
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.rows_read = 0
+        self.inserted = 0
+        self.skipped_lines = 0
+        self.chunks = 0
+        self.indexes_rebuilt = 0
+        self.seconds = 0.0
+        self.error: Optional[str] = None
+
+    @property
+    def duplicates(self) -> int:
+        return self.rows_read - self.inserted
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file": self.file_name,
+            "rows_read": self.rows_read,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "skipped_lines": self.skipped_lines,
+            "chunks": self.chunks,
+            "indexes_rebuilt": self.indexes_rebuilt,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "error": self.error,
+        }
+
+    def __str__(self) -> str:
+        text = (f"'{self.file_name}': {self.inserted} neu, {self.duplicates} doppelt, "
+                f"{self.skipped_lines} übersprungen, {self.rows_read} Zeilen in {self.seconds:.2f}s "
+                f"({self.rows_per_second:.0f} Zeilen/s)")
+        return f"{text}, FEHLER: {self.error}" if self.error else text
+
+
+def iter_event_chunks(file_path: Path, world_id: int, chunk_size: int,
+                      report: ImportReport) -> Iterator[List[Tuple[Any, ...]]]:
+    """Liest die JSONL-Datei und liefert Blöcke von Parametertupeln für INSERT_EVENT_SQL."""
+    chunk: List[Tuple[Any, ...]] = []
+    with file_path.open("r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+                chunk.append((
+                    event['event_id'],
+                    world_id,
+                    event['player_input'],
+                    event['ai_output'],
+                    event.get('quality_label', 'gut (Training)')
+                ))
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                report.skipped_lines += 1
+                if report.skipped_lines <= MAX_LOGGED_SKIPPED_LINES:
+                    logger.warning(f"Überspringe fehlerhafte Zeile {line_number} in {file_path.name}: {e}")
+                continue
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _drop_event_indexes(conn: sqlite3.Connection) -> List[Tuple[str, str]]:
+    """
+    Entfernt die expliziten Indizes und Trigger der events-Tabelle (darunter die Pflege des
+    Volltextindex) und gibt (Name, CREATE-SQL) zurück.
+    """
+    objects = [(row[0], row[1], row[2]) for row in conn.execute(
+        "SELECT type, name, sql FROM sqlite_master "
+        "WHERE type IN ('index', 'trigger') AND tbl_name = 'events' AND sql IS NOT NULL"
+    ).fetchall()]
+    for object_type, name, _ in objects:
+        conn.execute(f'DROP {object_type.upper()} IF EXISTS "{name}"')
+    conn.commit()
+    return [(name, create_sql) for _, name, create_sql in objects]
+
+
+def _create_indexes(conn: sqlite3.Connection, indexes: List[Tuple[str, str]]):
+    if has_fulltext_index(conn):
+        # Die Trigger fehlten während des Imports: Volltextindex einmal komplett neu aufbauen
+        conn.execute(f"INSERT INTO {FULLTEXT_TABLE} ({FULLTEXT_TABLE}) VALUES ('rebuild')")
+    for _, create_sql in indexes:
+        conn.execute(create_sql)
+    conn.commit()
+
+
+def bulk_import_events(
+    conn: sqlite3.Connection,
+    world_id: int,
+    file_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    rebuild_indexes: bool = False,
+    commit: Optional[Callable[[], None]] = None
+) -> ImportReport:
+    """
+    Importiert die Events einer JSONL-Datei blockweise (INSERT OR IGNORE, Duplikate werden gezählt).
+    Bei einem Fehler wird nur der aktuelle Block zurückgerollt und der Fehler im Bericht vermerkt;
+    bereits festgeschriebene Blöcke bleiben erhalten. Ein erneuter Import derselben Datei ist
+    dank INSERT OR IGNORE unschädlich.
+
+    Args:
+        rebuild_indexes: Indizes und Trigger vor dem Import entfernen, danach neu aufbauen (für sehr große Dateien).
+        commit: Schreibt einen Block fest; Standard ist conn.commit.
+    """
+    commit = commit or conn.commit
+    report = ImportReport(file_path.name)
+    started_at = time.perf_counter()
+    dropped_indexes: List[Tuple[str, str]] = []
+    try:
+        if rebuild_indexes:
+            dropped_indexes = _drop_event_indexes(conn)
+        for chunk in iter_event_chunks(file_path, world_id, chunk_size, report):
+            # rowcount zählt nur die eingefügten Events, nicht die Änderungen durch Trigger
+            cursor = conn.executemany(INSERT_EVENT_SQL, chunk)
+            commit()
+            report.rows_read += len(chunk)
+            report.inserted += cursor.rowcount
+            report.chunks += 1
+    except (sqlite3.Error, OSError) as e:
+        conn.rollback()
+        report.error = str(e)
+        logger.error(f"Import aus '{file_path.name}' nach {report.chunks} Blöcken abgebrochen: {e}", exc_info=True)
+    finally:
+        if dropped_indexes:
+            _create_indexes(conn, dropped_indexes)
+            report.indexes_rebuilt = len(dropped_indexes)
+        report.seconds = time.perf_counter() - started_at
+    return report
@@ -13,9 +13,11 @@ import time
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+from .id_token_provider import IdTokenProvider
+
 # Google Cloud Authentication
 try:
-    from google.oauth2 import id_token, service_account
+    from google.oauth2 import service_account
     from google.auth.transport import requests as google_requests
     import google.auth
     GOOGLE_AUTH_AVAILABLE = True
@@ -24,6 +26,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Antwortcodes, bei denen das ID-Token verworfen und die Anfrage einmal wiederholt wird
+AUTH_RETRY_STATUS_CODES = (401, 403)
+
 
 class CloudInferenceService:
     """Cloud-basierter Inference Service für externe APIs."""
@@ -59,6 +64,9 @@ class CloudInferenceService:
             logger.error("Google Cloud Service erkannt, aber google-auth-library nicht verfügbar!")
             raise ImportError("google-auth-library ist erforderlich für Google Cloud Services")
         
+        # ID-Tokens werden bis kurz vor Ablauf wiederverwendet statt pro Anfrage geholt
+        self.token_provider = IdTokenProvider(self.service_url) if self.is_google_cloud else None
+        
         # Simuliere base_model_loaded für Kompatibilität
         self.base_model_loaded = True
         self.load_status = "Cloud-Service bereit"
@@ -91,9 +99,8 @@ class CloudInferenceService:
         # Google Cloud Authentication
         if self.is_google_cloud and GOOGLE_AUTH_AVAILABLE:
             try:
-                # Zuerst versuche Umgebungsvariable
-                auth_req = google_requests.Request()
-                identity_token = id_token.fetch_id_token(auth_req, self.service_url)
+                # Zuerst versuche Umgebungsvariable (Token aus dem Cache des Providers)
+                identity_token = self.token_provider.get_token()
                 headers['Authorization'] = f'Bearer {identity_token}'
                 logger.debug("Google Cloud ID-Token über Umgebungsvariable hinzugefügt")
             except Exception as env_error:
@@ -104,11 +111,8 @@ class CloudInferenceService:
                         import os
                         os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = str(self.api_key_path)
                         
-                        # Hole default credentials mit ID-Token Support
-                        auth_req = google_requests.Request()
-                        
-                        # Versuche ID-Token mit fetch_id_token zu erstellen
-                        identity_token = id_token.fetch_id_token(auth_req, self.service_url)
+                        # Versuche ID-Token mit den nun gesetzten default credentials zu erstellen
+                        identity_token = self.token_provider.get_token(force_refresh=True)
                         headers['Authorization'] = f'Bearer {identity_token}'
                         logger.debug("Google Cloud ID-Token über default credentials hinzugefügt")
                         
@@ -143,6 +147,18 @@ class CloudInferenceService:
         
         return headers
     
+    def _send(self, method: str, url: str, headers: Dict[str, str], **kwargs) -> requests.Response:
+        """
+        Sendet eine Anfrage. Lehnt der Dienst das ID-Token ab (401/403, z.B. nach einem
+        Schlüsselwechsel), wird es verworfen und die Anfrage einmal mit neuem Token wiederholt.
+        """
+        response = self.session.request(method, url, headers=headers, **kwargs)
+        if response.status_code in AUTH_RETRY_STATUS_CODES and self.token_provider:
+            logger.warning(f"Cloud-API lehnt das ID-Token ab ({response.status_code}), hole ein neues und wiederhole.")
+            self.token_provider.invalidate()
+            response = self.session.request(method, url, headers=self._prepare_headers(), **kwargs)
+        return response
+    
     def generate_text(self, prompt: str, max_tokens: int = 512, temperature: float = 0.7) -> str:
         """
         Generiert Text über die Cloud-API.
@@ -174,10 +190,11 @@ class CloudInferenceService:
             logger.info(f"Sende Request an {endpoint}")
             logger.info(f"Payload: world_name='{payload['world_name']}', adapter_type='{payload['adapter_type']}', prompt_length={len(prompt)}")
             logger.info(f"PROMPT DEBUG: Erste 200 Zeichen: {prompt[:200]}...")
-            response = self.session.post(
+            response = self._send(
+                'POST',
                 endpoint,
+                headers,
                 json=payload,
-                headers=headers,
                 timeout=self.timeout
             )
             
@@ -313,9 +330,10 @@ class CloudInferenceService:
             health_endpoint = f"{self.service_url}/health"
             logger.debug(f"Versuche Health-Check: {health_endpoint}")
             
-            response = self.session.get(
+            response = self._send(
+                'GET',
                 health_endpoint,
-                headers=headers,
+                headers,
                 timeout=timeout
             )
             
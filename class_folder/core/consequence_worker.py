@@ -0,0 +1,118 @@
+# class_folder/core/consequence_worker.py
+# -*- coding: utf-8 -*-
+
+"""
+Führt die Konsequenzen eines Spielzugs (Analyse der Erzählung, Zustandsänderungen,
+Speichern des Ereignisses) im Hintergrund aus, nachdem der Spieler die Erzählung
+bereits erhalten hat. Aufträge einer Welt laufen strikt nacheinander in
+Einreichungsreihenfolge, verschiedene Welten parallel. Bevor der nächste Zug einer
+Welt seinen Prompt baut, wartet er mit `wait_for_world` auf ausstehende Aufträge.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Callable, Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+ConsequenceJob = Callable[[], Coroutine[Any, Any, Any]]
+
+
+class _WorldQueue:
+    """Warteschlange, Worker-Task und Zähler einer einzelnen Welt."""
+
+    def __init__(self):
+        self.queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+        self.pending_jobs = 0         # Eingereihte + laufender Auftrag
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.total_job_seconds = 0.0
+        self.max_job_seconds = 0.0
+        self.turn_waits = 0
+        self.total_turn_wait_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        done = self.jobs_completed + self.jobs_failed
+        return {
+            "pending_jobs": self.pending_jobs,
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "avg_job_seconds": round(self.total_job_seconds / done, 3) if done else 0.0,
+            "max_job_seconds": round(self.max_job_seconds, 3),
+            "turn_waits": self.turn_waits,
+            "total_turn_wait_seconds": round(self.total_turn_wait_seconds, 3),
+        }
+
+
+class WorldConsequenceWorker:
+    """Geordnete Hintergrund-Ausführung pro Welt. Nur aus dem Event-Loop verwenden."""
+
+    def __init__(self):
+        self._worlds: Dict[int, _WorldQueue] = {}
+
+    def _world(self, world_id: int) -> _WorldQueue:
+        state = self._worlds.get(world_id)
+        if state is None:
+            state = self._worlds[world_id] = _WorldQueue()
+        return state
+
+    def submit(self, world_id: int, job: ConsequenceJob, label: str = ""):
+        """Reiht einen Auftrag (eine Funktion, die eine Coroutine liefert) für die Welt ein."""
+        state = self._world(world_id)
+        state.queue.put_nowait((job, label))
+        state.pending_jobs += 1
+        if state.task is None or state.task.done():
+            state.task = asyncio.create_task(self._run_world(world_id, state))
+
+    async def _run_world(self, world_id: int, state: _WorldQueue):
+        """Arbeitet die Warteschlange einer Welt ab und beendet sich, sobald sie leer ist."""
+        while not state.queue.empty():
+            job, label = state.queue.get_nowait()
+            started_at = time.perf_counter()
+            try:
+                await job()
+                state.jobs_completed += 1
+            except Exception as e:
+                state.jobs_failed += 1
+                logger.error(f"Hintergrund-Auftrag '{label}' für Welt {world_id} fehlgeschlagen: {e}", exc_info=True)
+            finally:
+                seconds = time.perf_counter() - started_at
+                state.total_job_seconds += seconds
+                state.max_job_seconds = max(state.max_job_seconds, seconds)
+                state.pending_jobs -= 1
+                state.queue.task_done()
+
+    def has_pending(self, world_id: int) -> bool:
+        """Gibt an, ob für die Welt noch Aufträge ausstehen."""
+        state = self._worlds.get(world_id)
+        return bool(state and state.pending_jobs)
+
+    async def wait_for_world(self, world_id: int):
+        """Wartet, bis alle eingereihten Aufträge der Welt abgeschlossen sind."""
+        state = self._worlds.get(world_id)
+        if state is None or not self.has_pending(world_id):
+            return
+        started_at = time.perf_counter()
+        await state.queue.join()
+        state.turn_waits += 1
+        state.total_turn_wait_seconds += time.perf_counter() - started_at
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wartet auf alle ausstehenden Aufträge aller Welten, z.B. beim Herunterfahren."""
+        pending = [state.queue.join() for state in self._worlds.values()]
+        if not pending:
+            return
+        try:
+            await asyncio.wait_for(asyncio.gather(*pending), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Nicht alle Hintergrund-Aufträge wurden vor dem Herunterfahren abgeschlossen.")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Liefert die Zähler aller Welten."""
+        worlds = {str(world_id): state.to_dict() for world_id, state in self._worlds.items()}
+        return {
+            "pending_jobs": sum(w["pending_jobs"] for w in worlds.values()),
+            "worlds": worlds,
+        }
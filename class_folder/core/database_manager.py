@@ -11,34 +11,196 @@ VERSION 2: Added character attributes.
 import sqlite3
 import logging
 import re
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Any, Dict, List, Tuple
+from typing import Optional, Any, Callable, Dict, Iterator, List, Tuple
 import json
 
+from .db_migrations import apply_migrations, ensure_fulltext_index, has_fulltext_index, world_match, FULLTEXT_TABLE
+from .bulk_import import bulk_import_events, ImportReport, DEFAULT_CHUNK_SIZE
+from . import event_archive
+from . import db_snapshot
+from .storage_backend import StorageBackend, DEFAULT_PAGE_SIZE
+from . import storage_backend
+from .query_metrics import QueryMetrics, InstrumentedConnection, DEFAULT_SLOW_QUERY_MS
+
 logger = logging.getLogger(__name__)
-class DatabaseManager:
-    """Handles all database operations for the game."""
 
-    def __init__(self, db_path: Optional[Path] = None):
+# --- Verbindungs-Einstellungen (PRAGMAs) ---
+DEFAULT_JOURNAL_MODE = "WAL"          # Leser blockieren den Schreiber nicht mehr
+DEFAULT_SYNCHRONOUS = "NORMAL"        # Im WAL-Modus sicher; kein fsync bei jedem Commit
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+DEFAULT_CACHE_SIZE_KIB = 64 * 1024    # Seiten-Cache pro Verbindung
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+class DatabaseManager(StorageBackend):
+    """
+    Handles all database operations for the game.
+    Jeder Thread erhält eine eigene Verbindung (und bei Bedarf eine zweite,
+    schreibgeschützte für Berichtsabfragen wie Export und Statistik).
+    SQLite-Implementierung von StorageBackend (siehe storage_backend).
+    """
+
+    backend_name = "sqlite"
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        journal_mode: str = DEFAULT_JOURNAL_MODE,
+        synchronous: str = DEFAULT_SYNCHRONOUS,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        archive_dir: Optional[Path] = None,
+        snapshot_dir: Optional[Path] = None,
+        instrument_queries: bool = True,
+        slow_query_ms: Optional[float] = DEFAULT_SLOW_QUERY_MS
+    ):
         self.db_path = Path(db_path) if db_path else Path("laststrawberry.db")
-        self.conn: Optional[sqlite3.Connection] = None
+        # Archivdateien alter Events, eine pro Welt (siehe event_archive)
+        self.archive_dir = Path(archive_dir) if archive_dir else self.db_path.parent / "archive"
+        # Komprimierte Online-Snapshots (siehe db_snapshot)
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else self.db_path.parent / "snapshots"
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.mmap_size = mmap_size
+        self.cache_size_kib = cache_size_kib
+        self.busy_timeout_ms = busy_timeout_ms
+        # (Thread-ID, schreibgeschützt) -> Verbindung
+        self._connections: Dict[Tuple[int, bool], sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        self._local = threading.local()  # Verschachtelungstiefe der Arbeitseinheit pro Thread
+        self._json1: Optional[bool] = None  # JSON1-Unterstützung, beim ersten Bedarf geprüft
+        self._fts5: Optional[bool] = None   # Volltextindex vorhanden (siehe ensure_fulltext_index)
+        self._snapshot_lock = threading.Lock()  # Es läuft immer nur ein Snapshot gleichzeitig
+        # Latenz, Zeilen und Sperrzeit jeder Anweisung pro Methode (siehe query_metrics)
+        self.query_metrics: Optional[QueryMetrics] = QueryMetrics(
+            slow_query_ms, owner_files=(__file__, storage_backend.__file__)
+        ) if instrument_queries else None
         logger.info(f"DatabaseManager initialized for database at: {self.db_path}")
 
     def _get_connection(self) -> sqlite3.Connection:
-        if self.conn is None:
+        """Gibt die Schreib-/Leseverbindung des aktuellen Threads zurück."""
+        return self._thread_connection(read_only=False)
+
+    def _get_read_connection(self) -> sqlite3.Connection:
+        """
+        Gibt eine schreibgeschützte Verbindung des aktuellen Threads zurück (für Berichte).
+        Existiert die Datenbankdatei noch nicht, wird die normale Verbindung verwendet.
+        """
+        if not self.db_path.exists():
+            return self._get_connection()
+        return self._thread_connection(read_only=True)
+
+    def _thread_connection(self, read_only: bool) -> sqlite3.Connection:
+        key = (threading.get_ident(), read_only)
+        conn = self._connections.get(key)
+        if conn is None:
             try:
-                self.db_path.parent.mkdir(parents=True, exist_ok=True)
-                self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-                self.conn.row_factory = sqlite3.Row
+                conn = self._open_connection(read_only)
             except sqlite3.Error as e:
                 logger.error(f"Error connecting to database: {e}", exc_info=True)
                 raise
-        return self.conn
+            with self._connections_lock:
+                self._connections[key] = conn
+        return conn
+
+    def _open_connection(self, read_only: bool) -> sqlite3.Connection:
+        if read_only:
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, factory=InstrumentedConnection)
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=InstrumentedConnection)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if not read_only:
+            # journal_mode ist persistent in der Datei, synchronous gilt pro Verbindung
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+            conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        else:
+            conn.execute("PRAGMA query_only = 1")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size_kib)}")
+        conn.metrics = self.query_metrics  # erst ab hier messen, die PRAGMAs gehören nicht zur Methode
+        return conn
 
     def close_connection(self):
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Schließt alle Verbindungen aller Threads."""
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+
+    # --- Arbeitseinheit (eine Transaktion pro Spielzug) ---
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Fasst alle Schreibzugriffe des Blocks zu einer Transaktion mit genau einem Commit
+        zusammen. Die einzelnen Methoden committen innerhalb des Blocks nicht selbst;
+        eine Ausnahme, die den Block verlässt, rollt den gesamten Block zurück.
+        Verschachtelte Aufrufe schließen sich der äußeren Einheit an.
+        Der Block darf kein `await` enthalten: alle Sitzungen im Event-Loop teilen
+        sich die Verbindung dieses Threads.
+        """
+        conn = self._get_connection()
+        depth = getattr(self._local, "unit_of_work_depth", 0)
+        if depth:
+            self._local.unit_of_work_depth = depth + 1
+            try:
+                yield conn
+            finally:
+                self._local.unit_of_work_depth = depth
+            return
+
+        # IMMEDIATE: Schreibsperre sofort holen statt später beim ersten Schreiben daran zu scheitern
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.unit_of_work_depth = 1
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.unit_of_work_depth = 0
+
+    def _in_unit_of_work(self) -> bool:
+        return getattr(self._local, "unit_of_work_depth", 0) > 0
+
+    def _commit(self, conn: sqlite3.Connection):
+        """Committet, außer innerhalb einer Arbeitseinheit (dort committet deren Ende)."""
+        if not self._in_unit_of_work():
+            conn.commit()
+
+    def _rollback(self, conn: sqlite3.Connection):
+        """
+        Fehlerbehandlung der schreibenden Methoden; nur im `except`-Block aufrufen.
+        Außerhalb einer Arbeitseinheit wird zurückgerollt und die Methode meldet den Fehler
+        über ihren Rückgabewert. Innerhalb einer Arbeitseinheit wird der Fehler weitergereicht,
+        damit die Einheit den ganzen Block zurückrollt, statt einen halben Zug zu committen.
+        """
+        if self._in_unit_of_work():
+            raise
+        conn.rollback()
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Offene Verbindungen und die wirksamen Einstellungen (für Monitoring)."""
+        with self._connections_lock:
+            read_only = sum(1 for (_, ro) in self._connections if ro)
+            total = len(self._connections)
+        return {
+            "open_connections": total - read_only,
+            "open_read_only_connections": read_only,
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "mmap_size": self.mmap_size,
+            "cache_size_kib": self.cache_size_kib,
+            "busy_timeout_ms": self.busy_timeout_ms,
+        }
 
     def setup_database(self):
         try:
@@ -97,7 +259,21 @@ class DatabaseManager:
                     FOREIGN KEY (char_id) REFERENCES characters (char_id)
                 );
             """)
-            conn.commit()
+            # KI-Zusammenfassungen für den Ladebildschirm; gültig nur für das
+            # letzte Event (last_event_id) und die Adapter-Version, mit der sie erzeugt wurden
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS summary_cache (
+                    world_id INTEGER NOT NULL, adapter_version TEXT NOT NULL,
+                    last_event_id INTEGER NOT NULL, summary_text TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (world_id, adapter_version),
+                    FOREIGN KEY (world_id) REFERENCES worlds (world_id)
+                );
+            """)
+            self._commit(conn)
+            # Indizes und spätere Schemaänderungen als versionierte Migrationen
+            apply_migrations(conn)
+            self._fts5 = ensure_fulltext_index(conn)
         except sqlite3.Error as e:
             logger.error(f"Error setting up database schema: {e}", exc_info=True)
             raise
@@ -138,11 +314,11 @@ class DatabaseManager:
                 (world_id, user_id, char_name, backstory, loc_id, initial_state_json, attributes_json)
             )
             char_id = cursor.lastrowid
-            conn.commit()
+            self._commit(conn)
             return {"world_id": world_id, "player_id": char_id, "location_id": loc_id}
         except sqlite3.Error as e:
             logger.error(f"Error creating world and player: {e}", exc_info=True)
-            conn.rollback()
+            self._rollback(conn)
             return None
 
     def is_user_authorized_for_player(self, user_id: int, char_id: int) -> bool:
@@ -162,6 +338,22 @@ class DatabaseManager:
             logger.error(f"DB error during authorization check for user {user_id} and char {char_id}: {e}")
             return False
 
+    def is_user_authorized_for_world(self, user_id: int, world_id: int) -> bool:
+        """
+        Prüft, ob der Benutzer einen Spielercharakter in der Welt besitzt.
+        Admins sind implizit berechtigt (Prüfung in der API-Schicht).
+        """
+        try:
+            conn = self._get_connection()
+            row = conn.execute(
+                "SELECT 1 FROM characters WHERE world_id = ? AND user_id = ? AND is_player = 1 LIMIT 1",
+                (world_id, user_id)
+            ).fetchone()
+            return row is not None
+        except sqlite3.Error as e:
+            logger.error(f"DB error during authorization check for user {user_id} and world {world_id}: {e}")
+            return False
+
     def get_npcs_at_location(self, world_id: int, location_id: int) -> List[Dict[str, Any]]:
         """NEU: Holt alle NSCs an einem bestimmten Ort."""
         try:
@@ -200,13 +392,13 @@ class DatabaseManager:
                 (world_id, system_user_id, name, backstory, player_loc_id, state_json)
             )
 
-            conn.commit()
+            self._commit(conn)
             npc_id = cursor.lastrowid
             logger.info(f"NSC '{name}' (ID: {npc_id}) wurde in Welt {world_id} erstellt und User {system_user_id} zugeordnet.")
             return npc_id
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Erstellen von NSC '{name}': {e}", exc_info=True)
-            conn.rollback()
+            self._rollback(conn)
             return None
 
     def get_player_location(self, world_id: int) -> Optional[int]:
@@ -226,15 +418,77 @@ class DatabaseManager:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM characters WHERE char_id = ?", (char_id,))
             row = cursor.fetchone()
-            if row:
-                char_data = dict(row)
-                char_data['state'] = json.loads(char_data.pop('state_json', '{}') or '{}')
-                char_data['inventory'] = json.loads(char_data.pop('inventory_json', '[]') or '[]')
-                char_data['attributes'] = json.loads(char_data.pop('attributes_json', '{}') or '{}')
-                return char_data
-            return None
+            return self._decode_character(dict(row)) if row else None
         except sqlite3.Error: return None
 
+    @staticmethod
+    def _decode_character(char_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Wandelt die JSON-Spalten einer Charakter-Zeile in state/inventory/attributes um."""
+        char_data['state'] = json.loads(char_data.pop('state_json', '{}') or '{}')
+        char_data['inventory'] = json.loads(char_data.pop('inventory_json', '[]') or '[]')
+        char_data['attributes'] = json.loads(char_data.pop('attributes_json', '{}') or '{}')
+        return char_data
+
+    def load_scene_snapshot(self, world_id: int, char_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Lädt Welt, Spielercharakter, aktuellen Ort und alle dort anwesenden NSCs mit
+        zwei Abfragen (statt einer pro NSC). Gibt None zurück, wenn Welt oder Charakter fehlen.
+        Liest über die Schreibverbindung, damit Änderungen einer laufenden
+        Arbeitseinheit (z.B. PLAYER_MOVE) bereits sichtbar sind.
+        """
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT c.*, w.name AS scene_world_name, w.template_key AS scene_template_key,
+                       l.location_id AS scene_location_id, l.world_id AS scene_location_world_id,
+                       l.name AS scene_location_name, l.description AS scene_location_description,
+                       l.rules_json AS scene_location_rules_json,
+                       l.connections_json AS scene_location_connections_json
+                FROM characters c
+                JOIN worlds w ON w.world_id = ?
+                LEFT JOIN locations l ON l.location_id = c.current_location_id
+                WHERE c.char_id = ?
+            """, (world_id, char_id))
+            row = cursor.fetchone()
+            if not row:
+                return None
+
+            char_data = dict(row)
+            world_name = char_data.pop('scene_world_name')
+            template_key = char_data.pop('scene_template_key') or 'system_fantasy'
+            location = {key[len('scene_location_'):]: char_data.pop(key)
+                        for key in list(char_data) if key.startswith('scene_location_')}
+            location_info = {}
+            if location['id'] is not None:
+                location_info = {
+                    'location_id': location['id'], 'world_id': location['world_id'],
+                    'name': location['name'], 'description': location['description'],
+                    'rules': json.loads(location['rules_json'] or '{}'),
+                    'connections': json.loads(location['connections_json'] or '{}'),
+                }
+            character_info = self._decode_character(char_data)
+
+            scene_npcs = []
+            if location_info:
+                cursor.execute(
+                    "SELECT * FROM characters WHERE world_id = ? AND current_location_id = ? AND is_player = 0",
+                    (world_id, location_info['location_id'])
+                )
+                scene_npcs = [self._decode_character(dict(npc_row)) for npc_row in cursor.fetchall()]
+
+            return {
+                'world_id': world_id,
+                'world_name': world_name,
+                'template_key': template_key,
+                'character_info': character_info,
+                'location_info': location_info,
+                'scene_npcs': scene_npcs,
+            }
+        except (sqlite3.Error, json.JSONDecodeError) as e:
+            logger.error(f"Fehler beim Laden der Szene für Welt {world_id}, Charakter {char_id}: {e}", exc_info=True)
+            return None
+
     def find_npc_by_name(self, world_id: int, name: str) -> Optional[Dict[str, Any]]:
         try:
             conn = self._get_connection()
@@ -259,14 +513,14 @@ class DatabaseManager:
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
-            cursor.execute("SELECT player_input, ai_output FROM events WHERE world_id = ? ORDER BY timestamp DESC LIMIT ?", (world_id, limit))
+            cursor.execute("SELECT player_input, ai_output FROM events WHERE world_id = ? ORDER BY event_id DESC LIMIT ?", (world_id, limit))
             events = cursor.fetchall()
             return [tuple(row) for row in reversed(events)]
         except sqlite3.Error: return []
 
     def get_all_worlds_and_players(self) -> List[Dict[str, Any]]:
         try:
-            conn = self._get_connection()
+            conn = self._get_read_connection()
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT 
@@ -289,7 +543,7 @@ class DatabaseManager:
     def get_all_worlds_and_players_for_user(self, user_id: int) -> List[Dict[str, Any]]:
         """Holt alle Welten und Spieler für einen spezifischen Benutzer."""
         try:
-            conn = self._get_connection()
+            conn = self._get_read_connection()
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT 
@@ -336,11 +590,11 @@ class DatabaseManager:
                     "INSERT INTO prompt_rules (world_id, template_name, rule_type, content, order_index) VALUES (?, ?, ?, ?, ?)",
                     (None, full_template_name, rule['rule_type'], rule['content'], rule['order_index'])
                 )
-            conn.commit()
+            self._commit(conn)
             return True
         except sqlite3.Error as e:
             logger.error(f"Error saving rules as template: {e}", exc_info=True)
-            conn.rollback()
+            self._rollback(conn)
             return False
 
     def get_all_template_names(self) -> List[str]:
@@ -390,12 +644,12 @@ class DatabaseManager:
                     "INSERT INTO prompt_rules (world_id, rule_type, content, order_index, is_active) VALUES (?, ?, ?, ?, ?)",
                     (world_id, rule.get('rule_type', 'RULE'), rule['content'], rule['order_index'], rule.get('is_active', True))
                 )
-            conn.commit()
+            self._commit(conn)
             logger.info(f"Successfully updated rules for world_id {world_id}.")
             return True
         except sqlite3.Error as e:
             logger.error(f"Error updating world rules for world_id {world_id}: {e}", exc_info=True)
-            conn.rollback()
+            self._rollback(conn)
             return False
             
     def get_rules_for_world(self, world_id: int) -> List[Dict[str, Any]]:
@@ -414,27 +668,43 @@ class DatabaseManager:
     def update_npc_state(self, npc_id: int, updates_dict: Dict[str, Any]):
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT state_json FROM characters WHERE char_id = ?", (npc_id,))
-            row = cursor.fetchone()
-            if not row:
+            notes_to_add = updates_dict.pop("notes_add", None)
+            state_sql = self._json_set_sql('state_json', updates_dict) if self._json1_supported(conn) else None
+            if state_sql:
+                # Eine atomare Anweisung: Schlüssel setzen, Notiz nur anhängen, wenn sie noch fehlt
+                state_expr, state_params = state_sql
+                if notes_to_add:
+                    # Der neue Zustand wird einmal in der Unterabfrage berechnet und dann nur noch referenziert
+                    note_json = json.dumps(notes_to_add, ensure_ascii=False)
+                    new_state_expr = (
+                        "(SELECT CASE WHEN EXISTS (SELECT 1 FROM json_each(s.state, '$.notes') "
+                        "WHERE json_quote(value) = json(?)) THEN s.state "
+                        "ELSE json_insert(json_insert(s.state, '$.notes', json('[]')), '$.notes[#]', json(?)) END "
+                        f"FROM (SELECT {state_expr} AS state) AS s)"
+                    )
+                    params = [note_json, note_json, *state_params]
+                else:
+                    new_state_expr, params = state_expr, state_params
+                cursor = conn.execute(f"UPDATE characters SET state_json = {new_state_expr} WHERE char_id = ?",
+                                      (*params, npc_id))
+                found = cursor.rowcount > 0
+            else:
+                def apply_updates(current_state: Dict[str, Any]):
+                    current_state.update(updates_dict)
+                    if notes_to_add:
+                        if 'notes' not in current_state:
+                            current_state['notes'] = []
+                        if notes_to_add not in current_state['notes']:
+                            current_state['notes'].append(notes_to_add)
+                found = self._update_json_in_python(conn, npc_id, 'state_json', '{}', apply_updates)
+            if not found:
                 logger.warning(f"Konnte NSC mit ID {npc_id} für Update nicht finden.")
                 return
-            current_state = json.loads(row['state_json'] or '{}')
-            notes_to_add = updates_dict.pop("notes_add", None)
-            current_state.update(updates_dict)
-            if notes_to_add:
-                if 'notes' not in current_state:
-                    current_state['notes'] = []
-                if notes_to_add not in current_state['notes']:
-                    current_state['notes'].append(notes_to_add)
-            new_state_json = json.dumps(current_state)
-            cursor.execute("UPDATE characters SET state_json = ? WHERE char_id = ?", (new_state_json, npc_id))
-            conn.commit()
+            self._commit(conn)
             logger.info(f"Zustand für NSC ID {npc_id} erfolgreich aktualisiert.")
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Aktualisieren von NSC ID {npc_id}: {e}", exc_info=True)
-            conn.rollback()
+            self._rollback(conn)
 
     def get_location_info(self, location_id: int) -> Optional[Dict[str, Any]]:
         try:
@@ -461,19 +731,275 @@ class DatabaseManager:
                 "INSERT INTO events (world_id, char_id, player_input, ai_output, involved_npcs_json, extracted_commands_json) VALUES (?, ?, ?, ?, ?, ?)",
                 (world_id, char_id, player_input, ai_output, involved_npcs_json, commands_json)
             )
-            conn.commit()
+            self._count_event_in_world_stats(conn, cursor.lastrowid)
+            # Ein neues Event macht die zwischengespeicherte Zusammenfassung der Welt ungültig
+            cursor.execute("DELETE FROM summary_cache WHERE world_id = ?", (world_id,))
+            self._commit(conn)
         except sqlite3.Error as e:
             logger.error(f"Error saving event to database: {e}", exc_info=True)
+            self._rollback(conn)
+
+    # --- Welt-Statistiken (world_stats) ---
+    # Die Zähler werden in derselben Transaktion wie das Event bzw. die XP-Änderung fortgeschrieben.
+
+    # Genau ein Spielercharakter pro Welt (der älteste), damit mehrere Spieler nichts mehrfach zählen
+    _WORLD_PLAYER_JOIN = ("LEFT JOIN characters c ON c.char_id = (SELECT MIN(char_id) FROM characters "
+                          "WHERE world_id = {world} AND is_player = 1)")
+
+    @classmethod
+    def _count_event_in_world_stats(cls, conn: sqlite3.Connection, event_id: int):
+        """Zählt ein soeben gespeichertes Event in der Statistik seiner Welt mit."""
+        conn.execute(f"""
+            INSERT INTO world_stats (world_id, total_events, player_actions, first_event, last_event,
+                                     character_level, character_xp)
+            SELECT e.world_id, 1, COALESCE(e.player_input, '') <> '', e.timestamp, e.timestamp,
+                   COALESCE(c.level, 1), COALESCE(c.xp, 0)
+            FROM events e
+            {cls._WORLD_PLAYER_JOIN.format(world="e.world_id")}
+            WHERE e.event_id = ?
+            ON CONFLICT(world_id) DO UPDATE SET
+                total_events = total_events + 1,
+                player_actions = player_actions + excluded.player_actions,
+                first_event = COALESCE(first_event, excluded.first_event),
+                last_event = excluded.last_event
+        """, (event_id,))
+
+    @staticmethod
+    def _sync_character_in_world_stats(conn: sqlite3.Connection, char_id: int):
+        """Übernimmt Level und XP des Spielercharakters; ein höheres Level zählt als Level-Up."""
+        conn.execute("""
+            INSERT INTO world_stats (world_id, character_level, character_xp)
+            SELECT world_id, level, xp FROM characters WHERE char_id = ? AND is_player = 1
+            ON CONFLICT(world_id) DO UPDATE SET
+                level_ups = level_ups + MAX(excluded.character_level - character_level, 0),
+                character_level = excluded.character_level,
+                character_xp = excluded.character_xp
+        """, (char_id,))
+
+    def rebuild_world_stats(self, world_id: Optional[int] = None) -> int:
+        """
+        Berechnet die Statistik einer Welt (oder aller Welten) neu aus events und characters.
+        Level-Ups sind nicht einzeln protokolliert und werden als Level - 1 angesetzt.
+        Gibt die Anzahl der neu geschriebenen Welten zurück.
+        """
+        query = """
+            INSERT OR REPLACE INTO world_stats (world_id, total_events, player_actions, level_ups,
+                                                first_event, last_event, character_level, character_xp)
+            SELECT w.world_id, COALESCE(e.total_events, 0), COALESCE(e.player_actions, 0),
+                   MAX(COALESCE(c.level, 1) - 1, 0), e.first_event, e.last_event,
+                   COALESCE(c.level, 1), COALESCE(c.xp, 0)
+            FROM worlds w
+            LEFT JOIN (
+                SELECT world_id, COUNT(*) AS total_events,
+                       SUM(COALESCE(player_input, '') <> '') AS player_actions,
+                       MIN(timestamp) AS first_event, MAX(timestamp) AS last_event
+                FROM events {event_filter} GROUP BY world_id
+            ) e ON e.world_id = w.world_id
+            {player_join}
+            {world_filter}
+        """
+        player_join = self._WORLD_PLAYER_JOIN.format(world="w.world_id")
+        params: Tuple[Any, ...] = ()
+        if world_id is not None:
+            query = query.format(event_filter="WHERE world_id = ?", player_join=player_join,
+                                 world_filter="WHERE w.world_id = ?")
+            params = (world_id, world_id)
+        else:
+            query = query.format(event_filter="", player_join=player_join, world_filter="")
+        try:
+            conn = self._get_connection()
+            with self.unit_of_work():
+                cursor = conn.execute(query, params)
+            rebuilt = cursor.rowcount
+            # Archivierte Events zählen weiterhin zur Welt
+            world_ids = [world_id] if world_id is not None else [
+                row[0] for row in conn.execute("SELECT world_id FROM world_stats").fetchall()
+            ]
+            for archived_world_id in world_ids:
+                self._add_archive_to_world_stats(conn, archived_world_id)
+            logger.info(f"Welt-Statistiken neu berechnet ({rebuilt} Welten).")
+            return rebuilt
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Neuberechnen der Welt-Statistiken: {e}", exc_info=True)
+            return 0
+
+    def _add_archive_to_world_stats(self, conn: sqlite3.Connection, world_id: int):
+        path = event_archive.archive_path(self.archive_dir, world_id)
+        with event_archive.attached_archive(conn, path) as attached:
+            if not attached:
+                return
+            conn.execute(f"""
+                UPDATE world_stats SET
+                    total_events = total_events + a.archived_events,
+                    player_actions = player_actions + a.archived_actions,
+                    first_event = CASE WHEN first_event IS NULL OR a.archived_first < first_event
+                                       THEN a.archived_first ELSE first_event END,
+                    last_event = COALESCE(last_event, a.archived_last)
+                FROM (
+                    SELECT COUNT(*) AS archived_events,
+                           COALESCE(SUM(COALESCE(player_input, '') <> ''), 0) AS archived_actions,
+                           MIN(timestamp) AS archived_first, MAX(timestamp) AS archived_last
+                    FROM {event_archive.ARCHIVE_SCHEMA}.events ae
+                    WHERE ae.world_id = ? AND NOT EXISTS (SELECT 1 FROM main.events m WHERE m.event_id = ae.event_id)
+                ) AS a
+                WHERE world_stats.world_id = ?
+            """, (world_id, world_id))
+            self._commit(conn)
+
+    # --- Archivierung alter Events (siehe event_archive) ---
+
+    def archive_world_events(self, world_id: int, keep_recent: int = event_archive.DEFAULT_KEEP_RECENT,
+                             older_than_days: Optional[float] = None,
+                             batch_size: int = event_archive.DEFAULT_BATCH_SIZE,
+                             dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Verschiebt alte Events einer Welt in ihre Archivdatei. Archiviert wird nur, was außerhalb
+        der jüngsten `keep_recent` Events liegt (mindestens MIN_KEEP_RECENT, das Prompt-Fenster
+        bleibt also immer erhalten) und, falls angegeben, älter als `older_than_days` ist.
+        Gibt einen Bericht zurück; mit dry_run wird nur gezählt.
+        """
+        keep_recent = max(keep_recent, event_archive.MIN_KEEP_RECENT)
+        path = event_archive.archive_path(self.archive_dir, world_id)
+        report = {"world_id": world_id, "archive_path": str(path), "cutoff_event_id": None,
+                  "candidates": 0, "archived": 0, "dry_run": dry_run}
+        try:
+            conn = self._get_connection()
+            # Jüngstes Event, das archiviert werden darf: das (keep_recent + 1)-jüngste
+            row = conn.execute(
+                "SELECT event_id FROM events WHERE world_id = ? ORDER BY event_id DESC LIMIT 1 OFFSET ?",
+                (world_id, keep_recent)
+            ).fetchone()
+            cutoff_event_id = row[0] if row else None
+            if cutoff_event_id is not None and older_than_days is not None:
+                row = conn.execute(
+                    "SELECT MAX(event_id) FROM events WHERE world_id = ? AND timestamp < datetime('now', ?)",
+                    (world_id, f"-{older_than_days} days")
+                ).fetchone()
+                cutoff_event_id = min(cutoff_event_id, row[0]) if row and row[0] is not None else None
+            if cutoff_event_id is None:
+                return report
+
+            report["cutoff_event_id"] = cutoff_event_id
+            report["candidates"] = conn.execute(
+                "SELECT COUNT(*) FROM events WHERE world_id = ? AND event_id <= ?", (world_id, cutoff_event_id)
+            ).fetchone()[0]
+            if dry_run or not report["candidates"]:
+                return report
+
+            with event_archive.attached_archive(conn, path, create=True):
+                report["archived"] = event_archive.move_events_to_archive(
+                    conn, world_id, cutoff_event_id, batch_size, commit=lambda: self._commit(conn)
+                )
+            logger.info(f"Welt {world_id}: {report['archived']} Events bis #{cutoff_event_id} nach '{path.name}' archiviert.")
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Archivieren der Events von Welt {world_id}: {e}", exc_info=True)
+            report["error"] = str(e)
+        return report
+
+    def vacuum(self) -> bool:
+        """Gibt den Platz archivierter Events frei, indem die Hauptdatenbank neu geschrieben wird (VACUUM)."""
+        try:
+            self._get_connection().execute("VACUUM")
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim VACUUM der Datenbank: {e}", exc_info=True)
+            return False
+
+    def archive_all_worlds(self, **options) -> List[Dict[str, Any]]:
+        """Archiviert alle Welten nacheinander (Optionen wie bei archive_world_events)."""
+        world_ids = [row[0] for row in self._get_connection().execute(
+            "SELECT world_id FROM worlds ORDER BY world_id").fetchall()]
+        return [self.archive_world_events(world_id, **options) for world_id in world_ids]
+
+    # --- Online-Snapshots (siehe db_snapshot) ---
+
+    def create_snapshot(self, pages_per_step: int = db_snapshot.DEFAULT_PAGES_PER_STEP,
+                        step_sleep: float = db_snapshot.DEFAULT_STEP_SLEEP,
+                        keep: Optional[int] = db_snapshot.DEFAULT_KEEP) -> Optional[Dict[str, Any]]:
+        """
+        Erstellt im laufenden Betrieb einen komprimierten Snapshot der Datenbank samt Manifest
+        und löscht danach alle außer den `keep` neuesten (None: keine löschen).
+        Die Kopie läuft über eine eigene Verbindung; gibt das Manifest oder bei Fehlern None zurück.
+        """
+        with self._snapshot_lock:
+            try:
+                manifest = db_snapshot.create_snapshot(
+                    self.db_path, self.snapshot_dir, pages_per_step=pages_per_step,
+                    step_sleep=step_sleep, busy_timeout_ms=self.busy_timeout_ms
+                )
+                if keep is not None:
+                    manifest["pruned"] = db_snapshot.prune_snapshots(self.snapshot_dir, keep)
+                return manifest
+            except (sqlite3.Error, OSError) as e:
+                logger.error(f"Fehler beim Erstellen des Snapshots von '{self.db_path}': {e}", exc_info=True)
+                return None
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """Gibt die Manifeste der vorhandenen Snapshots zurück, den neuesten zuerst."""
+        return db_snapshot.list_snapshots(self.snapshot_dir)
+
+    def get_last_event_id(self, world_id: int) -> Optional[int]:
+        """Gibt die ID des jüngsten Events einer Welt zurück (None, wenn es keines gibt)."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(event_id) FROM events WHERE world_id = ?", (world_id,))
+            row = cursor.fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Holen der letzten Event-ID für Welt {world_id}: {e}")
+            return None
+
+    def get_cached_summary(self, world_id: int, last_event_id: int, adapter_version: str) -> Optional[str]:
+        """Liefert die gespeicherte Zusammenfassung, falls sie zum letzten Event und zur Adapter-Version passt."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT summary_text FROM summary_cache WHERE world_id = ? AND adapter_version = ? AND last_event_id = ?",
+                (world_id, adapter_version, last_event_id)
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Lesen des Zusammenfassungs-Caches für Welt {world_id}: {e}")
+            return None
+
+    def save_cached_summary(self, world_id: int, last_event_id: int, adapter_version: str, summary_text: str) -> bool:
+        """Speichert (bzw. ersetzt) die Zusammenfassung einer Welt für eine Adapter-Version."""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT OR REPLACE INTO summary_cache (world_id, adapter_version, last_event_id, summary_text) VALUES (?, ?, ?, ?)",
+                (world_id, adapter_version, last_event_id, summary_text)
+            )
+            self._commit(conn)
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Speichern der Zusammenfassung für Welt {world_id}: {e}", exc_info=True)
+            self._rollback(conn)
+            return False
+
+    def invalidate_summary_cache(self, world_id: int):
+        """Verwirft alle gespeicherten Zusammenfassungen einer Welt."""
+        try:
+            conn = self._get_connection()
+            conn.execute("DELETE FROM summary_cache WHERE world_id = ?", (world_id,))
+            self._commit(conn)
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Leeren des Zusammenfassungs-Caches für Welt {world_id}: {e}")
+            self._rollback(conn)
 
     def create_location(self, world_id: int, name: str, description: str) -> Optional[int]:
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute("INSERT INTO locations (world_id, name, description) VALUES (?, ?, ?)", (world_id, name, description))
-            conn.commit()
+            self._commit(conn)
             return cursor.lastrowid
         except sqlite3.Error:
-            conn.rollback()
+            self._rollback(conn)
             return None
 
     def update_npc_name(self, npc_id: int, new_name: str) -> bool:
@@ -485,12 +1011,12 @@ class DatabaseManager:
             if cursor.rowcount == 0:
                 logger.warning(f"Konnte NSC mit ID {npc_id} zum Umbenennen nicht finden.")
                 return False
-            conn.commit()
+            self._commit(conn)
             logger.info(f"NSC ID {npc_id} wurde erfolgreich in '{new_name}' umbenannt.")
             return True
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Umbenennen von NSC ID {npc_id}: {e}", exc_info=True)
-            conn.rollback()
+            self._rollback(conn)
             return False
 
     def get_location_by_name(self, world_id: int, name: str) -> Optional[Dict[str, Any]]:
@@ -505,37 +1031,90 @@ class DatabaseManager:
     def update_character_inventory(self, char_id: int, action: str, item_name: str):
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT inventory_json FROM characters WHERE char_id = ?", (char_id,))
-            row = cursor.fetchone()
-            if not row: return
-            inventory = json.loads(row['inventory_json'] or '[]')
-            if action.upper() == 'ADD': inventory.append(item_name)
-            elif action.upper() == 'REMOVE' and item_name in inventory: inventory.remove(item_name)
-            cursor.execute("UPDATE characters SET inventory_json = ? WHERE char_id = ?", (json.dumps(inventory), char_id))
-            conn.commit()
-        except sqlite3.Error: conn.rollback()
+            if self._json1_supported(conn):
+                inventory_expr = "COALESCE(NULLIF(inventory_json, ''), '[]')"
+                if action.upper() == 'ADD':
+                    conn.execute(f"UPDATE characters SET inventory_json = json_insert({inventory_expr}, '$[#]', ?) "
+                                 "WHERE char_id = ?", (item_name, char_id))
+                elif action.upper() == 'REMOVE':
+                    # Entfernt das erste Vorkommen; ohne Treffer bleibt die Zeile unverändert
+                    conn.execute(f"""
+                        UPDATE characters SET inventory_json = json_remove({inventory_expr},
+                            '$[' || (SELECT MIN(key) FROM json_each({inventory_expr}) WHERE value = ?) || ']')
+                        WHERE char_id = ? AND EXISTS (SELECT 1 FROM json_each({inventory_expr}) WHERE value = ?)
+                    """, (item_name, char_id, item_name))
+            else:
+                def apply_action(inventory: List[Any]):
+                    if action.upper() == 'ADD': inventory.append(item_name)
+                    elif action.upper() == 'REMOVE' and item_name in inventory: inventory.remove(item_name)
+                self._update_json_in_python(conn, char_id, 'inventory_json', '[]', apply_action)
+            self._commit(conn)
+        except sqlite3.Error: self._rollback(conn)
 
     def update_character_state(self, char_id: int, state_updates: Dict[str, Any]):
         try:
             conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT state_json FROM characters WHERE char_id = ?", (char_id,))
-            row = cursor.fetchone()
-            if not row: return
-            current_state = json.loads(row['state_json'] or '{}')
-            current_state.update(state_updates)
-            cursor.execute("UPDATE characters SET state_json = ? WHERE char_id = ?", (json.dumps(current_state), char_id))
-            conn.commit()
-        except sqlite3.Error: conn.rollback()
+            state_sql = self._json_set_sql('state_json', state_updates) if self._json1_supported(conn) else None
+            if state_sql:
+                state_expr, params = state_sql
+                conn.execute(f"UPDATE characters SET state_json = {state_expr} WHERE char_id = ?", (*params, char_id))
+            else:
+                self._update_json_in_python(conn, char_id, 'state_json', '{}', lambda state: state.update(state_updates))
+            self._commit(conn)
+        except sqlite3.Error: self._rollback(conn)
+
+    # --- JSON-Spalten direkt in SQLite ändern (JSON1) ---
+
+    def _json1_supported(self, conn: sqlite3.Connection) -> bool:
+        """Prüft einmalig, ob die SQLite-Bibliothek die JSON1-Funktionen (inkl. '$[#]') kennt."""
+        if self._json1 is None:
+            try:
+                conn.execute("SELECT json_insert('[]', '$[#]', 1)").fetchone()
+                self._json1 = True
+            except sqlite3.Error:
+                self._json1 = False
+                logger.warning("SQLite ohne JSON1-Unterstützung: JSON-Spalten werden in Python aktualisiert.")
+        return self._json1
+
+    @staticmethod
+    def _json_set_sql(column: str, updates: Dict[str, Any]) -> Optional[Tuple[str, List[Any]]]:
+        """
+        Baut einen json_set-Ausdruck, der die obersten Schlüssel aus `updates` ersetzt
+        (dieselbe Semantik wie dict.update). Gibt None zurück, wenn ein Schlüssel ein
+        Anführungszeichen enthält und sich daher nicht als JSON-Pfad schreiben lässt.
+        """
+        expr = f"COALESCE(NULLIF({column}, ''), '{{}}')"
+        if not updates:
+            return expr, []
+        params: List[Any] = []
+        for key, value in updates.items():
+            if '"' in str(key):
+                return None
+            params.extend([f'$."{key}"', json.dumps(value, ensure_ascii=False)])
+        placeholders = ", ".join("?, json(?)" for _ in updates)
+        return f"json_set({expr}, {placeholders})", params
+
+    @staticmethod
+    def _update_json_in_python(conn: sqlite3.Connection, char_id: int, column: str, default: str,
+                               mutate: Callable[[Any], None]) -> bool:
+        """Ersatzweg ohne JSON1: Spalte lesen, in Python ändern, zurückschreiben."""
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {column} FROM characters WHERE char_id = ?", (char_id,))
+        row = cursor.fetchone()
+        if not row:
+            return False
+        value = json.loads(row[column] or default)
+        mutate(value)
+        cursor.execute(f"UPDATE characters SET {column} = ? WHERE char_id = ?", (json.dumps(value), char_id))
+        return True
 
     def update_character_location(self, char_id: int, new_location_id: int):
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute("UPDATE characters SET current_location_id = ? WHERE char_id = ?", (new_location_id, char_id))
-            conn.commit()
-        except sqlite3.Error: conn.rollback()
+            self._commit(conn)
+        except sqlite3.Error: self._rollback(conn)
             
     def get_world_lore(self, world_id: int) -> Optional[str]:
         try:
@@ -548,67 +1127,157 @@ class DatabaseManager:
             logger.error(f"DB error fetching lore for world {world_id}: {e}")
             return None
 
-    def get_events_for_review(self, label: str = 'neutral', world_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_events_for_review_page(self, label: str = 'neutral', world_id: Optional[int] = None,
+                                   after_event_id: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                                   include_archive: bool = False) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Eine Seite der Events mit dem Label, aufsteigend nach event_id ab `after_event_id`.
+        Gibt (Events, next_cursor) zurück; next_cursor ist None, wenn keine weitere Seite folgt.
+        include_archive liest (nur mit world_id) auch die archivierten Events der Welt, z.B. fürs Training.
+        """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            query = "SELECT * FROM events WHERE quality_label = ? "
-            params = [label]
-            if world_id is not None:
-                query += "AND world_id = ? "
-                params.append(world_id)
-            query += "ORDER BY timestamp ASC"
-            cursor.execute(query, tuple(params))
-            return [dict(row) for row in cursor.fetchall()]
+            conn = self._get_read_connection()
+            with self._events_source(conn, world_id if include_archive else None) as source:
+                query = f"SELECT * FROM {source} WHERE quality_label = ? "
+                params: List[Any] = [label]
+                if world_id is not None:
+                    query += "AND world_id = ? "
+                    params.append(world_id)
+                query += "AND event_id > ? ORDER BY event_id ASC LIMIT ?"
+                rows = conn.execute(query, (*params, after_event_id, limit + 1)).fetchall()
+            return self._split_page([dict(row) for row in rows], limit)
         except sqlite3.Error as e:
             logger.error(f"DB error fetching events for review with label '{label}': {e}")
-            return []
+            return [], None
+
+    @contextmanager
+    def _events_source(self, conn: sqlite3.Connection, archive_world_id: Optional[int]) -> Iterator[str]:
+        """Liefert den FROM-Ausdruck für Events: nur die Hauptdatenbank oder (mit Archiv der Welt) beide."""
+        if archive_world_id is None:
+            yield "events"
+            return
+        path = event_archive.archive_path(self.archive_dir, archive_world_id)
+        with event_archive.attached_archive(conn, path) as attached:
+            yield event_archive.events_source(conn) if attached else "events"
 
     def update_event_quality(self, event_id: int, new_label: str) -> bool:
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute("UPDATE events SET quality_label = ? WHERE event_id = ?", (new_label, event_id))
-            conn.commit()
+            self._commit(conn)
             logger.info(f"Updated quality label for event_id {event_id} to '{new_label}'.")
             return True
         except sqlite3.Error as e:
             logger.error(f"DB error updating quality for event_id {event_id}: {e}")
-            conn.rollback()
+            self._rollback(conn)
             return False
 
     def import_events_from_jsonl(self, world_id: int, file_path: Path) -> int:
-        imported_count = 0
+        """Importiert die Events einer JSONL-Datei und gibt die Anzahl der neuen Events zurück."""
+        return self.bulk_import_events_from_jsonl(world_id, file_path).inserted
+
+    def bulk_import_events_from_jsonl(self, world_id: int, file_path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                      rebuild_indexes: bool = False) -> ImportReport:
+        """
+        Importiert die Events einer JSONL-Datei blockweise mit executemany (siehe bulk_import).
+        Anschließend wird die Statistik der Welt neu berechnet, da der Import save_event umgeht.
+        """
+        conn = self._get_connection()
+        report = bulk_import_events(conn, world_id, file_path, chunk_size, rebuild_indexes,
+                                    commit=lambda: self._commit(conn))
+        if report.inserted:
+            self.rebuild_world_stats(world_id)
+            self.invalidate_summary_cache(world_id)
+        logger.info(f"Import abgeschlossen: {report}")
+        return report
+
+    # --- Volltextsuche über Events ---
+
+    def _fulltext_available(self, conn: sqlite3.Connection) -> bool:
+        if self._fts5 is None:
+            self._fts5 = has_fulltext_index(conn)
+        return self._fts5
+
+    @staticmethod
+    def _search_terms(query: str) -> List[str]:
+        """Zerlegt eine Freitext-Suche in Wörter; FTS5-Operatoren im Suchtext werden so wirkungslos."""
+        return re.findall(r"\w+", query.lower())
+
+    def search_events(self, world_id: int, query: str, limit: int = 20,
+                      match_all: bool = True, include_archive: bool = False) -> List[Dict[str, Any]]:
+        """
+        Sucht Events einer Welt, deren Spielereingabe oder KI-Antwort die Suchwörter enthält
+        (Wortanfänge genügen). Mit FTS5 nach Relevanz (bm25) sortiert, sonst per LIKE, neueste zuerst.
+        match_all=False findet Events mit mindestens einem der Wörter.
+        include_archive durchsucht zusätzlich die archivierten Events der Welt (eigener Index je
+        Archiv); die Treffer beider Dateien werden nach Score zusammengeführt.
+        Jedes Ergebnis enthält zusätzlich `snippet` (Fundstelle) und `score` (kleiner ist besser).
+        """
+        terms = self._search_terms(query)
+        if not terms:
+            return []
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            with file_path.open("r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        event = json.loads(line)
-                        cursor.execute(
-                            """
-                            INSERT OR IGNORE INTO events (event_id, world_id, player_input, ai_output, quality_label)
-                            VALUES (?, ?, ?, ?, ?)
-                            """,
-                            (
-                                event['event_id'],
-                                world_id,
-                                event['player_input'],
-                                event['ai_output'],
-                                event.get('quality_label', 'gut (Training)')
-                            )
-                        )
-                        if cursor.rowcount > 0:
-                            imported_count += 1
-                    except (json.JSONDecodeError, KeyError) as e:
-                        logger.warning(f"Skipping malformed line in {file_path.name}: {e}")
-            conn.commit()
-            logger.info(f"Imported {imported_count} new events from '{file_path.name}'.")
+            conn = self._get_read_connection()
+            results = self._search_events_in(conn, "main", world_id, terms, limit, match_all)
+            if not include_archive:
+                return results
+            path = event_archive.archive_path(self.archive_dir, world_id)
+            with event_archive.attached_archive(conn, path) as attached:
+                if attached:
+                    results += self._search_events_in(conn, event_archive.ARCHIVE_SCHEMA, world_id,
+                                                      terms, limit, match_all)
+            # Events, die nach einem abgebrochenen Archivlauf in beiden Dateien stehen, zählen einmal
+            unique = {}
+            for row in results:
+                unique.setdefault(row["event_id"], row)
+            merged = sorted(unique.values(), key=lambda row: (row["score"] is None, row["score"] or 0,
+                                                              -row["event_id"]))
+            return merged[:limit]
         except sqlite3.Error as e:
-            logger.error(f"DB error during import from '{file_path.name}': {e}", exc_info=True)
-            conn.rollback()
-        return imported_count
+            logger.error(f"Fehler bei der Event-Suche in Welt {world_id} nach '{query}': {e}")
+            return []
+
+    def _search_events_in(self, conn: sqlite3.Connection, schema: str, world_id: int, terms: List[str],
+                          limit: int, match_all: bool) -> List[Dict[str, Any]]:
+        """Suche in der Hauptdatenbank (`main`) oder im angehängten Archiv einer Welt."""
+        if schema == "main":
+            fulltext = self._fulltext_available(conn)
+        else:
+            fulltext = has_fulltext_index(conn, schema)
+        if fulltext:
+            match = (" " if match_all else " OR ").join(f'"{term}"*' for term in terms)
+            if schema == "main":
+                # Welt-Filter im MATCH selbst, damit der Index nur die Events dieser Welt liefert
+                match = world_match(world_id, match)
+            cursor = conn.execute(f"""
+                SELECT e.event_id, e.world_id, e.char_id, e.timestamp, e.quality_label,
+                       e.player_input, e.ai_output,
+                       snippet({FULLTEXT_TABLE}, -1, '[', ']', '…', 16) AS snippet,
+                       {FULLTEXT_TABLE}.rank AS score
+                FROM {schema}.{FULLTEXT_TABLE}
+                JOIN {schema}.events e ON e.event_id = {FULLTEXT_TABLE}.rowid
+                WHERE {FULLTEXT_TABLE} MATCH ? AND e.world_id = ?
+                ORDER BY {FULLTEXT_TABLE}.rank
+                LIMIT ?
+            """, (match, world_id, limit))
+            return [dict(row) for row in cursor.fetchall()]
+
+        # Rückfall ohne FTS5: LIKE über beide Spalten
+        conditions, params = [], [world_id]
+        for term in terms:
+            pattern = "%" + term.replace("_", "\\_") + "%"  # Wörter enthalten nur '_' als LIKE-Sonderzeichen
+            conditions.append("(player_input LIKE ? ESCAPE '\\' OR ai_output LIKE ? ESCAPE '\\')")
+            params += [pattern, pattern]
+        cursor = conn.execute(f"""
+            SELECT event_id, world_id, char_id, timestamp, quality_label, player_input, ai_output,
+                   SUBSTR(COALESCE(ai_output, ''), 1, 200) AS snippet, NULL AS score
+            FROM {schema}.events
+            WHERE world_id = ? AND ({(" AND " if match_all else " OR ").join(conditions)})
+            ORDER BY event_id DESC
+            LIMIT ?
+        """, (*params, limit))
+        return [dict(row) for row in cursor.fetchall()]
 
     def get_or_create_world(self, world_name: str) -> Optional[int]:
         world_info = self.get_world_by_name(world_name)
@@ -622,13 +1291,13 @@ class DatabaseManager:
                 "INSERT INTO worlds (name, lore_prompt) VALUES (?, ?)",
                 (world_name, placeholder_lore)
             )
-            conn.commit()
+            self._commit(conn)
             new_world_id = cursor.lastrowid
             logger.info(f"World '{world_name}' not found in tower DB, created it with ID: {new_world_id}.")
             return new_world_id
         except sqlite3.Error as e:
             logger.error(f"Error creating world '{world_name}' in tower DB: {e}", exc_info=True)
-            conn.rollback()
+            self._rollback(conn)
             return None
 
     def get_world_by_name(self, world_name: str) -> Optional[Dict[str, Any]]:
@@ -681,7 +1350,8 @@ class DatabaseManager:
                 "UPDATE events SET ai_output = ?, quality_label = ? WHERE event_id = ?",
                 (corrected_text, new_label, event_id)
             )
-            conn.commit()
+            self._invalidate_summary_for_event(conn, event_id)
+            self._commit(conn)
             if cursor.rowcount == 0:
                 logger.warning(f"Konnte Event mit ID {event_id} für Korrektur nicht finden.")
                 return False
@@ -689,9 +1359,18 @@ class DatabaseManager:
             return True
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Aktualisieren von Event {event_id}: {e}", exc_info=True)
-            conn.rollback()
+            self._rollback(conn)
             return False
         
+    @staticmethod
+    def _invalidate_summary_for_event(conn: sqlite3.Connection, event_id: int):
+        """Verwirft die Zusammenfassung der Welt, zu der ein korrigiertes Event gehört."""
+        # Eigener Cursor, damit cursor.rowcount des Aufrufers erhalten bleibt
+        conn.execute(
+            "DELETE FROM summary_cache WHERE world_id = (SELECT world_id FROM events WHERE event_id = ?)",
+            (event_id,)
+        )
+
     def get_last_event_details(self, world_id: int) -> Optional[Dict[str, Any]]:
         """Holt die Details (ID, ai_output) des letzten Events für eine Welt."""
         try:
@@ -745,8 +1424,9 @@ class DatabaseManager:
             else:
                 logger.error("Ungültige Parameter für update_event_correction")
                 return False
+            self._invalidate_summary_for_event(conn, event_id)
             
-            conn.commit()
+            self._commit(conn)
             if cursor.rowcount == 0:
                 logger.warning(f"Konnte Event mit ID {event_id} für Korrektur nicht finden.")
                 return False
@@ -754,7 +1434,7 @@ class DatabaseManager:
             return True
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Aktualisieren von Event {event_id}: {e}", exc_info=True)
-            conn.rollback()
+            self._rollback(conn)
             return False
         
     def create_user(self, username: str, hashed_password: str, roles: List[str]) -> Optional[int]:
@@ -767,14 +1447,15 @@ class DatabaseManager:
                 "INSERT INTO users (username, hashed_password, roles_json) VALUES (?, ?, ?)",
                 (username, hashed_password, roles_json)
             )
-            conn.commit()
+            self._commit(conn)
             return cursor.lastrowid
         except sqlite3.IntegrityError:
             logger.error(f"Benutzername '{username}' existiert bereits.")
+            self._rollback(conn)
             return None
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Erstellen des Benutzers: {e}", exc_info=True)
-            conn.rollback()
+            self._rollback(conn)
             return None
 
     def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
@@ -831,11 +1512,11 @@ class DatabaseManager:
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute("UPDATE users SET hashed_password = ? WHERE user_id = ?", (new_hashed_password, user_id))
-            conn.commit()
+            self._commit(conn)
             return cursor.rowcount > 0
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Aktualisieren des Passworts für UserID {user_id}: {e}")
-            conn.rollback()
+            self._rollback(conn)
             return False
 
     def update_user_roles(self, user_id: int, roles: List[str]) -> bool:
@@ -845,11 +1526,11 @@ class DatabaseManager:
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute("UPDATE users SET roles_json = ? WHERE user_id = ?", (roles_json, user_id))
-            conn.commit()
+            self._commit(conn)
             return cursor.rowcount > 0
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Aktualisieren der Rollen für UserID {user_id}: {e}")
-            conn.rollback()
+            self._rollback(conn)
             return False
 
     def update_user_status(self, user_id: int, is_active: bool) -> bool:
@@ -858,11 +1539,11 @@ class DatabaseManager:
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute("UPDATE users SET is_active = ? WHERE user_id = ?", (1 if is_active else 0, user_id))
-            conn.commit()
+            self._commit(conn)
             return cursor.rowcount > 0
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Aktualisieren des Status für UserID {user_id}: {e}")
-            conn.rollback()
+            self._rollback(conn)
             return False
 
     def add_xp_to_character(self, char_id: int, xp_to_add: int) -> int:
@@ -881,13 +1562,14 @@ class DatabaseManager:
             
             # Aktualisiere die XP in der Datenbank
             cursor.execute("UPDATE characters SET xp = ? WHERE char_id = ?", (new_xp, char_id))
-            conn.commit()
+            self._sync_character_in_world_stats(conn, char_id)
+            self._commit(conn)
             
             logger.info(f"Charakter {char_id} erhält {xp_to_add} XP. Gesamt-XP: {new_xp}")
             return new_xp
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Hinzufügen von XP für Charakter {char_id}: {e}")
-            conn.rollback()
+            self._rollback(conn)
             return 0
         
     def update_character_level_and_xp(self, char_id: int, new_level: int, new_xp: int) -> bool:
@@ -896,30 +1578,33 @@ class DatabaseManager:
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute("UPDATE characters SET level = ?, xp = ? WHERE char_id = ?", (new_level, new_xp, char_id))
-            conn.commit()
+            self._sync_character_in_world_stats(conn, char_id)
+            self._commit(conn)
             return cursor.rowcount > 0
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Aktualisieren von Level und XP für Charakter {char_id}: {e}")
-            conn.rollback()
+            self._rollback(conn)
             return False
 
     # --- Story Export & Statistics Methods ---
     
-    def get_story_events_for_world(self, world_id: int) -> List[Dict[str, Any]]:
-        """Holt alle Story-Events für eine Welt in chronologischer Reihenfolge."""
+    def get_story_events_page(self, world_id: int, after_event_id: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                              include_archive: bool = False) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Eine Seite Story-Events nach `after_event_id`. Gibt (Events, next_cursor) zurück."""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT event_id, world_id, char_id as player_id, 'STORY' as event_type, 
-                       COALESCE(player_input, '') as content, timestamp, '{}' as metadata
-                FROM events 
-                WHERE world_id = ? 
-                ORDER BY timestamp ASC
-            """, (world_id,))
+            conn = self._get_read_connection()
+            with self._events_source(conn, world_id if include_archive else None) as source:
+                rows = conn.execute(f"""
+                    SELECT event_id, world_id, char_id as player_id, 'STORY' as event_type, 
+                           COALESCE(player_input, '') as content, timestamp, '{{}}' as metadata
+                    FROM {source} 
+                    WHERE world_id = ? AND event_id > ?
+                    ORDER BY event_id ASC
+                    LIMIT ?
+                """, (world_id, after_event_id, limit + 1)).fetchall()
             
             events = []
-            for row in cursor.fetchall():
+            for row in rows:
                 event = {
                     "event_id": row['event_id'],
                     "world_id": row['world_id'],
@@ -931,15 +1616,41 @@ class DatabaseManager:
                 }
                 events.append(event)
             
-            return events
+            return self._split_page(events, limit)
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Laden der Story-Events für Welt {world_id}: {e}")
-            return []
+            return [], None
+
+    def get_event_texts_page(self, world_id: int, after_event_id: int = 0,
+                             limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Spielereingabe und Antwort der Events nach `after_event_id` (nur aktive Events, ohne Archiv)."""
+        try:
+            conn = self._get_read_connection()
+            rows = conn.execute(
+                "SELECT event_id, player_input, ai_output FROM events "
+                "WHERE world_id = ? AND event_id > ? ORDER BY event_id ASC LIMIT ?",
+                (world_id, after_event_id, limit + 1)
+            ).fetchall()
+            return self._split_page([dict(row) for row in rows], limit)
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Laden der Event-Texte für Welt {world_id}: {e}")
+            return [], None
+
+    def count_story_events(self, world_id: int, include_archive: bool = False) -> int:
+        """Anzahl der Story-Events einer Welt (zählt über den Index, ohne die Events zu laden)."""
+        try:
+            conn = self._get_read_connection()
+            with self._events_source(conn, world_id if include_archive else None) as source:
+                row = conn.execute(f"SELECT COUNT(*) FROM {source} WHERE world_id = ?", (world_id,)).fetchone()
+            return row[0] if row else 0
+        except sqlite3.Error as e:
+            logger.error(f"Fehler beim Zählen der Story-Events für Welt {world_id}: {e}")
+            return 0
 
     def get_world_info(self, world_id: int) -> Dict[str, Any]:
         """Holt detaillierte Informationen über eine Welt."""
         try:
-            conn = self._get_connection()
+            conn = self._get_read_connection()
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT world_id, name as world_name, lore_prompt as lore, created_at, 1 as is_active
@@ -964,7 +1675,7 @@ class DatabaseManager:
     def get_player_info_for_world(self, world_id: int) -> Dict[str, Any]:
         """Holt Spieler-Informationen für eine Welt."""
         try:
-            conn = self._get_connection()
+            conn = self._get_read_connection()
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT c.char_id, c.name as character_name, c.backstory, c.level, c.xp,
@@ -981,89 +1692,20 @@ class DatabaseManager:
             """, (world_id,))
             
             row = cursor.fetchone()
-            if row:
-                return {
-                    "char_id": row['char_id'],
-                    "character_name": row['character_name'],
-                    "backstory": row['backstory'] or "",
-                    "level": row['level'] or 1,
-                    "xp": row['xp'] or 0,
-                    "attributes": {
-                        "strength": row['strength'] or 10,
-                        "dexterity": row['dexterity'] or 10,
-                        "constitution": row['constitution'] or 10,
-                        "intelligence": row['intelligence'] or 10,
-                        "wisdom": row['wisdom'] or 10,
-                        "charisma": row['charisma'] or 10,
-                        "perception": row['perception'] or 10
-                    }
-                }
-            return {}
+            return self._format_player_info(dict(row)) if row else {}
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Laden der Spieler-Info für Welt {world_id}: {e}")
             return {}
 
     def get_world_statistics(self, world_id: int) -> Dict[str, Any]:
-        """Berechnet und gibt Statistiken für eine Welt zurück."""
+        """Gibt die laufend gepflegten Statistiken einer Welt zurück (ein Zugriff über den Primärschlüssel)."""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            # Gesamt-Events
-            cursor.execute("SELECT COUNT(*) as total_events FROM events WHERE world_id = ?", (world_id,))
-            total_events = cursor.fetchone()['total_events']
-            
-            # Events nach Typ
-            cursor.execute("""
-                SELECT event_type, COUNT(*) as count 
-                FROM events 
-                WHERE world_id = ? 
-                GROUP BY event_type
-            """, (world_id,))
-            events_by_type = {row['event_type']: row['count'] for row in cursor.fetchall()}
-            
-            # Erstes und letztes Event
-            cursor.execute("""
-                SELECT MIN(timestamp) as first_event, MAX(timestamp) as last_event 
-                FROM events 
-                WHERE world_id = ?
-            """, (world_id,))
-            event_times = cursor.fetchone()
-            
-            # Charakter-Level und XP
-            cursor.execute("""
-                SELECT level, xp 
-                FROM characters 
-                WHERE world_id = ? 
-                LIMIT 1
-            """, (world_id,))
-            char_info = cursor.fetchone()
-            
-            # Spielzeit berechnen (grob basierend auf Events)
-            playtime_hours = 0
-            if event_times['first_event'] and event_times['last_event']:
-                from datetime import datetime
-                first = datetime.fromisoformat(event_times['first_event'])
-                last = datetime.fromisoformat(event_times['last_event'])
-                playtime_hours = round((last - first).total_seconds() / 3600, 1)
-            
-            return {
-                "total_events": total_events,
-                "events_by_type": events_by_type,
-                "first_event": event_times['first_event'],
-                "last_event": event_times['last_event'],
-                "estimated_playtime_hours": playtime_hours,
-                "character_level": char_info['level'] if char_info else 1,
-                "character_xp": char_info['xp'] if char_info else 0,
-                "player_actions": events_by_type.get('PLAYER_ACTION', 0),
-                "story_events": events_by_type.get('STORY', 0),
-                "level_ups": events_by_type.get('LEVEL_UP', 0)
-            }
-            
+            conn = self._get_read_connection()
+            row = conn.execute("SELECT * FROM world_stats WHERE world_id = ?", (world_id,)).fetchone()
+            return self._format_world_statistics(dict(row) if row else {})
         except sqlite3.Error as e:
-            logger.error(f"Fehler beim Berechnen der Statistiken für Welt {world_id}: {e}")
+            logger.error(f"Fehler beim Laden der Statistiken für Welt {world_id}: {e}")
             return {}
-            return False
 
     def update_character_attributes(self, char_id: int, new_attributes: Dict[str, int]) -> bool:
         """Aktualisiert die Attributwerte eines Charakters in der Datenbank."""
@@ -1072,9 +1714,9 @@ class DatabaseManager:
             cursor = conn.cursor()
             attributes_json = json.dumps(new_attributes)
             cursor.execute("UPDATE characters SET attributes_json = ? WHERE char_id = ?", (attributes_json, char_id))
-            conn.commit()
+            self._commit(conn)
             return cursor.rowcount > 0
         except sqlite3.Error as e:
             logger.error(f"Fehler beim Aktualisieren der Attribute für Charakter {char_id}: {e}")
-            conn.rollback()
+            self._rollback(conn)
             return False
@@ -0,0 +1,216 @@
+# class_folder/core/db_migrations.py
+# -*- coding: utf-8 -*-
+
+"""
+Versionierte Schema-Migrationen für die Spieldatenbank.
+`setup_database` legt die Basistabellen an; danach werden alle Migrationen,
+deren Version größer als die in `schema_version` gespeicherte ist, der Reihe
+nach angewendet. Jede Migration läuft in einer eigenen Transaktion und wird
+nur zusammen mit ihrem Eintrag in `schema_version` festgeschrieben.
+Neue Migrationen werden ausschließlich hinten an MIGRATIONS angehängt;
+bestehende Einträge werden nie nachträglich geändert.
+"""
+
+import logging
+import sqlite3
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (Version, Beschreibung, SQL-Anweisungen)
+Migration = Tuple[int, str, List[str]]
+
+MIGRATIONS: List[Migration] = [
+    (1, "Indizes für die Abfragen jedes Spielzugs", [
+        # get_player_location (abdeckend) und get_npcs_at_location
+        "CREATE INDEX IF NOT EXISTS idx_characters_world_player_location "
+        "ON characters (world_id, is_player, current_location_id)",
+        # get_last_events, get_last_event_with_npcs, get_story_events_for_world
+        "CREATE INDEX IF NOT EXISTS idx_events_world_timestamp ON events (world_id, timestamp)",
+        # get_last_event_for_world_player (ORDER BY event_id über die implizite rowid-Spalte)
+        "CREATE INDEX IF NOT EXISTS idx_events_world_char ON events (world_id, char_id)",
+        # get_events_for_review mit Welt-Filter
+        "CREATE INDEX IF NOT EXISTS idx_events_quality_world_timestamp "
+        "ON events (quality_label, world_id, timestamp)",
+    ]),
+    (2, "Indizes für seitenweises Lesen nach event_id", [
+        # Story-Export und letzte Event-ID einer Welt
+        "CREATE INDEX IF NOT EXISTS idx_events_world_event ON events (world_id, event_id)",
+        # Bewertungs-Warteschlange mit und ohne Welt-Filter (ersetzt den Timestamp-Index)
+        "DROP INDEX IF EXISTS idx_events_quality_world_timestamp",
+        "CREATE INDEX IF NOT EXISTS idx_events_quality_world_event ON events (quality_label, world_id, event_id)",
+        "CREATE INDEX IF NOT EXISTS idx_events_quality_event ON events (quality_label, event_id)",
+    ]),
+    (3, "Laufend gepflegte Welt-Statistiken (world_stats)", [
+        """
+        CREATE TABLE IF NOT EXISTS world_stats (
+            world_id INTEGER PRIMARY KEY,
+            total_events INTEGER NOT NULL DEFAULT 0,
+            player_actions INTEGER NOT NULL DEFAULT 0,
+            level_ups INTEGER NOT NULL DEFAULT 0,
+            first_event TIMESTAMP,
+            last_event TIMESTAMP,
+            character_level INTEGER NOT NULL DEFAULT 1,
+            character_xp INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (world_id) REFERENCES worlds (world_id) ON DELETE CASCADE
+        )
+        """,
+        # Bestehende Welten einmalig nachtragen (Level-Ups sind nicht protokolliert: Level - 1)
+        """
+        INSERT OR REPLACE INTO world_stats (world_id, total_events, player_actions, level_ups,
+                                            first_event, last_event, character_level, character_xp)
+        SELECT w.world_id, COALESCE(e.total_events, 0), COALESCE(e.player_actions, 0),
+               MAX(COALESCE(c.level, 1) - 1, 0), e.first_event, e.last_event,
+               COALESCE(c.level, 1), COALESCE(c.xp, 0)
+        FROM worlds w
+        LEFT JOIN (
+            SELECT world_id, COUNT(*) AS total_events,
+                   SUM(COALESCE(player_input, '') <> '') AS player_actions,
+                   MIN(timestamp) AS first_event, MAX(timestamp) AS last_event
+            FROM events GROUP BY world_id
+        ) e ON e.world_id = w.world_id
+        LEFT JOIN characters c ON c.world_id = w.world_id AND c.is_player = 1
+        """,
+    ]),
+    (4, "Prompt-Regeln pro Welt und als Vorlage (prompt_rules)", [
+        """
+        CREATE TABLE IF NOT EXISTS prompt_rules (
+            rule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            world_id INTEGER,
+            template_name TEXT,
+            rule_type TEXT NOT NULL DEFAULT 'RULE',
+            content TEXT NOT NULL,
+            order_index INTEGER NOT NULL DEFAULT 0,
+            is_active BOOLEAN NOT NULL DEFAULT 1
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_prompt_rules_world ON prompt_rules (world_id, order_index)",
+        "CREATE INDEX IF NOT EXISTS idx_prompt_rules_template ON prompt_rules (template_name, order_index)",
+    ]),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Liest die aktuelle Schema-Version (0, wenn noch keine Migration lief)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY, description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn: sqlite3.Connection, migrations: List[Migration] = MIGRATIONS) -> int:
+    """
+    Wendet alle ausstehenden Migrationen an und gibt die neue Schema-Version zurück.
+    Schlägt eine Migration fehl, wird nur sie zurückgerollt und der Fehler weitergereicht.
+    """
+    current_version = get_schema_version(conn)
+    conn.commit()
+    for version, description, statements in sorted(migrations, key=lambda m: m[0]):
+        if version <= current_version:
+            continue
+        try:
+            # DDL öffnet in sqlite3 keine implizite Transaktion, daher explizit
+            conn.execute("BEGIN")
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)", (version, description))
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error(f"Migration {version} ('{description}') fehlgeschlagen: {e}", exc_info=True)
+            raise
+        current_version = version
+        logger.info(f"Datenbank-Migration {version} angewendet: {description}")
+    return current_version
+
+
+# --- Volltextindex (optional) ---
+# FTS5 ist nicht in jeder SQLite-Bibliothek enthalten. Der Index ist daher keine
+# nummerierte Migration: fehlt FTS5, läuft die Datenbank ohne ihn weiter und die
+# Suche fällt auf LIKE zurück.
+
+FULLTEXT_TABLE = "events_fts"
+# world_id ist eine indizierte Spalte, damit MATCH nur die Events einer Welt liefert
+# (Spaltenfilter `world_id : "<id>"`, siehe `world_match`). Sie zählt nicht zur Relevanz.
+FULLTEXT_COLUMNS = ["player_input", "ai_output", "world_id"]
+FULLTEXT_TRIGGERS = ["events_fts_insert", "events_fts_delete", "events_fts_update"]
+
+FULLTEXT_STATEMENTS = [
+    # Externer Inhalt: der Index speichert nur die Tokens, der Text bleibt in events
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FULLTEXT_TABLE} USING fts5(
+        player_input, ai_output, world_id,
+        content='events', content_rowid='event_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"INSERT INTO {FULLTEXT_TABLE} ({FULLTEXT_TABLE}, rank) VALUES ('rank', 'bm25(1.0, 1.0, 0.0)')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+        INSERT INTO {FULLTEXT_TABLE} (rowid, player_input, ai_output, world_id)
+        VALUES (new.event_id, new.player_input, new.ai_output, new.world_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+        INSERT INTO {FULLTEXT_TABLE} ({FULLTEXT_TABLE}, rowid, player_input, ai_output, world_id)
+        VALUES ('delete', old.event_id, old.player_input, old.ai_output, old.world_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF player_input, ai_output ON events BEGIN
+        INSERT INTO {FULLTEXT_TABLE} ({FULLTEXT_TABLE}, rowid, player_input, ai_output, world_id)
+        VALUES ('delete', old.event_id, old.player_input, old.ai_output, old.world_id);
+        INSERT INTO {FULLTEXT_TABLE} (rowid, player_input, ai_output, world_id)
+        VALUES (new.event_id, new.player_input, new.ai_output, new.world_id);
+    END
+    """,
+]
+
+
+def world_match(world_id: int, match: str) -> str:
+    """Beschränkt einen MATCH-Ausdruck auf die Events einer Welt."""
+    return f'world_id : "{int(world_id)}" AND ({match})'
+
+
+def has_fulltext_index(conn: sqlite3.Connection, schema: str = "main") -> bool:
+    row = conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?", (FULLTEXT_TABLE,)
+    ).fetchone()
+    return row is not None
+
+
+def _fulltext_columns(conn: sqlite3.Connection) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA main.table_info({FULLTEXT_TABLE})").fetchall()]
+
+
+def ensure_fulltext_index(conn: sqlite3.Connection) -> bool:
+    """
+    Legt den FTS5-Index über events.player_input/ai_output samt Triggern an und füllt ihn
+    beim ersten Anlegen mit den vorhandenen Events. Ein Index ohne Welt-Spalte (ältere
+    Datenbanken) wird dabei ersetzt. Gibt False zurück, wenn FTS5 fehlt.
+    """
+    exists = has_fulltext_index(conn)
+    outdated = exists and _fulltext_columns(conn) != FULLTEXT_COLUMNS
+    if exists and not outdated:
+        return True
+    try:
+        conn.execute("BEGIN")
+        if outdated:
+            for trigger in FULLTEXT_TRIGGERS:
+                conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            conn.execute(f"DROP TABLE {FULLTEXT_TABLE}")
+        for statement in FULLTEXT_STATEMENTS:
+            conn.execute(statement)
+        conn.execute(f"INSERT INTO {FULLTEXT_TABLE} ({FULLTEXT_TABLE}) VALUES ('rebuild')")
+        conn.commit()
+    except sqlite3.OperationalError as e:
+        conn.rollback()
+        logger.warning(f"Volltextindex nicht verfügbar (FTS5 fehlt?), Suche nutzt LIKE: {e}")
+        return False
+    logger.info("Volltextindex über Events " + ("mit Welt-Spalte neu aufgebaut." if outdated else "angelegt."))
+    return True
@@ -0,0 +1,234 @@
+# class_folder/core/db_snapshot.py
+# -*- coding: utf-8 -*-
+
+"""
+Online-Snapshots der Spieldatenbank im laufenden Betrieb.
+Die Kopie entsteht mit der Backup-API von SQLite (`sqlite3.Connection.backup`)
+in kleinen Schritten zu je `pages_per_step` Seiten, zwischen denen kurz
+pausiert wird. Im WAL-Modus hält die Quellverbindung während der ganzen Kopie
+eine Lesetransaktion offen: Der Snapshot zeigt damit einen festen Stand, die
+Kopie beginnt bei parallelen Schreibzugriffen nicht von vorn, und Schreiber
+werden nie blockiert (sie schreiben ins WAL, nur der Checkpoint wartet).
+
+Ergebnis ist eine gzip-komprimierte Datei `<prefix>_<Zeitstempel>.db.gz`
+(Zeitstempel auf die Mikrosekunde) und daneben ein Manifest (`.manifest.json`)
+mit Prüfsummen, Größen, Schema-Version und Zeilenzahlen. Trainingsskripte lesen den Snapshot über `opened_snapshot`
+statt der Live-Datenbank. Archivdateien alter Events (siehe event_archive)
+gehören nicht zum Snapshot; sie werden nach dem Verschieben nicht mehr geändert.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Any, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGES_PER_STEP = 256     # 1 MiB pro Schritt bei 4 KiB-Seiten
+DEFAULT_STEP_SLEEP = 0.005       # Pause zwischen zwei Schritten (Sekunden)
+DEFAULT_KEEP = 7                 # Anzahl der aufbewahrten Snapshots
+SNAPSHOT_SUFFIX = ".db.gz"
+MANIFEST_SUFFIX = ".manifest.json"
+HASH_BLOCK_SIZE = 1024 * 1024
+
+COUNTED_TABLES = ("worlds", "characters", "locations", "events", "users")
+
+
+def manifest_path(snapshot_path: Path) -> Path:
+    return snapshot_path.with_name(snapshot_path.name[:-len(SNAPSHOT_SUFFIX)] + MANIFEST_SUFFIX)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def backup_database(source_path: Path, target_path: Path,
+                    pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+                    step_sleep: float = DEFAULT_STEP_SLEEP,
+                    busy_timeout_ms: int = 5000) -> Dict[str, Any]:
+    """
+    Kopiert die Datenbank schrittweise nach `target_path` (unkomprimiert) und gibt
+    Schritte, Seiten und Dauer zurück. Die Quelle wird nur lesend geöffnet.
+    """
+    source = sqlite3.connect(f"{source_path.resolve().as_uri()}?mode=ro", uri=True)
+    target = sqlite3.connect(target_path)
+    stats = {"steps": 0, "restarts": 0, "page_count": 0, "consistent_read": False}
+    last_remaining: List[int] = []
+
+    def progress(status: int, remaining: int, total: int):
+        stats["steps"] += 1
+        stats["page_count"] = total
+        # Wächst der Rest, hat ein Schreiber die Quelle geändert und die Kopie beginnt neu
+        if last_remaining and remaining > last_remaining[0]:
+            stats["restarts"] += 1
+        last_remaining[:] = [remaining]
+        if remaining and step_sleep > 0:
+            time.sleep(step_sleep)
+
+    started_at = time.perf_counter()
+    try:
+        source.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+        if source.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal":
+            # Fester Lesestand für die ganze Kopie; blockiert im WAL-Modus keinen Schreiber
+            source.execute("BEGIN")
+            source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            stats["consistent_read"] = True
+        source.backup(target, pages=max(int(pages_per_step), 1), progress=progress)
+        # Die Kopie ist eine eigenständige Datei ohne -wal/-shm
+        target.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        if source.in_transaction:
+            source.rollback()
+        source.close()
+        target.close()
+    stats["seconds"] = round(time.perf_counter() - started_at, 3)
+    return stats
+
+
+def describe_database(path: Path) -> Dict[str, Any]:
+    """Schema-Version, Seitenzahlen und Zeilenzahlen einer (Snapshot-)Datenbank für das Manifest."""
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        info: Dict[str, Any] = {
+            "page_size": conn.execute("PRAGMA page_size").fetchone()[0],
+            "page_count": conn.execute("PRAGMA page_count").fetchone()[0],
+            "schema_version": (conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] or 0)
+                              if "schema_version" in tables else 0,
+            "integrity": conn.execute("PRAGMA quick_check").fetchone()[0],
+            "row_counts": {
+                table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in COUNTED_TABLES if table in tables
+            },
+        }
+        info["max_event_id"] = (conn.execute("SELECT MAX(event_id) FROM events").fetchone()[0]
+                                if "events" in tables else None)
+        return info
+    finally:
+        conn.close()
+
+
+def create_snapshot(source_path: Path, snapshot_dir: Path, prefix: Optional[str] = None,
+                    pages_per_step: int = DEFAULT_PAGES_PER_STEP,
+                    step_sleep: float = DEFAULT_STEP_SLEEP,
+                    busy_timeout_ms: int = 5000,
+                    compress_level: int = 6) -> Dict[str, Any]:
+    """
+    Erstellt einen komprimierten Snapshot samt Manifest in `snapshot_dir` und gibt das Manifest zurück.
+    Beide Dateien erscheinen erst, wenn sie vollständig geschrieben sind.
+    """
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    created_at = datetime.now()
+    # Mikrosekunden im Namen: zwei Snapshots derselben Sekunde dürfen sich nicht überschreiben
+    name = f"{prefix or source_path.stem}_{created_at.strftime('%Y%m%d-%H%M%S-%f')}{SNAPSHOT_SUFFIX}"
+    snapshot_path = snapshot_dir / name
+    if snapshot_path.exists():
+        raise FileExistsError(f"Snapshot '{name}' existiert bereits.")
+
+    with tempfile.TemporaryDirectory(dir=snapshot_dir, prefix=".snapshot-") as tmp_dir:
+        raw_path = Path(tmp_dir) / "snapshot.db"
+        backup_stats = backup_database(source_path, raw_path, pages_per_step, step_sleep, busy_timeout_ms)
+        description = describe_database(raw_path)
+
+        started_at = time.perf_counter()
+        raw_digest = hashlib.sha256()
+        partial_path = Path(tmp_dir) / name
+        with raw_path.open("rb") as raw, gzip.open(partial_path, "wb", compresslevel=compress_level) as packed:
+            for block in iter(lambda: raw.read(HASH_BLOCK_SIZE), b""):
+                raw_digest.update(block)
+                packed.write(block)
+        compress_seconds = time.perf_counter() - started_at
+
+        manifest = {
+            "file": name,
+            "created_at": created_at.isoformat(timespec="microseconds"),
+            "source": str(source_path.resolve()),
+            "size_bytes": raw_path.stat().st_size,
+            "compressed_bytes": partial_path.stat().st_size,
+            "sha256": raw_digest.hexdigest(),
+            "compressed_sha256": _file_sha256(partial_path),
+            **description,
+            "backup": {**backup_stats, "pages_per_step": pages_per_step, "step_sleep": step_sleep},
+            "compress_seconds": round(compress_seconds, 3),
+        }
+        partial_path.replace(snapshot_path)
+
+    partial_manifest = manifest_path(snapshot_path).with_suffix(".part")
+    partial_manifest.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    partial_manifest.replace(manifest_path(snapshot_path))
+    logger.info(f"Snapshot '{name}' erstellt: {manifest['size_bytes']} Bytes -> {manifest['compressed_bytes']} Bytes, "
+                f"{backup_stats['steps']} Schritte in {backup_stats['seconds']}s.")
+    return manifest
+
+
+def list_snapshots(snapshot_dir: Path) -> List[Dict[str, Any]]:
+    """Gibt die Manifeste aller vollständigen Snapshots zurück, den neuesten zuerst."""
+    manifests = []
+    if not snapshot_dir.exists():
+        return manifests
+    for path in snapshot_dir.glob(f"*{MANIFEST_SUFFIX}"):
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Manifest '{path.name}' nicht lesbar: {e}")
+            continue
+        if (snapshot_dir / manifest.get("file", "")).is_file():
+            manifests.append(manifest)
+    return sorted(manifests, key=lambda m: m["created_at"], reverse=True)
+
+
+def prune_snapshots(snapshot_dir: Path, keep: int = DEFAULT_KEEP) -> List[str]:
+    """Löscht alle Snapshots außer den `keep` neuesten und gibt die gelöschten Dateinamen zurück."""
+    removed = []
+    for manifest in list_snapshots(snapshot_dir)[max(keep, 1):]:
+        snapshot_path = snapshot_dir / manifest["file"]
+        snapshot_path.unlink(missing_ok=True)
+        manifest_path(snapshot_path).unlink(missing_ok=True)
+        removed.append(manifest["file"])
+    return removed
+
+
+def restore_snapshot(snapshot_path: Path, target_path: Path, verify: bool = True) -> Path:
+    """
+    Entpackt einen Snapshot nach `target_path`. Mit `verify` wird die Prüfsumme gegen das
+    Manifest geprüft; bei Abweichung wird die Datei entfernt und ein ValueError ausgelöst.
+    """
+    digest = hashlib.sha256()
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(snapshot_path, "rb") as packed, target_path.open("wb") as raw:
+        for block in iter(lambda: packed.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+            raw.write(block)
+
+    manifest_file = manifest_path(snapshot_path)
+    if verify and manifest_file.exists():
+        expected = json.loads(manifest_file.read_text(encoding="utf-8")).get("sha256")
+        if expected and expected != digest.hexdigest():
+            target_path.unlink(missing_ok=True)
+            raise ValueError(f"Prüfsumme von Snapshot '{snapshot_path.name}' stimmt nicht mit dem Manifest überein.")
+    elif verify:
+        logger.warning(f"Kein Manifest zu Snapshot '{snapshot_path.name}' gefunden, Prüfsumme nicht geprüft.")
+    return target_path
+
+
+def latest_snapshot(snapshot_dir: Path) -> Optional[Path]:
+    manifests = list_snapshots(snapshot_dir)
+    return snapshot_dir / manifests[0]["file"] if manifests else None
+
+
+@contextmanager
+def opened_snapshot(snapshot_path: Path) -> Iterator[Path]:
+    """Entpackt einen Snapshot in ein temporäres Verzeichnis und liefert den Pfad der Datenbankdatei."""
+    with tempfile.TemporaryDirectory(prefix="laststrawberry-snapshot-") as tmp_dir:
+        yield restore_snapshot(snapshot_path, Path(tmp_dir) / "snapshot.db")
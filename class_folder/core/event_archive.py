@@ -0,0 +1,181 @@
+# class_folder/core/event_archive.py
+# -*- coding: utf-8 -*-
+
+"""
+Archivierung alter Events in eine SQLite-Datei pro Welt (heiße/kalte Daten).
+Die Hauptdatenbank behält nur das jüngste Fenster jeder Welt, damit die
+Abfragen eines Spielzugs auf einer kleinen, im Page-Cache liegenden Datei
+laufen. Ältere Events werden blockweise in `<archive_dir>/world_<id>_events.db`
+verschoben. Export und Training hängen das Archiv bei Bedarf per ATTACH an
+und lesen Haupt- und Archivtabelle gemeinsam (siehe `events_source`). Jedes
+Archiv hat einen eigenen FTS5-Index, damit die Volltextsuche (und damit das
+Langzeitgedächtnis) auch archivierte Events findet.
+
+Das Verschieben schreibt jeden Block zuerst ins Archiv und löscht ihn erst
+danach aus der Hauptdatenbank. Im WAL-Modus sind Transaktionen über mehrere
+Dateien nicht gemeinsam atomar; bei einem Abbruch kann ein Event daher kurz in
+beiden Dateien stehen, geht aber nie verloren. Lesende Abfragen blenden solche
+Doppelten aus, der nächste Lauf räumt sie auf.
+"""
+
+import logging
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Callable, Iterator, List
+
+from .db_migrations import FULLTEXT_TABLE, has_fulltext_index
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = "archive"
+DEFAULT_KEEP_RECENT = 1000   # Jüngste Events pro Welt, die immer in der Hauptdatenbank bleiben
+MIN_KEEP_RECENT = 50         # Untergrenze: deckt das Kontextfenster der Prompts großzügig ab
+DEFAULT_BATCH_SIZE = 5000    # Events pro verschobenem Block
+
+# Volltextindex im Archiv: wie in der Hauptdatenbank, aber ohne Welt-Spalte (eine Datei pro Welt).
+# Die Trigger liegen in der Archivdatei und beziehen sich nur auf deren Tabellen.
+ARCHIVE_FULLTEXT_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.{FULLTEXT_TABLE} USING fts5(
+        player_input, ai_output,
+        content='events', content_rowid='event_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {ARCHIVE_SCHEMA}.events_fts_insert AFTER INSERT ON events BEGIN
+        INSERT INTO {FULLTEXT_TABLE} (rowid, player_input, ai_output)
+        VALUES (new.event_id, new.player_input, new.ai_output);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {ARCHIVE_SCHEMA}.events_fts_delete AFTER DELETE ON events BEGIN
+        INSERT INTO {FULLTEXT_TABLE} ({FULLTEXT_TABLE}, rowid, player_input, ai_output)
+        VALUES ('delete', old.event_id, old.player_input, old.ai_output);
+    END
+    """,
+]
+
+
+def archive_path(archive_dir: Path, world_id: int) -> Path:
+    return archive_dir / f"world_{world_id}_events.db"
+
+
+def hot_event_columns(conn: sqlite3.Connection) -> List[str]:
+    return [row[1] for row in conn.execute("PRAGMA main.table_info(events)").fetchall()]
+
+
+@contextmanager
+def attached_archive(conn: sqlite3.Connection, path: Path, create: bool = False) -> Iterator[bool]:
+    """
+    Hängt das Archiv einer Welt als Schema `archive` an und löst es danach wieder.
+    Liefert False (ohne ATTACH), wenn die Datei fehlt und `create` nicht gesetzt ist.
+    Darf nicht innerhalb einer offenen Transaktion verwendet werden.
+    """
+    if not create and not path.exists():
+        yield False
+        return
+    if create:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (str(path),))
+    try:
+        if create:
+            _ensure_archive_schema(conn)
+        yield True
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+
+
+def _ensure_archive_schema(conn: sqlite3.Connection):
+    """Legt die Archivtabelle mit den Spalten der Hauptdatenbank an und ergänzt später hinzugekommene Spalten."""
+    columns = conn.execute("PRAGMA main.table_info(events)").fetchall()  # (cid, name, type, notnull, dflt, pk)
+    definitions = ", ".join(
+        "event_id INTEGER PRIMARY KEY" if name == "event_id" else f'"{name}" {col_type}'
+        for _, name, col_type, _, _, _ in columns
+    )
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.events ({definitions})")
+    existing = {row[1] for row in conn.execute(f"PRAGMA {ARCHIVE_SCHEMA}.table_info(events)").fetchall()}
+    for _, name, col_type, _, _, _ in columns:
+        if name not in existing:
+            conn.execute(f'ALTER TABLE {ARCHIVE_SCHEMA}.events ADD COLUMN "{name}" {col_type}')
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_events_quality_event ON events (quality_label, event_id)"
+    )
+    conn.commit()
+    _ensure_archive_fulltext(conn)
+
+
+def _ensure_archive_fulltext(conn: sqlite3.Connection):
+    """Legt den Volltextindex des Archivs an und füllt ihn mit bereits archivierten Events (ältere Archive)."""
+    if has_fulltext_index(conn, ARCHIVE_SCHEMA):
+        return
+    try:
+        conn.execute("BEGIN")
+        for statement in ARCHIVE_FULLTEXT_STATEMENTS:
+            conn.execute(statement)
+        conn.execute(f"INSERT INTO {ARCHIVE_SCHEMA}.{FULLTEXT_TABLE} ({FULLTEXT_TABLE}) VALUES ('rebuild')")
+        conn.commit()
+    except sqlite3.OperationalError as e:
+        conn.rollback()
+        logger.warning(f"Volltextindex im Archiv nicht verfügbar (FTS5 fehlt?), Suche nutzt LIKE: {e}")
+
+
+def events_source(conn: sqlite3.Connection) -> str:
+    """
+    FROM-Ausdruck über Haupt- und angehängte Archivtabelle mit den Spalten der Hauptdatenbank.
+    Spalten, die das Archiv (noch) nicht kennt, werden als NULL geliefert; Events, die noch in
+    beiden Dateien stehen, zählen nur einmal (die Hauptdatenbank gewinnt).
+    """
+    hot_columns = hot_event_columns(conn)
+    archived = {row[1] for row in conn.execute(f"PRAGMA {ARCHIVE_SCHEMA}.table_info(events)").fetchall()}
+    hot_list = ", ".join(f'"{name}"' for name in hot_columns)
+    archive_list = ", ".join(f'a."{name}"' if name in archived else f'NULL AS "{name}"' for name in hot_columns)
+    return (f"(SELECT {hot_list} FROM main.events "
+            f"UNION ALL SELECT {archive_list} FROM {ARCHIVE_SCHEMA}.events a "
+            f"WHERE NOT EXISTS (SELECT 1 FROM main.events m WHERE m.event_id = a.event_id))")
+
+
+def move_events_to_archive(conn: sqlite3.Connection, world_id: int, cutoff_event_id: int,
+                           batch_size: int = DEFAULT_BATCH_SIZE,
+                           commit: Optional[Callable[[], None]] = None) -> int:
+    """
+    Verschiebt die Events der Welt bis einschließlich `cutoff_event_id` blockweise ins
+    angehängte Archiv. Gibt die Anzahl der aus der Hauptdatenbank entfernten Events zurück.
+    """
+    commit = commit or conn.commit
+    column_list = ", ".join(f'"{name}"' for name in hot_event_columns(conn))
+    moved, last_event_id = 0, 0
+    while True:
+        batch = conn.execute(
+            "SELECT event_id FROM main.events WHERE world_id = ? AND event_id > ? AND event_id <= ? "
+            "ORDER BY event_id LIMIT ?",
+            (world_id, last_event_id, cutoff_event_id, batch_size)
+        ).fetchall()
+        if not batch:
+            break
+        first_id, last_event_id = batch[0][0], batch[-1][0]
+        # 1. Kopie festschreiben. Eine Kopie aus einem abgebrochenen Lauf wird ersetzt; gelöscht
+        #    wird explizit statt per REPLACE, weil REPLACE die Delete-Trigger des Index nicht auslöst.
+        conn.execute(
+            f"DELETE FROM {ARCHIVE_SCHEMA}.events WHERE event_id IN "
+            f"(SELECT event_id FROM main.events WHERE world_id = ? AND event_id BETWEEN ? AND ?)",
+            (world_id, first_id, last_event_id)
+        )
+        conn.execute(
+            f"INSERT INTO {ARCHIVE_SCHEMA}.events ({column_list}) "
+            f"SELECT {column_list} FROM main.events WHERE world_id = ? AND event_id BETWEEN ? AND ?",
+            (world_id, first_id, last_event_id)
+        )
+        commit()
+        # 2. Erst dann aus der Hauptdatenbank löschen
+        cursor = conn.execute(
+            "DELETE FROM main.events WHERE world_id = ? AND event_id BETWEEN ? AND ?",
+            (world_id, first_id, last_event_id)
+        )
+        commit()
+        moved += cursor.rowcount
+        logger.debug(f"Welt {world_id}: Events {first_id}-{last_event_id} archiviert.")
+    return moved
@@ -84,27 +84,24 @@ class HFFineTuner:
         logger.info(f"Fetching high-quality events for NARRATIVE training (world_id {self.world_id})...")
         # get_events_for_review holt als 'gut' bewertete Events
         labels_to_fetch = ['human_corrected', 'gut (Training)']
-        all_events = []
+        # Seitenweise lesen; Duplikate (ein Event mit mehreren Labels, unwahrscheinlich) über die event_id vermeiden
+        formatted_by_event_id = {}
         for label in labels_to_fetch:
-            events = self.db_manager.get_events_for_review(label=label, world_id=self.world_id)
-            all_events.extend(events)
-            logger.info(f"Found {len(events)} events with label '{label}'.")
-
-        if not all_events:
+            label_count = 0
+            for event in self.db_manager.iter_events_for_review(label=label, world_id=self.world_id,
+                                                                 include_archive=True):
+                # Llama-3-Format für einen einfachen Dialog-Turn
+                text = (f"<|begin_of_text|><|start_header_id|>user<|end_header_id|>\n\n"
+                        f"{event['player_input']}<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n"
+                        f"{event['ai_output']}<|eot_id|>")
+                formatted_by_event_id[event['event_id']] = {"text": text}
+                label_count += 1
+            logger.info(f"Found {label_count} events with label '{label}'.")
+
+        if not formatted_by_event_id:
             return None
 
-        # Um Duplikate zu vermeiden, falls ein Event mehrere Labels hätte (unwahrscheinlich, aber sicher ist sicher)
-        unique_events = {event['event_id']: event for event in all_events}.values()
-
-
-        formatted_data = []
-        for event in unique_events:
-            # Llama-3-Format für einen einfachen Dialog-Turn
-            text = (f"<|begin_of_text|><|start_header_id|>user<|end_header_id|>\n\n"
-                    f"{event['player_input']}<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n"
-                    f"{event['ai_output']}<|eot_id|>")
-            formatted_data.append({"text": text})
-
+        formatted_data = list(formatted_by_event_id.values())
         logger.info(f"Prepared {len(formatted_data)} unique dialogue entries for narrative training.")
         return formatted_data
 
@@ -0,0 +1,201 @@
+# class_folder/core/id_token_provider.py
+# -*- coding: utf-8 -*-
+
+"""
+Zwischenspeicher für Google-ID-Tokens, mit denen der Cloud-Run-KI-Dienst
+aufgerufen wird. Ein Token wird bis kurz vor seinem Ablauf wiederverwendet und
+im Hintergrund erneuert, sodass pro KI-Anfrage kein Metadaten- bzw. OAuth-Roundtrip
+mehr anfällt. Der asynchrone Zugriff blockiert den Event-Loop nie: Abrufe laufen
+in einem Worker-Thread.
+Für Offline-Tests und lokale Entwicklung gibt es einen Fake-Aussteller.
+"""
+
+import asyncio
+import base64
+import itertools
+import json
+import logging
+import threading
+import time
+from typing import Optional, Callable, Dict, Any
+
+try:
+    from google.oauth2 import id_token
+    from google.auth.transport import requests as google_requests
+    GOOGLE_AUTH_AVAILABLE = True
+except ImportError:
+    GOOGLE_AUTH_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_google_id_token(audience: str) -> str:
+    """Holt ein ID-Token über die Standard-Credentials (Metadatenserver oder Service-Account)."""
+    if not GOOGLE_AUTH_AVAILABLE:
+        raise ImportError("google-auth ist erforderlich, um ID-Tokens für Google Cloud abzurufen.")
+    return id_token.fetch_id_token(google_requests.Request(), audience)
+
+
+def _decode_expiry(token: str) -> Optional[float]:
+    """Liest den 'exp'-Claim aus einem JWT, ohne die Signatur zu prüfen."""
+    try:
+        payload_b64 = token.split('.')[1]
+        payload_b64 += '=' * (-len(payload_b64) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(payload_b64))
+        return float(payload['exp'])
+    except (IndexError, KeyError, ValueError, TypeError):
+        return None
+
+
+class FakeIdTokenIssuer:
+    """
+    Stellt unsignierte JWTs mit korrektem 'exp'-Claim aus.
+    Kann als `fetcher` an den IdTokenProvider übergeben werden, um Caching
+    und Erneuerung ohne Netzwerk und ohne Google-Credentials zu testen.
+    """
+
+    def __init__(self, lifetime_seconds: float = 3600.0, issuer: str = "https://fake-issuer.local"):
+        self.lifetime_seconds = lifetime_seconds
+        self.issuer = issuer
+        self.issued_count = 0
+        self._serial = itertools.count(1)
+
+    def __call__(self, audience: str) -> str:
+        now = time.time()
+        header = {"alg": "none", "typ": "JWT"}
+        payload = {"iss": self.issuer, "aud": audience, "iat": int(now),
+                   "exp": int(now + self.lifetime_seconds), "jti": str(next(self._serial))}
+        self.issued_count += 1
+        return ".".join([self._b64(header), self._b64(payload), ""])
+
+    @staticmethod
+    def _b64(data: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+class IdTokenProvider:
+    """
+    Liefert ein gültiges ID-Token für eine Zielgruppe (audience).
+    Threadsicher; kann gleichzeitig aus synchronem Code und aus dem Event-Loop benutzt werden.
+    """
+
+    def __init__(
+        self,
+        audience: str,
+        fetcher: Optional[Callable[[str], str]] = None,
+        refresh_margin_seconds: float = 300.0,
+        expiry_safety_seconds: float = 30.0,
+        default_lifetime_seconds: float = 3600.0
+    ):
+        """
+        Args:
+            audience: Ziel-URL, für die das Token ausgestellt wird.
+            fetcher: Funktion audience -> Token. Standard ist der Google-Abruf.
+            refresh_margin_seconds: So lange vor Ablauf wird im Hintergrund erneuert.
+            expiry_safety_seconds: So lange vor Ablauf gilt ein Token als nicht mehr verwendbar.
+            default_lifetime_seconds: Angenommene Laufzeit, falls das Token keinen 'exp'-Claim hat.
+        """
+        self.audience = audience
+        self.fetcher = fetcher or fetch_google_id_token
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.expiry_safety_seconds = expiry_safety_seconds
+        self.default_lifetime_seconds = default_lifetime_seconds
+
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._generation = 0  # Wird von invalidate erhöht; erkennt Verwerfen während eines Abrufs
+        self._lock = threading.Lock()
+        self._background_refresh: Optional[threading.Thread] = None
+        self.stats = {"cache_hits": 0, "fetches": 0, "background_refreshes": 0, "fetch_errors": 0}
+
+    def _is_usable(self, now: float) -> bool:
+        return self._token is not None and now < self._expires_at - self.expiry_safety_seconds
+
+    def _needs_refresh(self, now: float) -> bool:
+        return now >= self._expires_at - self.refresh_margin_seconds
+
+    def _fetch_locked(self, force: bool = False) -> str:
+        """Holt ein neues Token. Erwartet, dass der Aufrufer `self._lock` hält."""
+        now = time.time()
+        if not force and self._is_usable(now) and not self._needs_refresh(now):
+            # Ein anderer Thread hat in der Zwischenzeit bereits erneuert
+            return self._token
+        generation = self._generation
+        try:
+            token = self.fetcher(self.audience)
+        except Exception:
+            self.stats["fetch_errors"] += 1
+            raise
+        expires_at = _decode_expiry(token) or (time.time() + self.default_lifetime_seconds)
+        self._token, self._expires_at = token, expires_at
+        if self._generation != generation:
+            # Während des Abrufs verworfen: es könnte das abgelehnte Token sein, der nächste Aufruf holt neu
+            self._expires_at = 0.0
+        self.stats["fetches"] += 1
+        logger.info(f"Neues ID-Token für {self.audience} geholt, gültig für {expires_at - time.time():.0f}s.")
+        return token
+
+    def _refresh_blocking(self, force: bool = False) -> str:
+        with self._lock:
+            return self._fetch_locked(force)
+
+    def _run_background_refresh(self):
+        try:
+            self._refresh_blocking()
+            self.stats["background_refreshes"] += 1
+        except Exception as e:
+            logger.warning(f"Hintergrund-Erneuerung des ID-Tokens fehlgeschlagen: {e}")
+
+    def _start_background_refresh(self):
+        """Startet höchstens eine Erneuerung gleichzeitig in einem Daemon-Thread."""
+        if self._background_refresh and self._background_refresh.is_alive():
+            return
+        self._background_refresh = threading.Thread(
+            target=self._run_background_refresh, name="id-token-refresh", daemon=True
+        )
+        self._background_refresh.start()
+
+    def _cached_token(self) -> Optional[str]:
+        """Gibt das gespeicherte Token zurück, falls verwendbar, und stößt ggf. die Erneuerung an."""
+        now = time.time()
+        if not self._is_usable(now):
+            return None
+        if self._needs_refresh(now):
+            self._start_background_refresh()
+        self.stats["cache_hits"] += 1
+        return self._token
+
+    def get_token(self, force_refresh: bool = False) -> str:
+        """Synchroner Zugriff, z.B. für den requests-basierten CloudInferenceService."""
+        if not force_refresh:
+            token = self._cached_token()
+            if token:
+                return token
+        return self._refresh_blocking(force_refresh)
+
+    async def get_token_async(self, force_refresh: bool = False) -> str:
+        """Asynchroner Zugriff. Ein nötiger Abruf läuft in einem Worker-Thread."""
+        if not force_refresh:
+            token = self._cached_token()
+            if token:
+                return token
+        return await asyncio.to_thread(self._refresh_blocking, force_refresh)
+
+    def prefetch(self):
+        """Holt das erste Token im Hintergrund, z.B. beim Serverstart."""
+        if not self._is_usable(time.time()):
+            self._start_background_refresh()
+
+    def invalidate(self):
+        """
+        Verwirft das gespeicherte Token, z.B. nach einer 401-Antwort. Kommt ohne Lock aus und
+        wartet daher nie auf einen laufenden Abruf; wird direkt aus dem Event-Loop aufgerufen.
+        """
+        self._generation += 1
+        self._expires_at = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        has_token = self._token is not None and self._expires_at > 0
+        remaining = self._expires_at - time.time() if has_token else 0.0
+        return {**self.stats, "has_token": has_token,
+                "seconds_until_expiry": round(max(0.0, remaining), 1)}
@@ -9,8 +9,9 @@ This version includes logic to automatically load the latest LoRA adapter.
 
 import logging
 import os
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Iterator, Dict, Any
 
 # Configuration and optional libraries
 from . import game_config as config
@@ -21,6 +22,9 @@ try:
         AutoModelForCausalLM,
         AutoTokenizer,
         BitsAndBytesConfig,
+        StoppingCriteria,
+        StoppingCriteriaList,
+        TextIteratorStreamer,
         pipeline
     )
     from peft import PeftModel
@@ -32,10 +36,26 @@ except ImportError:
     AutoTokenizer = type('AutoTokenizer', (object,), {})
     BitsAndBytesConfig = type('BitsAndBytesConfig', (object,), {})
     PeftModel = type('PeftModel', (object,), {})
+    StoppingCriteria = object
+    StoppingCriteriaList = None
+    TextIteratorStreamer = None
     pipeline = None
 
 logger = logging.getLogger(__name__)
 
+# Maximale Wartezeit auf das nächste Token beim Streaming, bevor abgebrochen wird
+STREAM_TOKEN_TIMEOUT_SECONDS = 120.0
+
+
+class _StopOnEvent(StoppingCriteria):
+    """Beendet eine laufende Generierung, sobald das Event gesetzt wird (z.B. Client getrennt)."""
+
+    def __init__(self, stop_event: threading.Event):
+        self.stop_event = stop_event
+
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        return self.stop_event.is_set()
+
 
 class InferenceService:
     """Handles AI model loading and world-specific adapter application."""
@@ -226,6 +246,43 @@ class InferenceService:
         self.current_adapter_type = adapter_type
         self.current_world_name = world_name
 
+    def _prepare_generation(self, prompt: str):
+        """
+        Tokenisiert den Prompt und stellt die Generierungs-Parameter zusammen.
+        Gibt (inputs, prompt_tokens, generate_kwargs) zurück oder einen Fehlertext.
+        """
+        # Direkte Tokenizer-Nutzung für bessere Kontrolle
+        inputs = self.tokenizer(prompt, return_tensors="pt", truncation=True)
+        
+        # GPU-Speicher optimieren
+        if torch.cuda.is_available():
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        
+        prompt_tokens = inputs['input_ids'].shape[1]
+        model_max_length = getattr(self.model.config, 'max_position_embeddings', 2048)
+        safety_buffer = 150
+        max_new_tokens_dynamic = min(512, model_max_length - prompt_tokens - safety_buffer)
+        
+        if max_new_tokens_dynamic <= 0:
+            logger.error(f"Prompt is too long ({prompt_tokens} tokens) for the model to generate a response.")
+            return "[Fehler: Der Kontext der Geschichte ist zu lang geworden.]"
+
+        generate_kwargs: Dict[str, Any] = dict(
+            attention_mask=inputs.get('attention_mask'),
+            max_new_tokens=max_new_tokens_dynamic,
+            do_sample=True,
+            temperature=0.7,
+            top_p=0.9,
+            repetition_penalty=1.15,
+            pad_token_id=self.tokenizer.eos_token_id,
+            eos_token_id=[
+                self.tokenizer.eos_token_id,
+                self.tokenizer.convert_tokens_to_ids("<|eot_id|>")
+            ],
+            use_cache=True  # Aktiviert Key-Value-Cache für bessere Performance
+        )
+        return inputs, prompt_tokens, generate_kwargs
+
     def generate_story_response(self, prompt: str) -> str:
         """
         Generates a story response from the AI based on a given prompt.
@@ -236,39 +293,14 @@ class InferenceService:
 
         logger.info("Generating AI response...")
         try:
-            # Direkte Tokenizer-Nutzung für bessere Kontrolle
-            inputs = self.tokenizer(prompt, return_tensors="pt", truncation=True)
-            
-            # GPU-Speicher optimieren
-            if torch.cuda.is_available():
-                inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            prompt_tokens = inputs['input_ids'].shape[1]
-            model_max_length = getattr(self.model.config, 'max_position_embeddings', 2048)
-            safety_buffer = 150
-            max_new_tokens_dynamic = min(512, model_max_length - prompt_tokens - safety_buffer)
-            
-            if max_new_tokens_dynamic <= 0:
-                logger.error(f"Prompt is too long ({prompt_tokens} tokens) for the model to generate a response.")
-                return "[Fehler: Der Kontext der Geschichte ist zu lang geworden.]"
+            prepared = self._prepare_generation(prompt)
+            if isinstance(prepared, str):
+                return prepared
+            inputs, prompt_tokens, generate_kwargs = prepared
 
             # Direkte Model-Generierung ohne Pipeline für bessere Performance
             with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs['input_ids'],
-                    attention_mask=inputs.get('attention_mask'),
-                    max_new_tokens=max_new_tokens_dynamic,
-                    do_sample=True,
-                    temperature=0.7,
-                    top_p=0.9,
-                    repetition_penalty=1.15,
-                    pad_token_id=self.tokenizer.eos_token_id,
-                    eos_token_id=[
-                        self.tokenizer.eos_token_id,
-                        self.tokenizer.convert_tokens_to_ids("<|eot_id|>")
-                    ],
-                    use_cache=True  # Aktiviert Key-Value-Cache für bessere Performance
-                )
+                outputs = self.model.generate(inputs['input_ids'], **generate_kwargs)
 
             # Dekodiere die Antwort
             generated_tokens = outputs[0][prompt_tokens:]  # Nur neue Tokens
@@ -292,3 +324,60 @@ class InferenceService:
         except Exception as e:
             logger.error(f"Error during AI text generation: {e}", exc_info=True)
             return f"Ein interner Fehler ist in der KI aufgetreten: {e}"
+
+    def generate_story_response_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Wie generate_story_response, liefert den Text aber stückweise, sobald
+        das Modell neue Tokens erzeugt. Die Generierung läuft in einem eigenen
+        Thread; wird der Iterator vorzeitig geschlossen, bricht sie ab.
+        """
+        if not self.model or not self.tokenizer:
+            yield "Fehler: Model/Tokenizer ist nicht initialisiert."
+            return
+        if TextIteratorStreamer is None:
+            yield self.generate_story_response(prompt)
+            return
+
+        logger.info("Generating AI response (streaming)...")
+        try:
+            prepared = self._prepare_generation(prompt)
+        except Exception as e:
+            logger.error(f"Error during AI text generation: {e}", exc_info=True)
+            yield f"Ein interner Fehler ist in der KI aufgetreten: {e}"
+            return
+        if isinstance(prepared, str):
+            yield prepared
+            return
+        inputs, _, generate_kwargs = prepared
+
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True,
+                                        timeout=STREAM_TOKEN_TIMEOUT_SECONDS)
+        stop_event = threading.Event()
+        generate_kwargs.update(streamer=streamer, stopping_criteria=StoppingCriteriaList([_StopOnEvent(stop_event)]))
+
+        def run_generation():
+            try:
+                with torch.no_grad():
+                    self.model.generate(inputs['input_ids'], **generate_kwargs)
+            except Exception as e:
+                logger.error(f"Error during AI text generation: {e}", exc_info=True)
+                streamer.end()
+
+        generation_thread = threading.Thread(target=run_generation, name="story-stream", daemon=True)
+        generation_thread.start()
+        produced_text = False
+        try:
+            for text_chunk in streamer:
+                if text_chunk:
+                    produced_text = True
+                    yield text_chunk
+            if not produced_text:
+                logger.warning("AI did not generate a valid response or the response was empty.")
+                yield "Die KI schweigt..."
+            else:
+                logger.info("AI response streamed successfully.")
+        finally:
+            stop_event.set()
+            generation_thread.join()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
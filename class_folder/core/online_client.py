@@ -5,8 +5,9 @@
 Dieser Client kapselt die gesamte Kommunikation mit dem Backend-Server.
 """
 
+import json
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 import httpx
 import certifi
 
@@ -74,6 +75,36 @@ class OnlineClient:
         except (httpx.RequestError, httpx.HTTPStatusError) as e:
             return {"event_type": "ERROR", "response": f"[Server-Fehler: {e}]"}
 
+    async def stream_command(self, command: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Sendet einen Spieler-Befehl an /command/stream und liefert die Ereignisse,
+        sobald sie eintreffen: 'roll', 'token' (Textstücke der Erzählung) und
+        zum Schluss 'final' mit dem Ergebnis wie bei send_command unter 'result'.
+        """
+        if not all([self.token, self.active_world_id, self.active_player_id]):
+            yield {"event": "error", "detail": "[Fehler: Kein aktives Spiel ausgewählt.]"}
+            return
+
+        headers = {"Authorization": f"Bearer {self.token}", "Accept": "text/event-stream"}
+        payload = {"command": command, "world_id": self.active_world_id, "player_id": self.active_player_id}
+        try:
+            async with self.client.stream("POST", "/command/stream", json=payload, headers=headers) as response:
+                response.raise_for_status()
+                event_name, data_lines = "message", []
+                async for line in response.aiter_lines():
+                    if line.startswith("event:"):
+                        event_name = line[len("event:"):].strip()
+                    elif line.startswith("data:"):
+                        data_lines.append(line[len("data:"):].strip())
+                    elif not line and data_lines:
+                        # Leerzeile schließt ein Ereignis ab
+                        event = json.loads("\n".join(data_lines))
+                        event.setdefault("event", event_name)
+                        yield event
+                        event_name, data_lines = "message", []
+        except (httpx.RequestError, httpx.HTTPStatusError) as e:
+            yield {"event": "error", "detail": f"[Server-Fehler: {e}]"}
+
     async def load_game_summary(self) -> Optional[str]:
         """Lädt die anfängliche Spielzusammenfassung vom Server."""
         if not all([self.token, self.active_world_id, self.active_player_id]):
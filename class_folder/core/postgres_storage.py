@@ -0,0 +1,1116 @@
+# class_folder/core/postgres_storage.py
+# -*- coding: utf-8 -*-
+
+"""
+PostgreSQL-Implementierung von StorageBackend (siehe storage_backend).
+Mehrere Backend-Instanzen teilen sich eine Datenbank; jede Instanz hält einen
+Verbindungspool (psycopg_pool). JSON-Daten liegen in JSONB-Spalten und werden
+direkt in SQL geändert (`||`, `jsonb_set`), Zähler wie XP und die Welt-Statistik
+atomar per UPDATE bzw. INSERT ... ON CONFLICT, damit gleichzeitige Schreiber
+verschiedener Instanzen sich nicht gegenseitig überschreiben.
+
+Die Rückgabewerte entsprechen dem DatabaseManager: JSON-Spalten, die SQLite als
+Text liefert, heißen auch hier `*_json` und sind Text; Zeitstempel sind Text im
+Format 'YYYY-MM-DD HH:MM:SS' (UTC). Archivdateien gibt es nicht, `include_archive`
+wird ignoriert. Die Volltextsuche nutzt eine tsvector-Spalte mit GIN-Index
+(Konfiguration 'simple', ohne Akzent-Normalisierung).
+
+Benötigt `psycopg` (Version 3) und `psycopg-pool`.
+"""
+
+import json
+import logging
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, Any, Dict, Iterator, List, Tuple
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+    from psycopg.types.json import Jsonb
+    from psycopg_pool import ConnectionPool
+    PSYCOPG_AVAILABLE = True
+except ImportError:
+    PSYCOPG_AVAILABLE = False
+
+from .storage_backend import StorageBackend, DEFAULT_PAGE_SIZE, Page
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_LOCK_ID = 7_204_511   # Advisory-Lock: nur eine Instanz legt gleichzeitig das Schema an
+SEARCH_CONFIG = "simple"
+
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        username TEXT NOT NULL UNIQUE,
+        hashed_password TEXT NOT NULL,
+        roles JSONB NOT NULL DEFAULT '[]',
+        is_active BOOLEAN NOT NULL DEFAULT TRUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS worlds (
+        world_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        lore_prompt TEXT NOT NULL,
+        created_at TIMESTAMP(0) NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+        template_key TEXT DEFAULT 'system_fantasy'
+    )
+    """,
+    # user_id ohne Fremdschlüssel: NSCs gehören dem System-Benutzer 1, der nicht existieren muss
+    """
+    CREATE TABLE IF NOT EXISTS characters (
+        char_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        world_id BIGINT NOT NULL REFERENCES worlds (world_id),
+        user_id BIGINT NOT NULL,
+        name TEXT NOT NULL,
+        is_player BOOLEAN NOT NULL DEFAULT FALSE,
+        backstory TEXT,
+        current_location_id BIGINT,
+        state JSONB NOT NULL DEFAULT '{}',
+        inventory JSONB NOT NULL DEFAULT '[]',
+        attributes JSONB NOT NULL DEFAULT '{}',
+        level INTEGER NOT NULL DEFAULT 1,
+        xp INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS locations (
+        location_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        world_id BIGINT NOT NULL REFERENCES worlds (world_id),
+        name TEXT NOT NULL,
+        description TEXT,
+        rules JSONB NOT NULL DEFAULT '{}',
+        connections JSONB NOT NULL DEFAULT '{}',
+        UNIQUE (world_id, name)
+    )
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS events (
+        event_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        world_id BIGINT NOT NULL REFERENCES worlds (world_id),
+        char_id BIGINT,
+        player_input TEXT,
+        ai_output TEXT,
+        "timestamp" TIMESTAMP(0) NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+        quality_label TEXT NOT NULL DEFAULT 'neutral',
+        involved_npcs JSONB NOT NULL DEFAULT '[]',
+        extracted_commands JSONB NOT NULL DEFAULT '[]',
+        search_vector TSVECTOR GENERATED ALWAYS AS (
+            to_tsvector('{SEARCH_CONFIG}', COALESCE(player_input, '') || ' ' || COALESCE(ai_output, ''))
+        ) STORED
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS summary_cache (
+        world_id BIGINT NOT NULL REFERENCES worlds (world_id),
+        adapter_version TEXT NOT NULL,
+        last_event_id BIGINT NOT NULL,
+        summary_text TEXT NOT NULL,
+        created_at TIMESTAMP(0) NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+        PRIMARY KEY (world_id, adapter_version)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS world_stats (
+        world_id BIGINT PRIMARY KEY REFERENCES worlds (world_id) ON DELETE CASCADE,
+        total_events BIGINT NOT NULL DEFAULT 0,
+        player_actions BIGINT NOT NULL DEFAULT 0,
+        level_ups INTEGER NOT NULL DEFAULT 0,
+        first_event TIMESTAMP(0),
+        last_event TIMESTAMP(0),
+        character_level INTEGER NOT NULL DEFAULT 1,
+        character_xp INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS prompt_rules (
+        rule_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        world_id BIGINT,
+        template_name TEXT,
+        rule_type TEXT NOT NULL DEFAULT 'RULE',
+        content TEXT NOT NULL,
+        order_index INTEGER NOT NULL DEFAULT 0,
+        is_active BOOLEAN NOT NULL DEFAULT TRUE
+    )
+    """,
+    # Dieselben Zugriffspfade wie die SQLite-Migrationen
+    "CREATE INDEX IF NOT EXISTS idx_characters_world_player_location "
+    "ON characters (world_id, is_player, current_location_id)",
+    "CREATE INDEX IF NOT EXISTS idx_events_world_event ON events (world_id, event_id)",
+    "CREATE INDEX IF NOT EXISTS idx_events_world_char_event ON events (world_id, char_id, event_id)",
+    "CREATE INDEX IF NOT EXISTS idx_events_quality_world_event ON events (quality_label, world_id, event_id)",
+    "CREATE INDEX IF NOT EXISTS idx_events_quality_event ON events (quality_label, event_id)",
+    "CREATE INDEX IF NOT EXISTS idx_events_search ON events USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS idx_prompt_rules_world ON prompt_rules (world_id, order_index)",
+    "CREATE INDEX IF NOT EXISTS idx_prompt_rules_template ON prompt_rules (template_name, order_index)",
+]
+
+# JSON-Spalten, die der DatabaseManager als Text liefert
+EVENT_COLUMNS = ('event_id, world_id, char_id, player_input, ai_output, "timestamp", quality_label, '
+                 'involved_npcs::text AS involved_npcs_json, extracted_commands::text AS extracted_commands_json')
+
+
+def character_columns(alias: str = "", decoded: bool = True) -> str:
+    """Spalten einer Charakter-Zeile; `decoded` liefert state/inventory/attributes statt der *_json-Texte."""
+    p = f"{alias}." if alias else ""
+    columns = [f"{p}char_id", f"{p}world_id", f"{p}user_id", f"{p}name", f"{p}is_player", f"{p}backstory",
+               f"{p}current_location_id"]
+    for name in ("state", "inventory", "attributes"):
+        columns.append(f"{p}{name}" if decoded else f"{p}{name}::text AS {name}_json")
+    return ", ".join(columns + [f"{p}level", f"{p}xp"])
+
+
+def _plain(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Zeitstempel als Text wie bei SQLite (CURRENT_TIMESTAMP)."""
+    if row is None:
+        return None
+    return {key: value.isoformat(sep=" ") if isinstance(value, datetime) else value for key, value in row.items()}
+
+
+class PostgresStorage(StorageBackend):
+    """Spieldatenbank in PostgreSQL mit einem Verbindungspool pro Instanz."""
+
+    backend_name = "postgres"
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10, timeout: float = 30.0):
+        if not PSYCOPG_AVAILABLE:
+            raise ImportError("psycopg und psycopg-pool sind für STORAGE_BACKEND=postgres erforderlich "
+                              "(pip install 'psycopg[binary]' psycopg-pool).")
+        self.dsn = dsn
+        self._pool = ConnectionPool(dsn, min_size=min_size, max_size=max_size, timeout=timeout,
+                                    kwargs={"row_factory": dict_row}, open=True, name="laststrawberry")
+        self._local = threading.local()  # Verbindung der laufenden Arbeitseinheit pro Thread
+        logger.info(f"PostgresStorage initialisiert (Pool {min_size}-{max_size} Verbindungen).")
+
+    # --- Verbindungen und Transaktionen ---
+
+    @contextmanager
+    def _connection(self) -> Iterator["psycopg.Connection"]:
+        """
+        Verbindung für einen Methodenaufruf. Außerhalb einer Arbeitseinheit aus dem Pool
+        (Commit beim Verlassen, Rollback bei einer Ausnahme); innerhalb der Einheit deren
+        Verbindung mit einem Savepoint, damit die Verbindung nach einem Fehler benutzbar bleibt.
+        Ein Fehler innerhalb der Einheit wird vermerkt: auch wenn die Methode ihn abfängt,
+        rollt `unit_of_work` am Ende den ganzen Block zurück und reicht ihn weiter.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                with conn.transaction():
+                    yield conn
+            except psycopg.Error as e:
+                self._local.failure = e
+                raise
+            return
+        with self._pool.connection() as conn:
+            yield conn
+
+    @contextmanager
+    def unit_of_work(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        with self._pool.connection() as conn:
+            with conn.transaction():
+                self._local.conn, self._local.failure = conn, None
+                try:
+                    yield conn
+                    if self._local.failure is not None:
+                        # Eine Methode ist fehlgeschlagen: kein halber Zug, alles zurückrollen
+                        raise self._local.failure
+                finally:
+                    self._local.conn, self._local.failure = None, None
+
+    def close_connection(self):
+        self._pool.close()
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend_name, **self._pool.get_stats()}
+
+    def setup_database(self):
+        try:
+            with self._connection() as conn:
+                conn.execute("SELECT pg_advisory_xact_lock(%s)", (SCHEMA_LOCK_ID,))
+                for statement in SCHEMA_STATEMENTS:
+                    conn.execute(statement)
+        except psycopg.Error as e:
+            logger.error(f"Error setting up database schema: {e}", exc_info=True)
+            raise
+
+    # --- Benutzer ---
+
+    @staticmethod
+    def _decode_user(row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        user_data = dict(row)
+        user_data['roles'] = user_data.get('roles') or []
+        return user_data
+
+    def create_user(self, username: str, hashed_password: str, roles: List[str]) -> Optional[int]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "INSERT INTO users (username, hashed_password, roles) VALUES (%s, %s, %s) RETURNING user_id",
+                    (username, hashed_password, Jsonb(roles))
+                ).fetchone()
+            return row['user_id']
+        except psycopg.errors.UniqueViolation:
+            logger.error(f"Benutzername '{username}' existiert bereits.")
+            return None
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Erstellen des Benutzers: {e}", exc_info=True)
+            return None
+
+    def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT * FROM users WHERE username = %s", (username,)).fetchone()
+            return self._decode_user(row)
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Abrufen des Benutzers '{username}': {e}")
+            return None
+
+    def get_user_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT * FROM users WHERE user_id = %s", (user_id,)).fetchone()
+            return self._decode_user(row)
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Abrufen von Benutzer-ID {user_id}: {e}")
+            return None
+
+    def get_all_users(self) -> List[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                rows = conn.execute("SELECT user_id, username, roles, is_active FROM users ORDER BY user_id").fetchall()
+            return [self._decode_user(row) for row in rows]
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Abrufen aller Benutzer: {e}")
+            return []
+
+    def _update_user(self, user_id: int, column: str, value: Any) -> bool:
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute(f"UPDATE users SET {column} = %s WHERE user_id = %s", (value, user_id))
+            return cursor.rowcount > 0
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Aktualisieren von '{column}' für UserID {user_id}: {e}")
+            return False
+
+    def update_user_password(self, user_id: int, new_hashed_password: str) -> bool:
+        return self._update_user(user_id, "hashed_password", new_hashed_password)
+
+    def update_user_roles(self, user_id: int, roles: List[str]) -> bool:
+        return self._update_user(user_id, "roles", Jsonb(roles))
+
+    def update_user_status(self, user_id: int, is_active: bool) -> bool:
+        return self._update_user(user_id, "is_active", bool(is_active))
+
+    # --- Welten ---
+
+    def create_world_and_player(self, world_name: str, lore: str, template_key: str, user_id: int,
+                                char_name: str, backstory: str, char_attributes: Dict[str, Any],
+                                initial_location_name: str, initial_location_desc: str,
+                                initial_state_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                world_id = conn.execute(
+                    "INSERT INTO worlds (name, lore_prompt, template_key) VALUES (%s, %s, %s) RETURNING world_id",
+                    (world_name, lore, template_key)
+                ).fetchone()['world_id']
+                loc_id = conn.execute(
+                    "INSERT INTO locations (world_id, name, description) VALUES (%s, %s, %s) RETURNING location_id",
+                    (world_id, initial_location_name, initial_location_desc)
+                ).fetchone()['location_id']
+                char_id = conn.execute(
+                    """INSERT INTO characters
+                       (world_id, user_id, name, is_player, backstory, current_location_id, state, inventory, attributes)
+                       VALUES (%s, %s, %s, TRUE, %s, %s, %s, '[]', %s) RETURNING char_id""",
+                    (world_id, user_id, char_name, backstory, loc_id, Jsonb(initial_state_dict), Jsonb(char_attributes))
+                ).fetchone()['char_id']
+            return {"world_id": world_id, "player_id": char_id, "location_id": loc_id}
+        except psycopg.Error as e:
+            logger.error(f"Error creating world and player: {e}", exc_info=True)
+            return None
+
+    def get_world_info(self, world_id: int) -> Dict[str, Any]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT world_id, name AS world_name, lore_prompt AS lore, created_at, 1 AS is_active "
+                    "FROM worlds WHERE world_id = %s", (world_id,)
+                ).fetchone()
+            return _plain(row) or {}
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Laden der Welt-Info für {world_id}: {e}")
+            return {}
+
+    def get_world_lore(self, world_id: int) -> Optional[str]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT lore_prompt FROM worlds WHERE world_id = %s", (world_id,)).fetchone()
+            return row['lore_prompt'] if row else None
+        except psycopg.Error as e:
+            logger.error(f"DB error fetching lore for world {world_id}: {e}")
+            return None
+
+    def get_world_by_name(self, world_name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT * FROM worlds WHERE name = %s", (world_name,)).fetchone()
+            return _plain(row)
+        except psycopg.Error as e:
+            logger.error(f"DB error fetching world by name '{world_name}': {e}")
+            return None
+
+    def get_or_create_world(self, world_name: str) -> Optional[int]:
+        placeholder_lore = (f"This world ('{world_name}') was created automatically by the Tower process. "
+                            "Lore is managed on the client.")
+        try:
+            with self._connection() as conn:
+                # ON CONFLICT: legt eine andere Instanz die Welt gleichzeitig an, gewinnt deren Zeile
+                row = conn.execute(
+                    "INSERT INTO worlds (name, lore_prompt) VALUES (%s, %s) ON CONFLICT (name) DO NOTHING "
+                    "RETURNING world_id", (world_name, placeholder_lore)
+                ).fetchone()
+                if row is None:
+                    row = conn.execute("SELECT world_id FROM worlds WHERE name = %s", (world_name,)).fetchone()
+                else:
+                    logger.info(f"World '{world_name}' created with ID: {row['world_id']}.")
+            return row['world_id']
+        except psycopg.Error as e:
+            logger.error(f"Error creating world '{world_name}': {e}", exc_info=True)
+            return None
+
+    def _worlds_and_players(self, player_alias: str, user_id: Optional[int]) -> List[Dict[str, Any]]:
+        query = f"""
+            SELECT w.world_id, w.name AS world_name, c.char_id AS player_id, c.name AS {player_alias},
+                   u.username AS owner_name, w.created_at
+            FROM worlds w
+            JOIN characters c ON w.world_id = c.world_id
+            JOIN users u ON c.user_id = u.user_id
+            WHERE c.is_player {'AND u.user_id = %s' if user_id is not None else ''}
+            ORDER BY w.created_at DESC, w.world_id DESC
+        """
+        with self._connection() as conn:
+            rows = conn.execute(query, (user_id,) if user_id is not None else ()).fetchall()
+        return [_plain(row) for row in rows]
+
+    def get_all_worlds_and_players(self) -> List[Dict[str, Any]]:
+        try:
+            return self._worlds_and_players("character_name", None)
+        except psycopg.Error as e:
+            logger.error(f"DB error fetching worlds and players: {e}")
+            return []
+
+    def get_all_worlds_and_players_for_user(self, user_id: int) -> List[Dict[str, Any]]:
+        try:
+            return self._worlds_and_players("player_name", user_id)
+        except psycopg.Error as e:
+            logger.error(f"DB error fetching worlds and players for user {user_id}: {e}")
+            return []
+
+    def get_player_info_for_world(self, world_id: int) -> Dict[str, Any]:
+        attributes = ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma", "perception")
+        try:
+            with self._connection() as conn:
+                row = conn.execute(f"""
+                    SELECT char_id, name AS character_name, backstory, level, xp,
+                           {", ".join(f"attributes -> '{name}' AS {name}" for name in attributes)}
+                    FROM characters WHERE world_id = %s ORDER BY char_id LIMIT 1
+                """, (world_id,)).fetchone()
+            return self._format_player_info(row) if row else {}
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Laden der Spieler-Info für Welt {world_id}: {e}")
+            return {}
+
+    def get_world_statistics(self, world_id: int) -> Dict[str, Any]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT * FROM world_stats WHERE world_id = %s", (world_id,)).fetchone()
+            return self._format_world_statistics(_plain(row) or {})
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Laden der Statistiken für Welt {world_id}: {e}")
+            return {}
+
+    def rebuild_world_stats(self, world_id: Optional[int] = None) -> int:
+        world_filter = "WHERE w.world_id = %s" if world_id is not None else ""
+        event_filter = "WHERE world_id = %s" if world_id is not None else ""
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute(f"""
+                    INSERT INTO world_stats (world_id, total_events, player_actions, level_ups,
+                                             first_event, last_event, character_level, character_xp)
+                    SELECT w.world_id, COALESCE(e.total_events, 0), COALESCE(e.player_actions, 0),
+                           GREATEST(COALESCE(c.level, 1) - 1, 0), e.first_event, e.last_event,
+                           COALESCE(c.level, 1), COALESCE(c.xp, 0)
+                    FROM worlds w
+                    LEFT JOIN (
+                        SELECT world_id, COUNT(*) AS total_events,
+                               COUNT(*) FILTER (WHERE COALESCE(player_input, '') <> '') AS player_actions,
+                               MIN("timestamp") AS first_event, MAX("timestamp") AS last_event
+                        FROM events {event_filter} GROUP BY world_id
+                    ) e ON e.world_id = w.world_id
+                    LEFT JOIN LATERAL (SELECT level, xp FROM characters
+                                       WHERE world_id = w.world_id AND is_player ORDER BY char_id LIMIT 1) c ON TRUE
+                    {world_filter}
+                    ON CONFLICT (world_id) DO UPDATE SET
+                        total_events = excluded.total_events, player_actions = excluded.player_actions,
+                        level_ups = excluded.level_ups, first_event = excluded.first_event,
+                        last_event = excluded.last_event, character_level = excluded.character_level,
+                        character_xp = excluded.character_xp
+                """, (world_id, world_id) if world_id is not None else ())
+            logger.info(f"Welt-Statistiken neu berechnet ({cursor.rowcount} Welten).")
+            return cursor.rowcount
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Neuberechnen der Welt-Statistiken: {e}", exc_info=True)
+            return 0
+
+    @staticmethod
+    def _sync_character_in_world_stats(conn: "psycopg.Connection", char_id: int):
+        """Übernimmt Level und XP des Spielercharakters; ein höheres Level zählt als Level-Up."""
+        conn.execute("""
+            INSERT INTO world_stats (world_id, character_level, character_xp)
+            SELECT world_id, level, xp FROM characters WHERE char_id = %s AND is_player
+            ON CONFLICT (world_id) DO UPDATE SET
+                level_ups = world_stats.level_ups + GREATEST(excluded.character_level - world_stats.character_level, 0),
+                character_level = excluded.character_level,
+                character_xp = excluded.character_xp
+        """, (char_id,))
+
+    # --- Charaktere und NSCs ---
+
+    def is_user_authorized_for_player(self, user_id: int, char_id: int) -> bool:
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT user_id FROM characters WHERE char_id = %s", (char_id,)).fetchone()
+            return row is not None and row['user_id'] == user_id
+        except psycopg.Error as e:
+            logger.error(f"DB error during authorization check for user {user_id} and char {char_id}: {e}")
+            return False
+
+    def is_user_authorized_for_world(self, user_id: int, world_id: int) -> bool:
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT 1 FROM characters WHERE world_id = %s AND user_id = %s AND is_player LIMIT 1",
+                    (world_id, user_id)
+                ).fetchone()
+            return row is not None
+        except psycopg.Error as e:
+            logger.error(f"DB error during authorization check for user {user_id} and world {world_id}: {e}")
+            return False
+
+    def get_full_character_info(self, char_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                return conn.execute(f"SELECT {character_columns()} FROM characters WHERE char_id = %s",
+                                    (char_id,)).fetchone()
+        except psycopg.Error:
+            return None
+
+    def load_scene_snapshot(self, world_id: int, char_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute(f"""
+                    SELECT {character_columns('c')}, w.name AS scene_world_name,
+                           w.template_key AS scene_template_key,
+                           l.location_id AS scene_location_id, l.world_id AS scene_location_world_id,
+                           l.name AS scene_location_name, l.description AS scene_location_description,
+                           l.rules AS scene_location_rules, l.connections AS scene_location_connections
+                    FROM characters c
+                    JOIN worlds w ON w.world_id = %s
+                    LEFT JOIN locations l ON l.location_id = c.current_location_id
+                    WHERE c.char_id = %s
+                """, (world_id, char_id)).fetchone()
+                if not row:
+                    return None
+                character_info = dict(row)
+                world_name = character_info.pop('scene_world_name')
+                template_key = character_info.pop('scene_template_key') or 'system_fantasy'
+                location = {key[len('scene_location_'):]: character_info.pop(key)
+                            for key in list(character_info) if key.startswith('scene_location_')}
+                location_info, scene_npcs = {}, []
+                if location['id'] is not None:
+                    location_info = {
+                        'location_id': location['id'], 'world_id': location['world_id'],
+                        'name': location['name'], 'description': location['description'],
+                        'rules': location['rules'] or {}, 'connections': location['connections'] or {},
+                    }
+                    scene_npcs = conn.execute(
+                        f"SELECT {character_columns()} FROM characters "
+                        "WHERE world_id = %s AND current_location_id = %s AND NOT is_player ORDER BY char_id",
+                        (world_id, location['id'])
+                    ).fetchall()
+            return {
+                'world_id': world_id,
+                'world_name': world_name,
+                'template_key': template_key,
+                'character_info': character_info,
+                'location_info': location_info,
+                'scene_npcs': scene_npcs,
+            }
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Laden der Szene für Welt {world_id}, Charakter {char_id}: {e}", exc_info=True)
+            return None
+
+    def get_player_location(self, world_id: int) -> Optional[int]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT current_location_id FROM characters WHERE world_id = %s AND is_player ORDER BY char_id LIMIT 1",
+                    (world_id,)
+                ).fetchone()
+            return row['current_location_id'] if row else None
+        except psycopg.Error:
+            return None
+
+    def get_npcs_at_location(self, world_id: int, location_id: int) -> List[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                return conn.execute(
+                    f"SELECT {character_columns(decoded=False)} FROM characters "
+                    "WHERE world_id = %s AND current_location_id = %s AND NOT is_player ORDER BY char_id",
+                    (world_id, location_id)
+                ).fetchall()
+        except psycopg.Error as e:
+            logger.error(f"Error fetching NPCs at location {location_id}: {e}")
+            return []
+
+    def find_npc_by_name(self, world_id: int, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                return conn.execute(
+                    f"SELECT {character_columns()} FROM characters "
+                    "WHERE world_id = %s AND name = %s AND NOT is_player ORDER BY char_id LIMIT 1",
+                    (world_id, name)
+                ).fetchone()
+        except psycopg.Error as e:
+            logger.error(f"Fehler bei der Suche nach NSC '{name}': {e}", exc_info=True)
+            return None
+
+    def create_npc(self, world_id: int, name: str, backstory: str, initial_state_dict: Dict[str, Any]) -> Optional[int]:
+        system_user_id = 1
+        try:
+            with self._connection() as conn:
+                npc_id = conn.execute("""
+                    INSERT INTO characters (world_id, user_id, name, is_player, backstory, current_location_id, state)
+                    VALUES (%s, %s, %s, FALSE, %s,
+                            (SELECT current_location_id FROM characters
+                             WHERE world_id = %s AND is_player ORDER BY char_id LIMIT 1), %s)
+                    RETURNING char_id
+                """, (world_id, system_user_id, name, backstory, world_id, Jsonb(initial_state_dict))).fetchone()['char_id']
+            logger.info(f"NSC '{name}' (ID: {npc_id}) wurde in Welt {world_id} erstellt und User {system_user_id} zugeordnet.")
+            return npc_id
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Erstellen von NSC '{name}': {e}", exc_info=True)
+            return None
+
+    def update_npc_state(self, npc_id: int, updates_dict: Dict[str, Any]):
+        notes_to_add = updates_dict.pop("notes_add", None)
+        try:
+            with self._connection() as conn:
+                if notes_to_add:
+                    # Schlüssel setzen und die Notiz nur anhängen, wenn sie noch fehlt (eine Anweisung)
+                    cursor = conn.execute("""
+                        UPDATE characters SET state = CASE
+                            WHEN EXISTS (SELECT 1 FROM jsonb_array_elements(COALESCE(s.new_state -> 'notes', '[]'))
+                                         AS note WHERE note = %(note)s) THEN s.new_state
+                            ELSE jsonb_set(s.new_state, '{notes}',
+                                           COALESCE(s.new_state -> 'notes', '[]') || jsonb_build_array(%(note)s))
+                            END
+                        FROM (SELECT char_id, state || %(updates)s AS new_state FROM characters WHERE char_id = %(id)s) AS s
+                        WHERE characters.char_id = s.char_id
+                    """, {"note": Jsonb(notes_to_add), "updates": Jsonb(updates_dict), "id": npc_id})
+                else:
+                    cursor = conn.execute("UPDATE characters SET state = state || %s WHERE char_id = %s",
+                                          (Jsonb(updates_dict), npc_id))
+            if cursor.rowcount == 0:
+                logger.warning(f"Konnte NSC mit ID {npc_id} für Update nicht finden.")
+                return
+            logger.info(f"Zustand für NSC ID {npc_id} erfolgreich aktualisiert.")
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Aktualisieren von NSC ID {npc_id}: {e}", exc_info=True)
+
+    def update_npc_name(self, npc_id: int, new_name: str) -> bool:
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute("UPDATE characters SET name = %s WHERE char_id = %s", (new_name, npc_id))
+            if cursor.rowcount == 0:
+                logger.warning(f"Konnte NSC mit ID {npc_id} zum Umbenennen nicht finden.")
+                return False
+            logger.info(f"NSC ID {npc_id} wurde erfolgreich in '{new_name}' umbenannt.")
+            return True
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Umbenennen von NSC ID {npc_id}: {e}", exc_info=True)
+            return False
+
+    def update_character_state(self, char_id: int, state_updates: Dict[str, Any]):
+        try:
+            with self._connection() as conn:
+                # || ersetzt die obersten Schlüssel (wie dict.update)
+                conn.execute("UPDATE characters SET state = state || %s WHERE char_id = %s",
+                             (Jsonb(state_updates), char_id))
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Aktualisieren des Zustands von Charakter {char_id}: {e}")
+
+    def update_character_inventory(self, char_id: int, action: str, item_name: str):
+        try:
+            with self._connection() as conn:
+                if action.upper() == 'ADD':
+                    conn.execute("UPDATE characters SET inventory = inventory || jsonb_build_array(%s::text) "
+                                 "WHERE char_id = %s", (item_name, char_id))
+                elif action.upper() == 'REMOVE':
+                    # Entfernt das erste Vorkommen; ohne Treffer bleibt die Zeile unverändert
+                    conn.execute("""
+                        UPDATE characters SET inventory = inventory - (
+                            SELECT (position - 1)::int FROM jsonb_array_elements(inventory) WITH ORDINALITY
+                                AS item(value, position)
+                            WHERE item.value = to_jsonb(%(item)s::text) ORDER BY position LIMIT 1)
+                        WHERE char_id = %(id)s AND inventory @> jsonb_build_array(%(item)s::text)
+                    """, {"item": item_name, "id": char_id})
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Aktualisieren des Inventars von Charakter {char_id}: {e}")
+
+    def update_character_location(self, char_id: int, new_location_id: int):
+        try:
+            with self._connection() as conn:
+                conn.execute("UPDATE characters SET current_location_id = %s WHERE char_id = %s",
+                             (new_location_id, char_id))
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Ändern des Orts von Charakter {char_id}: {e}")
+
+    def update_character_attributes(self, char_id: int, new_attributes: Dict[str, int]) -> bool:
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute("UPDATE characters SET attributes = %s WHERE char_id = %s",
+                                      (Jsonb(new_attributes), char_id))
+            return cursor.rowcount > 0
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Aktualisieren der Attribute für Charakter {char_id}: {e}")
+            return False
+
+    def add_xp_to_character(self, char_id: int, xp_to_add: int) -> int:
+        try:
+            with self._connection() as conn:
+                # Atomar: gleichzeitige XP-Gutschriften verschiedener Instanzen gehen nicht verloren
+                row = conn.execute("UPDATE characters SET xp = xp + %s WHERE char_id = %s RETURNING xp",
+                                   (xp_to_add, char_id)).fetchone()
+                if not row:
+                    return 0
+                self._sync_character_in_world_stats(conn, char_id)
+            logger.info(f"Charakter {char_id} erhält {xp_to_add} XP. Gesamt-XP: {row['xp']}")
+            return row['xp']
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Hinzufügen von XP für Charakter {char_id}: {e}")
+            return 0
+
+    def update_character_level_and_xp(self, char_id: int, new_level: int, new_xp: int) -> bool:
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute("UPDATE characters SET level = %s, xp = %s WHERE char_id = %s",
+                                      (new_level, new_xp, char_id))
+                self._sync_character_in_world_stats(conn, char_id)
+            return cursor.rowcount > 0
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Aktualisieren von Level und XP für Charakter {char_id}: {e}")
+            return False
+
+    # --- Orte ---
+
+    def create_location(self, world_id: int, name: str, description: str) -> Optional[int]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "INSERT INTO locations (world_id, name, description) VALUES (%s, %s, %s) RETURNING location_id",
+                    (world_id, name, description)
+                ).fetchone()
+            return row['location_id']
+        except psycopg.Error:
+            return None
+
+    def get_location_info(self, location_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                return conn.execute(
+                    "SELECT location_id, world_id, name, description, rules, connections "
+                    "FROM locations WHERE location_id = %s", (location_id,)
+                ).fetchone()
+        except psycopg.Error:
+            return None
+
+    def get_location_by_name(self, world_id: int, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                return conn.execute(
+                    "SELECT location_id, world_id, name, description, rules::text AS rules_json, "
+                    "connections::text AS connections_json FROM locations WHERE world_id = %s AND name = %s",
+                    (world_id, name)
+                ).fetchone()
+        except psycopg.Error:
+            return None
+
+    # --- Prompt-Regeln und Vorlagen ---
+
+    def get_rules_for_world(self, world_id: int) -> List[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                return conn.execute(
+                    "SELECT content FROM prompt_rules WHERE world_id = %s AND is_active ORDER BY order_index ASC",
+                    (world_id,)
+                ).fetchall()
+        except psycopg.Error as e:
+            logger.error(f"Error fetching rules for world {world_id}: {e}")
+            return []
+
+    def get_full_rules_for_world(self, world_id: int) -> List[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                return conn.execute(
+                    "SELECT rule_id, content, order_index, is_active, rule_type FROM prompt_rules "
+                    "WHERE world_id = %s ORDER BY order_index ASC", (world_id,)
+                ).fetchall()
+        except psycopg.Error as e:
+            logger.error(f"Error fetching full rules for world {world_id}: {e}")
+            return []
+
+    def update_world_rules(self, world_id: int, rules: List[Dict[str, Any]]) -> bool:
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM prompt_rules WHERE world_id = %s", (world_id,))
+                with conn.cursor() as cursor:
+                    cursor.executemany(
+                        "INSERT INTO prompt_rules (world_id, rule_type, content, order_index, is_active) "
+                        "VALUES (%s, %s, %s, %s, %s)",
+                        [(world_id, rule.get('rule_type', 'RULE'), rule['content'], rule['order_index'],
+                          bool(rule.get('is_active', True))) for rule in rules]
+                    )
+            logger.info(f"Successfully updated rules for world_id {world_id}.")
+            return True
+        except psycopg.Error as e:
+            logger.error(f"Error updating world rules for world_id {world_id}: {e}", exc_info=True)
+            return False
+
+    def get_rules_for_template(self, template_name: str) -> List[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                return conn.execute(
+                    "SELECT content, order_index, is_active, rule_type FROM prompt_rules "
+                    "WHERE template_name = %s ORDER BY order_index ASC", (template_name,)
+                ).fetchall()
+        except psycopg.Error as e:
+            logger.error(f"Error fetching rules for template {template_name}: {e}")
+            return []
+
+    def get_all_template_names(self) -> List[str]:
+        try:
+            with self._connection() as conn:
+                rows = conn.execute("SELECT DISTINCT template_name FROM prompt_rules "
+                                    "WHERE template_name IS NOT NULL ORDER BY template_name").fetchall()
+            return [row['template_name'] for row in rows]
+        except psycopg.Error as e:
+            logger.error(f"Error fetching template names: {e}")
+            return []
+
+    def save_world_rules_as_template(self, world_id: int, new_template_name: str) -> bool:
+        sanitized_name = re.sub(r'\s+', '_', new_template_name.strip())
+        sanitized_name = re.sub(r'[^\w-]', '', sanitized_name)
+        full_template_name = f"user_{sanitized_name.lower()}"
+        try:
+            with self._connection() as conn:
+                if conn.execute("SELECT 1 FROM prompt_rules WHERE template_name = %s LIMIT 1",
+                                (full_template_name,)).fetchone():
+                    logger.warning(f"A template named '{full_template_name}' already exists. Aborting.")
+                    return False
+                cursor = conn.execute("""
+                    INSERT INTO prompt_rules (world_id, template_name, rule_type, content, order_index)
+                    SELECT NULL, %s, rule_type, content, order_index FROM prompt_rules
+                    WHERE world_id = %s AND is_active
+                """, (full_template_name, world_id))
+                if cursor.rowcount == 0:
+                    logger.warning(f"No rules found for world_id {world_id} to save as template.")
+                    return False
+            logger.info(f"Saved rules from world {world_id} as new template '{full_template_name}'")
+            return True
+        except psycopg.Error as e:
+            logger.error(f"Error saving rules as template: {e}", exc_info=True)
+            return False
+
+    # --- Events ---
+
+    def save_event(self, world_id: int, char_id: int, player_input: str, ai_output: str,
+                   involved_npc_ids: List[int], extracted_commands: List[Dict[str, Any]]):
+        try:
+            with self._connection() as conn:
+                event_id = conn.execute(
+                    "INSERT INTO events (world_id, char_id, player_input, ai_output, involved_npcs, extracted_commands) "
+                    "VALUES (%s, %s, %s, %s, %s, %s) RETURNING event_id",
+                    (world_id, char_id, player_input, ai_output, Jsonb(involved_npc_ids), Jsonb(extracted_commands))
+                ).fetchone()['event_id']
+                conn.execute("""
+                    INSERT INTO world_stats (world_id, total_events, player_actions, first_event, last_event,
+                                             character_level, character_xp)
+                    SELECT e.world_id, 1, (COALESCE(e.player_input, '') <> '')::int, e."timestamp", e."timestamp",
+                           COALESCE(c.level, 1), COALESCE(c.xp, 0)
+                    FROM events e
+                    LEFT JOIN LATERAL (SELECT level, xp FROM characters
+                                       WHERE world_id = e.world_id AND is_player ORDER BY char_id LIMIT 1) c ON TRUE
+                    WHERE e.event_id = %s
+                    ON CONFLICT (world_id) DO UPDATE SET
+                        total_events = world_stats.total_events + 1,
+                        player_actions = world_stats.player_actions + excluded.player_actions,
+                        first_event = COALESCE(world_stats.first_event, excluded.first_event),
+                        last_event = excluded.last_event
+                """, (event_id,))
+                # Ein neues Event macht die zwischengespeicherte Zusammenfassung der Welt ungültig
+                conn.execute("DELETE FROM summary_cache WHERE world_id = %s", (world_id,))
+        except psycopg.Error as e:
+            logger.error(f"Error saving event to database: {e}", exc_info=True)
+
+    def get_last_events(self, world_id: int, limit: int = 3) -> List[Tuple[str, str]]:
+        try:
+            with self._connection() as conn:
+                rows = conn.execute(
+                    "SELECT player_input, ai_output FROM events WHERE world_id = %s ORDER BY event_id DESC LIMIT %s",
+                    (world_id, limit)
+                ).fetchall()
+            return [(row['player_input'], row['ai_output']) for row in reversed(rows)]
+        except psycopg.Error:
+            return []
+
+    def get_last_event_id(self, world_id: int) -> Optional[int]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT MAX(event_id) AS event_id FROM events WHERE world_id = %s",
+                                   (world_id,)).fetchone()
+            return row['event_id']
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Holen der letzten Event-ID für Welt {world_id}: {e}")
+            return None
+
+    def get_last_event_details(self, world_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                return conn.execute(
+                    "SELECT event_id, ai_output, extracted_commands::text AS extracted_commands_json "
+                    "FROM events WHERE world_id = %s ORDER BY event_id DESC LIMIT 1", (world_id,)
+                ).fetchone()
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Holen des letzten Events für Welt {world_id}: {e}")
+            return None
+
+    def get_last_event_with_npcs(self, world_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT player_input, ai_output, involved_npcs FROM events "
+                    "WHERE world_id = %s ORDER BY event_id DESC LIMIT 1", (world_id,)
+                ).fetchone()
+                if not row:
+                    return None
+                npc_ids = row.pop('involved_npcs') or []
+                row['involved_npcs_json'] = json.dumps(npc_ids)
+                row['involved_npcs'] = conn.execute(
+                    "SELECT char_id, name, backstory FROM characters WHERE char_id = ANY(%s) ORDER BY char_id",
+                    (npc_ids,)
+                ).fetchall() if npc_ids else []
+            return row
+        except psycopg.Error as e:
+            logger.error(f"Error fetching last event with NPCs: {e}")
+            return None
+
+    def get_last_event_for_world_player(self, world_id: int, player_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    'SELECT event_id, ai_output, extracted_commands::text AS extracted_commands_json, player_input, '
+                    '"timestamp" FROM events WHERE world_id = %s AND char_id = %s ORDER BY event_id DESC LIMIT 1',
+                    (world_id, player_id)
+                ).fetchone()
+            return _plain(row)
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Holen des letzten Events für Welt {world_id}, Spieler {player_id}: {e}")
+            return None
+
+    def get_events_for_review_page(self, label: str = 'neutral', world_id: Optional[int] = None,
+                                   after_event_id: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                                   include_archive: bool = False) -> Page:
+        query = f"SELECT {EVENT_COLUMNS} FROM events WHERE quality_label = %s "
+        params: List[Any] = [label]
+        if world_id is not None:
+            query += "AND world_id = %s "
+            params.append(world_id)
+        query += "AND event_id > %s ORDER BY event_id ASC LIMIT %s"
+        try:
+            with self._connection() as conn:
+                rows = conn.execute(query, (*params, after_event_id, limit + 1)).fetchall()
+            return self._split_page([_plain(row) for row in rows], limit)
+        except psycopg.Error as e:
+            logger.error(f"DB error fetching events for review with label '{label}': {e}")
+            return [], None
+
+    def get_story_events_page(self, world_id: int, after_event_id: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                              include_archive: bool = False) -> Page:
+        try:
+            with self._connection() as conn:
+                rows = conn.execute("""
+                    SELECT event_id, world_id, char_id AS player_id, 'STORY' AS event_type,
+                           COALESCE(player_input, '') AS content, "timestamp", '{}'::jsonb AS metadata
+                    FROM events
+                    WHERE world_id = %s AND event_id > %s
+                    ORDER BY event_id ASC
+                    LIMIT %s
+                """, (world_id, after_event_id, limit + 1)).fetchall()
+            return self._split_page([_plain(row) for row in rows], limit)
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Laden der Story-Events für Welt {world_id}: {e}")
+            return [], None
+
+    def get_event_texts_page(self, world_id: int, after_event_id: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        try:
+            with self._connection() as conn:
+                rows = conn.execute(
+                    "SELECT event_id, player_input, ai_output FROM events "
+                    "WHERE world_id = %s AND event_id > %s ORDER BY event_id ASC LIMIT %s",
+                    (world_id, after_event_id, limit + 1)
+                ).fetchall()
+            return self._split_page(rows, limit)
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Laden der Event-Texte für Welt {world_id}: {e}")
+            return [], None
+
+    def count_story_events(self, world_id: int, include_archive: bool = False) -> int:
+        try:
+            with self._connection() as conn:
+                row = conn.execute("SELECT COUNT(*) AS count FROM events WHERE world_id = %s", (world_id,)).fetchone()
+            return row['count']
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Zählen der Story-Events für Welt {world_id}: {e}")
+            return 0
+
+    @staticmethod
+    def _invalidate_summary_for_event(conn: "psycopg.Connection", event_id: int):
+        conn.execute("DELETE FROM summary_cache WHERE world_id = (SELECT world_id FROM events WHERE event_id = %s)",
+                     (event_id,))
+
+    def update_event_quality(self, event_id: int, new_label: str) -> bool:
+        try:
+            with self._connection() as conn:
+                conn.execute("UPDATE events SET quality_label = %s WHERE event_id = %s", (new_label, event_id))
+            logger.info(f"Updated quality label for event_id {event_id} to '{new_label}'.")
+            return True
+        except psycopg.Error as e:
+            logger.error(f"DB error updating quality for event_id {event_id}: {e}")
+            return False
+
+    def update_event_text_and_quality(self, event_id: int, corrected_text: str,
+                                      new_label: str = "human_corrected") -> bool:
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute("UPDATE events SET ai_output = %s, quality_label = %s WHERE event_id = %s",
+                                      (corrected_text, new_label, event_id))
+                self._invalidate_summary_for_event(conn, event_id)
+            if cursor.rowcount == 0:
+                logger.warning(f"Konnte Event mit ID {event_id} für Korrektur nicht finden.")
+                return False
+            logger.info(f"Event {event_id} erfolgreich mit neuem Text und Label '{new_label}' aktualisiert.")
+            return True
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Aktualisieren von Event {event_id}: {e}", exc_info=True)
+            return False
+
+    def update_event_correction(self, event_id: int = None, corrected_text: str = None,
+                                corrected_commands: List[Dict[str, Any]] = None,
+                                corrected_ai_output: str = None, corrected_commands_json: str = None) -> bool:
+        # Unterstützt beide API-Versionen (Frontend: Text + JSON-Text, alt: Text + Befehlsliste)
+        if corrected_ai_output is not None and corrected_commands_json is not None:
+            ai_output, commands_json = corrected_ai_output, corrected_commands_json
+        elif corrected_text is not None and corrected_commands is not None:
+            ai_output, commands_json = corrected_text, json.dumps(corrected_commands, ensure_ascii=False)
+        else:
+            logger.error("Ungültige Parameter für update_event_correction")
+            return False
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute(
+                    "UPDATE events SET ai_output = %s, extracted_commands = %s::jsonb, quality_label = 'human_corrected' "
+                    "WHERE event_id = %s", (ai_output, commands_json, event_id)
+                )
+                self._invalidate_summary_for_event(conn, event_id)
+            if cursor.rowcount == 0:
+                logger.warning(f"Konnte Event mit ID {event_id} für Korrektur nicht finden.")
+                return False
+            logger.info(f"Event {event_id} erfolgreich mit korrigierten Daten aktualisiert.")
+            return True
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Aktualisieren von Event {event_id}: {e}", exc_info=True)
+            return False
+
+    def search_events(self, world_id: int, query: str, limit: int = 20,
+                      match_all: bool = True, include_archive: bool = False) -> List[Dict[str, Any]]:
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return []
+        # Präfixsuche wie bei FTS5 ("wort"*); \w+ enthält keine tsquery-Operatoren
+        ts_query = (" & " if match_all else " | ").join(f"{term}:*" for term in terms)
+        try:
+            with self._connection() as conn:
+                rows = conn.execute(f"""
+                    SELECT event_id, world_id, char_id, "timestamp", quality_label, player_input, ai_output,
+                           ts_headline('{SEARCH_CONFIG}', COALESCE(player_input, '') || ' ' || COALESCE(ai_output, ''), q,
+                                       'StartSel=[, StopSel=], MaxWords=16, MinWords=5, FragmentDelimiter=…, MaxFragments=1')
+                               AS snippet,
+                           -ts_rank(search_vector, q) AS score
+                    FROM events, to_tsquery('{SEARCH_CONFIG}', %s) AS q
+                    WHERE world_id = %s AND search_vector @@ q
+                    ORDER BY score, event_id DESC
+                    LIMIT %s
+                """, (ts_query, world_id, limit)).fetchall()
+            return [_plain(row) for row in rows]
+        except psycopg.Error as e:
+            logger.error(f"Fehler bei der Event-Suche in Welt {world_id} nach '{query}': {e}")
+            return []
+
+    # --- Zusammenfassungs-Cache ---
+
+    def get_cached_summary(self, world_id: int, last_event_id: int, adapter_version: str) -> Optional[str]:
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT summary_text FROM summary_cache "
+                    "WHERE world_id = %s AND adapter_version = %s AND last_event_id = %s",
+                    (world_id, adapter_version, last_event_id)
+                ).fetchone()
+            return row['summary_text'] if row else None
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Lesen des Zusammenfassungs-Caches für Welt {world_id}: {e}")
+            return None
+
+    def save_cached_summary(self, world_id: int, last_event_id: int, adapter_version: str, summary_text: str) -> bool:
+        try:
+            with self._connection() as conn:
+                conn.execute("""
+                    INSERT INTO summary_cache (world_id, adapter_version, last_event_id, summary_text)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (world_id, adapter_version) DO UPDATE SET
+                        last_event_id = excluded.last_event_id, summary_text = excluded.summary_text,
+                        created_at = excluded.created_at
+                """, (world_id, adapter_version, last_event_id, summary_text))
+            return True
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Speichern der Zusammenfassung für Welt {world_id}: {e}", exc_info=True)
+            return False
+
+    def invalidate_summary_cache(self, world_id: int):
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM summary_cache WHERE world_id = %s", (world_id,))
+        except psycopg.Error as e:
+            logger.error(f"Fehler beim Leeren des Zusammenfassungs-Caches für Welt {world_id}: {e}")
@@ -0,0 +1,378 @@
+# class_folder/core/query_metrics.py
+# -*- coding: utf-8 -*-
+
+"""
+Messung jeder SQL-Anweisung des DatabaseManagers.
+Verbindungen werden mit `InstrumentedConnection` geöffnet; deren Cursor messen
+jede Anweisung von `execute` bis zur letzten gelesenen Zeile (SQLite rechnet
+beim Lesen weiter) und ordnen sie der aufrufenden öffentlichen Methode des
+DatabaseManagers zu (über den Aufruf-Stack, die Methoden bleiben unverändert).
+
+Pro Methode entstehen ein Latenz-Histogramm, Zeilen- und Fehlerzahlen sowie die
+Wartezeit auf die Schreibsperre. Diese wird getrennt messbar, indem eine
+Schreibanweisung außerhalb einer Transaktion mit `BEGIN IMMEDIATE` statt mit dem
+impliziten `BEGIN` des sqlite3-Moduls beginnt; gesperrt wird dabei dasselbe
+(eine aufgeschobene Transaktion holt die Sperre bei der ersten Schreibanweisung).
+Anweisungen über `slow_query_ms` landen mit ihrem `EXPLAIN QUERY PLAN` im Log
+und in einer Liste der letzten langsamen Abfragen. Parameter werden nie
+protokolliert (sie enthalten Spielertexte und Passwort-Hashes).
+"""
+
+import bisect
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from typing import Optional, Any, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 200.0
+# Obergrenzen der Histogramm-Klassen in Sekunden (wie bei Prometheus üblich)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+RECENT_SLOW_QUERIES = 50
+MAX_CACHED_PLANS = 256
+MAX_STACK_DEPTH = 12
+METRICS_PREFIX = "laststrawberry_db"
+
+_WRITE_STATEMENT = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+_LOCK_STATEMENT = re.compile(r"^\s*BEGIN\s+(IMMEDIATE|EXCLUSIVE)\b", re.IGNORECASE)
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+
+class _MethodMetrics:
+    """Kennzahlen aller Anweisungen einer Methode."""
+
+    def __init__(self):
+        self.statements = 0
+        self.errors = 0
+        self.rows = 0
+        self.slow = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.lock_waits = 0
+        self.lock_wait_seconds = 0.0
+        self.max_lock_wait_seconds = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def record(self, seconds: float, rows: int, lock_wait: float, failed: bool, slow: bool):
+        self.statements += 1
+        self.errors += int(failed)
+        self.rows += rows
+        self.slow += int(slow)
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if lock_wait > 0:
+            self.lock_waits += 1
+            self.lock_wait_seconds += lock_wait
+            self.max_lock_wait_seconds = max(self.max_lock_wait_seconds, lock_wait)
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        if index < len(LATENCY_BUCKETS):
+            self.buckets[index] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative, buckets = 0, {}
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            cumulative += count
+            buckets[f"{bound * 1000:g}ms"] = cumulative
+        return {
+            "statements": self.statements,
+            "errors": self.errors,
+            "rows": self.rows,
+            "slow": self.slow,
+            "avg_ms": round(self.total_seconds / self.statements * 1000, 3) if self.statements else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "lock_waits": self.lock_waits,
+            "lock_wait_ms": round(self.lock_wait_seconds * 1000, 3),
+            "max_lock_wait_ms": round(self.max_lock_wait_seconds * 1000, 3),
+            "buckets": buckets,
+        }
+
+
+class QueryMetrics:
+    """Sammelt die Messwerte aller Verbindungen eines DatabaseManagers (thread-sicher)."""
+
+    def __init__(self, slow_query_ms: Optional[float] = DEFAULT_SLOW_QUERY_MS,
+                 owner_files: Iterable[str] = (), explain_slow_queries: bool = True):
+        """
+        Args:
+            slow_query_ms: Schwelle für das Slow-Query-Log; None schaltet es ab.
+            owner_files: Quelldateien, deren öffentliche Funktionen als Methode gezählt werden.
+            explain_slow_queries: Für langsame Abfragen den Plan ermitteln und protokollieren.
+        """
+        self.slow_query_ms = slow_query_ms
+        self.owner_files = frozenset(owner_files)
+        self.explain_slow_queries = explain_slow_queries
+        self._methods: Dict[str, _MethodMetrics] = {}
+        self._slow_queries: deque = deque(maxlen=RECENT_SLOW_QUERIES)
+        self._plans: Dict[str, List[str]] = {}
+        self._owner_codes: Dict[Any, bool] = {}  # Code-Objekt -> zählt als Methode
+        self._lock = threading.Lock()
+
+    def calling_method(self) -> str:
+        """Name der innersten öffentlichen Funktion aus `owner_files` auf dem Aufruf-Stack."""
+        frame = sys._getframe(2)
+        fallback = None
+        owner_codes = self._owner_codes
+        for _ in range(MAX_STACK_DEPTH):
+            if frame is None:
+                break
+            code = frame.f_code
+            is_owner = owner_codes.get(code)
+            if is_owner is None:
+                is_owner = owner_codes[code] = (code.co_filename in self.owner_files
+                                                and not code.co_name.startswith(("_", "<")))
+            if is_owner:
+                return code.co_name
+            if code.co_filename != __file__:
+                fallback = fallback or code.co_name
+            frame = frame.f_back
+        return fallback or "unbekannt"
+
+    def record(self, conn: sqlite3.Connection, method: str, sql: str, parameters: Any, seconds: float,
+               rows: int, lock_wait: float = 0.0, failed: bool = False):
+        if _LOCK_STATEMENT.match(sql):
+            lock_wait += seconds  # BEGIN IMMEDIATE wartet ausschließlich auf die Sperre
+        slow = self.slow_query_ms is not None and (seconds + lock_wait) * 1000 >= self.slow_query_ms
+        with self._lock:
+            self._methods.setdefault(method, _MethodMetrics()).record(seconds, rows, lock_wait, failed, slow)
+        if slow:
+            self._log_slow_query(conn, method, sql, parameters, seconds, rows, lock_wait)
+
+    def _explain(self, conn: sqlite3.Connection, sql: str, parameters: Any) -> List[str]:
+        if not self.explain_slow_queries or parameters is None or not _EXPLAINABLE.match(sql):
+            return []
+        with self._lock:
+            plan = self._plans.get(sql)
+        if plan is not None:
+            return plan
+        try:
+            # Direkt über sqlite3.Connection, damit der Plan nicht selbst gemessen wird
+            rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        except sqlite3.Error as e:
+            return [f"(kein Plan: {e})"]
+        depths, plan = {0: 0}, []
+        for node_id, parent, _, detail in (tuple(row) for row in rows):
+            depths[node_id] = depths.get(parent, 0) + 1
+            plan.append("  " * (depths[node_id] - 1) + detail)
+        with self._lock:
+            if len(self._plans) < MAX_CACHED_PLANS:
+                self._plans[sql] = plan
+        return plan
+
+    def _log_slow_query(self, conn: sqlite3.Connection, method: str, sql: str, parameters: Any,
+                        seconds: float, rows: int, lock_wait: float):
+        statement = " ".join(sql.split())
+        plan = self._explain(conn, sql, parameters)
+        entry = {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "method": method,
+            "ms": round(seconds * 1000, 3),
+            "lock_wait_ms": round(lock_wait * 1000, 3),
+            "rows": rows,
+            "sql": statement,
+            "plan": plan,
+        }
+        with self._lock:
+            self._slow_queries.append(entry)
+        plan_text = "".join(f"\n    {line}" for line in plan)
+        logger.warning(f"Langsame Abfrage in {method}: {entry['ms']} ms, Sperre {entry['lock_wait_ms']} ms, "
+                       f"{rows} Zeilen\n  SQL: {statement}" + (f"\n  Plan:{plan_text}" if plan else ""))
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self._slow_queries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Aggregierte Werte pro Methode (nach Gesamtzeit sortiert) und die letzten langsamen Abfragen."""
+        with self._lock:
+            methods = sorted(self._methods.items(), key=lambda item: item[1].total_seconds, reverse=True)
+            return {
+                "slow_query_ms": self.slow_query_ms,
+                "methods": {name: metrics.to_dict() for name, metrics in methods},
+                "slow_queries": list(self._slow_queries),
+            }
+
+    def to_prometheus(self) -> str:
+        """Textformat für Prometheus (`/metrics`)."""
+        with self._lock:
+            methods = [(name, metrics.to_dict(), list(metrics.buckets), metrics.total_seconds,
+                        metrics.lock_wait_seconds) for name, metrics in sorted(self._methods.items())]
+        lines = [
+            f"# HELP {METRICS_PREFIX}_statement_duration_seconds Dauer der SQL-Anweisungen je DatabaseManager-Methode.",
+            f"# TYPE {METRICS_PREFIX}_statement_duration_seconds histogram",
+        ]
+        for name, stats, buckets, total_seconds, _ in methods:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, buckets):
+                cumulative += count
+                lines.append(f'{METRICS_PREFIX}_statement_duration_seconds_bucket{{method="{name}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{METRICS_PREFIX}_statement_duration_seconds_bucket{{method="{name}",le="+Inf"}} {stats["statements"]}')
+            lines.append(f'{METRICS_PREFIX}_statement_duration_seconds_sum{{method="{name}"}} {total_seconds:.6f}')
+            lines.append(f'{METRICS_PREFIX}_statement_duration_seconds_count{{method="{name}"}} {stats["statements"]}')
+        counters = (
+            ("rows_total", "Gelesene bzw. geänderte Zeilen.", lambda s, lock: s["rows"]),
+            ("errors_total", "Fehlgeschlagene Anweisungen.", lambda s, lock: s["errors"]),
+            ("slow_statements_total", "Anweisungen über der Slow-Query-Schwelle.", lambda s, lock: s["slow"]),
+            ("lock_waits_total", "Anweisungen, die auf die Schreibsperre gewartet haben.", lambda s, lock: s["lock_waits"]),
+            ("lock_wait_seconds_total", "Wartezeit auf die Schreibsperre.", lambda s, lock: f"{lock:.6f}"),
+        )
+        for suffix, help_text, value in counters:
+            lines.append(f"# HELP {METRICS_PREFIX}_{suffix} {help_text}")
+            lines.append(f"# TYPE {METRICS_PREFIX}_{suffix} counter")
+            for name, stats, _, _, lock_wait_seconds in methods:
+                lines.append(f'{METRICS_PREFIX}_{suffix}{{method="{name}"}} {value(stats, lock_wait_seconds)}')
+        return "\n".join(lines) + "\n"
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor, der jede Anweisung bis zur letzten gelesenen Zeile misst."""
+
+    _statement: Optional[List[Any]] = None  # [Methode, SQL, Parameter, Sekunden, Zeilen, Sperrzeit]
+
+    def _metrics(self) -> Optional[QueryMetrics]:
+        return getattr(self.connection, "metrics", None)
+
+    def _begin(self, sql: str) -> float:
+        """Holt für eine Schreibanweisung außerhalb einer Transaktion die Sperre und gibt die Wartezeit zurück."""
+        conn = self.connection
+        if conn.in_transaction or conn.isolation_level is None or not _WRITE_STATEMENT.match(sql):
+            return 0.0
+        started_at = time.perf_counter()
+        sqlite3.Connection.execute(conn, "BEGIN IMMEDIATE")
+        return time.perf_counter() - started_at
+
+    def _run(self, call, sql: str, parameters: Any, many: bool = False):
+        self._finish()
+        metrics = self._metrics()
+        if metrics is None:
+            return call()
+        method = metrics.calling_method()
+        lock_wait = 0.0
+        started_at = time.perf_counter()
+        try:
+            lock_wait = self._begin(sql)
+            started_at = time.perf_counter()
+            call()
+        except sqlite3.Error:
+            metrics.record(self.connection, method, sql, None, time.perf_counter() - started_at, 0,
+                           lock_wait, failed=True)
+            raise
+        self._statement = [method, sql, None if many else parameters, time.perf_counter() - started_at, 0, lock_wait]
+        if self.description is None:
+            # Keine Ergebniszeilen: die Anweisung ist vollständig ausgeführt
+            self._statement[4] = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def _fetched(self, started_at: float, rows: int, done: bool):
+        statement = self._statement
+        if statement is not None:
+            statement[3] += time.perf_counter() - started_at
+            statement[4] += rows
+            if done:
+                self._finish()
+
+    def _finish(self):
+        statement, self._statement = self._statement, None
+        metrics = self._metrics() if statement is not None else None
+        if metrics is not None:
+            method, sql, parameters, seconds, rows, lock_wait = statement
+            metrics.record(self.connection, method, sql, parameters, seconds, rows, lock_wait)
+
+    def execute(self, sql: str, parameters: Any = ()):
+        return self._run(lambda: super(InstrumentedCursor, self).execute(sql, parameters), sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any]):
+        return self._run(lambda: super(InstrumentedCursor, self).executemany(sql, seq_of_parameters),
+                         sql, None, many=True)
+
+    def executescript(self, sql_script: str):
+        return self._run(lambda: super(InstrumentedCursor, self).executescript(sql_script), sql_script, None,
+                         many=True)
+
+    def fetchone(self):
+        started_at = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started_at, int(row is not None), row is None)
+        return row
+
+    def fetchmany(self, size: Optional[int] = None):
+        size = self.arraysize if size is None else size
+        started_at = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(started_at, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started_at = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started_at, len(rows), True)
+        return rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started_at = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(started_at, 0, True)
+            raise
+        self._fetched(started_at, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Nur teilweise gelesene Cursor (z.B. `.fetchone()` auf eine Zeile) melden sich beim Aufräumen
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """SQLite-Verbindung, deren Anweisungen in `metrics` gezählt werden (None: ungemessen)."""
+
+    metrics: Optional[QueryMetrics] = None
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = ()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any]):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script: str):
+        return self.cursor().executescript(sql_script)
+
+
+def render_pool_stats(pool_stats: Dict[str, Any]) -> str:
+    """Gauges des Datenbank-Thread-Pools (AsyncDatabaseManager.get_stats) im Prometheus-Textformat."""
+    lines: List[str] = []
+    gauges: Tuple[Tuple[str, str], ...] = (
+        ("workers", "Worker-Threads des Datenbank-Pools."),
+        ("queued", "Wartende Aufrufe im Datenbank-Pool."),
+        ("running", "Laufende Aufrufe im Datenbank-Pool."),
+        ("max_queued", "Höchste Zahl wartender Aufrufe seit dem Start."),
+    )
+    for key, help_text in gauges:
+        lines.append(f"# HELP {METRICS_PREFIX}_pool_{key} {help_text}")
+        lines.append(f"# TYPE {METRICS_PREFIX}_pool_{key} gauge")
+        lines.append(f"{METRICS_PREFIX}_pool_{key} {pool_stats.get(key, 0)}")
+    lines.append(f"# HELP {METRICS_PREFIX}_pool_queue_ms_avg Mittlere Wartezeit eines Aufrufs im Pool je Methode.")
+    lines.append(f"# TYPE {METRICS_PREFIX}_pool_queue_ms_avg gauge")
+    for name, stats in sorted(pool_stats.get("methods", {}).items()):
+        lines.append(f'{METRICS_PREFIX}_pool_queue_ms_avg{{method="{name}"}} {stats["avg_queue_ms"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,390 @@
+# class_folder/core/storage_backend.py
+# -*- coding: utf-8 -*-
+
+"""
+Austauschbare Speicherschicht des Spiels.
+`StorageBackend` beschreibt die öffentlichen Methoden, die Spiellogik, Backend
+und Werkzeuge vom Datenbank-Manager verwenden. Es gibt zwei Implementierungen:
+  - DatabaseManager (SQLite, eine Datei, ein Schreiber; Standard)
+  - PostgresStorage (PostgreSQL mit Verbindungspool und JSONB-Spalten; für
+    mehrere Backend-Instanzen auf einer gemeinsamen Datenbank)
+Welche verwendet wird, entscheidet `create_storage` anhand von STORAGE_BACKEND.
+
+Die Rückgabewerte sind bei beiden gleich aufgebaut (gleiche Schlüssel, JSON-Felder
+wie bei SQLite als Text bzw. dekodiert); geprüft wird das mit
+test_suite_storage_contract.py. Wartungsfunktionen, die nur für SQLite Sinn
+ergeben (Archivdateien, Snapshots, VACUUM, Massenimport), gehören nicht zur
+Schnittstelle.
+"""
+
+import os
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Any, Callable, Dict, Iterator, List, Tuple
+
+DEFAULT_PAGE_SIZE = 500               # Events pro Seite beim seitenweisen Lesen
+
+STORAGE_BACKENDS = ("sqlite", "postgres")
+
+Page = Tuple[List[Dict[str, Any]], Optional[int]]
+
+
+class StorageBackend(ABC):
+    """Gemeinsame Schnittstelle von SQLite- und PostgreSQL-Speicher."""
+
+    backend_name = "abstract"
+    db_path: Optional[Path] = None    # Nur bei dateibasierten Backends gesetzt
+    query_metrics = None              # QueryMetrics, falls das Backend seine Anweisungen misst
+
+    # --- Verbindungen und Transaktionen ---
+
+    @abstractmethod
+    def setup_database(self):
+        """Legt das Schema an bzw. bringt es auf den aktuellen Stand."""
+
+    @abstractmethod
+    def close_connection(self):
+        """Schließt alle Verbindungen (bzw. den Pool)."""
+
+    @abstractmethod
+    def unit_of_work(self) -> AbstractContextManager:
+        """
+        Fasst alle Schreibzugriffe des Blocks zu einer Transaktion zusammen; verschachtelte
+        Aufrufe schließen sich der äußeren Einheit an. Der Block darf kein `await` enthalten.
+        """
+
+    @abstractmethod
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Offene Verbindungen und wirksame Einstellungen (für /admin/stats)."""
+
+    # --- Benutzer ---
+
+    @abstractmethod
+    def create_user(self, username: str, hashed_password: str, roles: List[str]) -> Optional[int]: ...
+
+    @abstractmethod
+    def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_user_by_id(self, user_id: int) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_all_users(self) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def update_user_password(self, user_id: int, new_hashed_password: str) -> bool: ...
+
+    @abstractmethod
+    def update_user_roles(self, user_id: int, roles: List[str]) -> bool: ...
+
+    @abstractmethod
+    def update_user_status(self, user_id: int, is_active: bool) -> bool: ...
+
+    # --- Welten ---
+
+    @abstractmethod
+    def create_world_and_player(self, world_name: str, lore: str, template_key: str, user_id: int,
+                                char_name: str, backstory: str, char_attributes: Dict[str, Any],
+                                initial_location_name: str, initial_location_desc: str,
+                                initial_state_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_world_info(self, world_id: int) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    def get_world_lore(self, world_id: int) -> Optional[str]: ...
+
+    @abstractmethod
+    def get_world_by_name(self, world_name: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_or_create_world(self, world_name: str) -> Optional[int]: ...
+
+    @abstractmethod
+    def get_all_worlds_and_players(self) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_all_worlds_and_players_for_user(self, user_id: int) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_player_info_for_world(self, world_id: int) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    def get_world_statistics(self, world_id: int) -> Dict[str, Any]: ...
+
+    @abstractmethod
+    def rebuild_world_stats(self, world_id: Optional[int] = None) -> int: ...
+
+    # --- Charaktere und NSCs ---
+
+    @abstractmethod
+    def is_user_authorized_for_player(self, user_id: int, char_id: int) -> bool: ...
+
+    @abstractmethod
+    def is_user_authorized_for_world(self, user_id: int, world_id: int) -> bool:
+        """True, wenn der Benutzer einen Spielercharakter in der Welt besitzt."""
+
+    @abstractmethod
+    def get_full_character_info(self, char_id: int) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def load_scene_snapshot(self, world_id: int, char_id: int) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_player_location(self, world_id: int) -> Optional[int]: ...
+
+    @abstractmethod
+    def get_npcs_at_location(self, world_id: int, location_id: int) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def find_npc_by_name(self, world_id: int, name: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def create_npc(self, world_id: int, name: str, backstory: str,
+                   initial_state_dict: Dict[str, Any]) -> Optional[int]: ...
+
+    @abstractmethod
+    def update_npc_state(self, npc_id: int, updates_dict: Dict[str, Any]): ...
+
+    @abstractmethod
+    def update_npc_name(self, npc_id: int, new_name: str) -> bool: ...
+
+    @abstractmethod
+    def update_character_state(self, char_id: int, state_updates: Dict[str, Any]): ...
+
+    @abstractmethod
+    def update_character_inventory(self, char_id: int, action: str, item_name: str): ...
+
+    @abstractmethod
+    def update_character_location(self, char_id: int, new_location_id: int): ...
+
+    @abstractmethod
+    def update_character_attributes(self, char_id: int, new_attributes: Dict[str, int]) -> bool: ...
+
+    @abstractmethod
+    def add_xp_to_character(self, char_id: int, xp_to_add: int) -> int: ...
+
+    @abstractmethod
+    def update_character_level_and_xp(self, char_id: int, new_level: int, new_xp: int) -> bool: ...
+
+    # --- Orte ---
+
+    @abstractmethod
+    def create_location(self, world_id: int, name: str, description: str) -> Optional[int]: ...
+
+    @abstractmethod
+    def get_location_info(self, location_id: int) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_location_by_name(self, world_id: int, name: str) -> Optional[Dict[str, Any]]: ...
+
+    # --- Prompt-Regeln und Vorlagen ---
+
+    @abstractmethod
+    def get_rules_for_world(self, world_id: int) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_full_rules_for_world(self, world_id: int) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def update_world_rules(self, world_id: int, rules: List[Dict[str, Any]]) -> bool: ...
+
+    @abstractmethod
+    def get_rules_for_template(self, template_name: str) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_all_template_names(self) -> List[str]: ...
+
+    @abstractmethod
+    def save_world_rules_as_template(self, world_id: int, new_template_name: str) -> bool: ...
+
+    # --- Events ---
+
+    @abstractmethod
+    def save_event(self, world_id: int, char_id: int, player_input: str, ai_output: str,
+                   involved_npc_ids: List[int], extracted_commands: List[Dict[str, Any]]): ...
+
+    @abstractmethod
+    def get_last_events(self, world_id: int, limit: int = 3) -> List[Tuple[str, str]]: ...
+
+    @abstractmethod
+    def get_last_event_id(self, world_id: int) -> Optional[int]: ...
+
+    @abstractmethod
+    def get_last_event_details(self, world_id: int) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_last_event_with_npcs(self, world_id: int) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_last_event_for_world_player(self, world_id: int, player_id: int) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def get_events_for_review_page(self, label: str = 'neutral', world_id: Optional[int] = None,
+                                   after_event_id: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                                   include_archive: bool = False) -> Page:
+        """Eine Seite Events mit dem Label nach event_id; gibt (Events, next_cursor) zurück."""
+
+    @abstractmethod
+    def get_story_events_page(self, world_id: int, after_event_id: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+                              include_archive: bool = False) -> Page:
+        """Eine Seite Story-Events nach event_id; gibt (Events, next_cursor) zurück."""
+
+    @abstractmethod
+    def get_event_texts_page(self, world_id: int, after_event_id: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        """Eine Seite (event_id, player_input, ai_output) nach event_id, z.B. für Suchindizes."""
+
+    @abstractmethod
+    def count_story_events(self, world_id: int, include_archive: bool = False) -> int: ...
+
+    @abstractmethod
+    def update_event_quality(self, event_id: int, new_label: str) -> bool: ...
+
+    @abstractmethod
+    def update_event_text_and_quality(self, event_id: int, corrected_text: str,
+                                      new_label: str = "human_corrected") -> bool: ...
+
+    @abstractmethod
+    def update_event_correction(self, event_id: int = None, corrected_text: str = None,
+                                corrected_commands: List[Dict[str, Any]] = None,
+                                corrected_ai_output: str = None, corrected_commands_json: str = None) -> bool: ...
+
+    @abstractmethod
+    def search_events(self, world_id: int, query: str, limit: int = 20,
+                      match_all: bool = True, include_archive: bool = False) -> List[Dict[str, Any]]:
+        """
+        Volltextsuche in einer Welt; Ergebnisse mit `snippet` und `score` (kleiner ist besser).
+        include_archive schließt archivierte Events ein (siehe archive_world_events).
+        """
+
+    # --- Zusammenfassungs-Cache ---
+
+    @abstractmethod
+    def get_cached_summary(self, world_id: int, last_event_id: int, adapter_version: str) -> Optional[str]: ...
+
+    @abstractmethod
+    def save_cached_summary(self, world_id: int, last_event_id: int, adapter_version: str,
+                            summary_text: str) -> bool: ...
+
+    @abstractmethod
+    def invalidate_summary_cache(self, world_id: int): ...
+
+    # --- Gemeinsame Umsetzung auf Basis der Seiten-Methoden ---
+
+    def get_events_for_review(self, label: str = 'neutral', world_id: Optional[int] = None,
+                              include_archive: bool = False) -> List[Dict[str, Any]]:
+        """Alle Events mit dem Label als Liste. Für große Datenmengen `iter_events_for_review` verwenden."""
+        return list(self.iter_events_for_review(label, world_id, include_archive=include_archive))
+
+    def iter_events_for_review(self, label: str = 'neutral', world_id: Optional[int] = None,
+                               page_size: int = DEFAULT_PAGE_SIZE, after_event_id: int = 0,
+                               include_archive: bool = False) -> Iterator[Dict[str, Any]]:
+        """Liefert die Events mit dem Label seitenweise (Keyset auf event_id), ohne alle im Speicher zu halten."""
+        return self._iterate_pages(
+            lambda cursor, limit: self.get_events_for_review_page(label, world_id, cursor, limit, include_archive),
+            page_size, after_event_id
+        )
+
+    def get_story_events_for_world(self, world_id: int, include_archive: bool = False) -> List[Dict[str, Any]]:
+        """Holt alle Story-Events für eine Welt in chronologischer Reihenfolge."""
+        return list(self.iter_story_events_for_world(world_id, include_archive=include_archive))
+
+    def iter_story_events_for_world(self, world_id: int, page_size: int = DEFAULT_PAGE_SIZE,
+                                    after_event_id: int = 0, include_archive: bool = False) -> Iterator[Dict[str, Any]]:
+        """Liefert die Story-Events einer Welt seitenweise in chronologischer Reihenfolge."""
+        return self._iterate_pages(
+            lambda cursor, limit: self.get_story_events_page(world_id, cursor, limit, include_archive),
+            page_size, after_event_id
+        )
+
+    @staticmethod
+    def _format_player_info(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Baut die Spieler-Info aus einer Zeile mit Charakterspalten und einzelnen Attributwerten."""
+        return {
+            "char_id": row['char_id'],
+            "character_name": row['character_name'],
+            "backstory": row['backstory'] or "",
+            "level": row['level'] or 1,
+            "xp": row['xp'] or 0,
+            "attributes": {
+                name: row[name] or 10
+                for name in ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma", "perception")
+            }
+        }
+
+    @staticmethod
+    def _format_world_statistics(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Baut die Statistik-Antwort aus einer world_stats-Zeile (leeres dict: Welt ohne Statistik)."""
+        first_event, last_event = stats.get('first_event'), stats.get('last_event')
+        playtime_hours = 0
+        if first_event and last_event:
+            # Spielzeit grob als Abstand zwischen erstem und letztem Event
+            first = datetime.fromisoformat(str(first_event))
+            last = datetime.fromisoformat(str(last_event))
+            playtime_hours = round((last - first).total_seconds() / 3600, 1)
+
+        total_events = stats.get('total_events', 0)
+        # Jedes Event ist ein Story-Zug (vgl. get_story_events_page)
+        events_by_type = {
+            'STORY': total_events,
+            'PLAYER_ACTION': stats.get('player_actions', 0),
+            'LEVEL_UP': stats.get('level_ups', 0)
+        }
+        return {
+            "total_events": total_events,
+            "events_by_type": {key: count for key, count in events_by_type.items() if count},
+            "first_event": first_event,
+            "last_event": last_event,
+            "estimated_playtime_hours": playtime_hours,
+            "character_level": stats.get('character_level', 1),
+            "character_xp": stats.get('character_xp', 0),
+            "player_actions": events_by_type['PLAYER_ACTION'],
+            "story_events": events_by_type['STORY'],
+            "level_ups": events_by_type['LEVEL_UP']
+        }
+
+    @staticmethod
+    def _split_page(rows: List[Dict[str, Any]], limit: int) -> Page:
+        """Es wird eine Zeile mehr als nötig gelesen, um zu wissen, ob eine weitere Seite folgt."""
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1]['event_id']
+        return rows, None
+
+    @staticmethod
+    def _iterate_pages(fetch_page: Callable[[int, int], Page],
+                       page_size: int, after_event_id: int = 0) -> Iterator[Dict[str, Any]]:
+        """Holt Seite für Seite und gibt die Events einzeln weiter. Zwischen den Seiten bleibt kein Cursor offen."""
+        cursor: Optional[int] = after_event_id
+        while cursor is not None:
+            events, cursor = fetch_page(cursor, page_size)
+            yield from events
+
+
+def create_storage(backend: Optional[str] = None,
+                   sqlite_options: Optional[Dict[str, Any]] = None,
+                   postgres_options: Optional[Dict[str, Any]] = None) -> StorageBackend:
+    """
+    Erzeugt den konfigurierten Speicher. Ohne Angabe gilt die Umgebungsvariable
+    STORAGE_BACKEND ("sqlite" oder "postgres", Standard "sqlite"). Für PostgreSQL
+    werden DATABASE_URL, PG_POOL_MIN_SIZE und PG_POOL_MAX_SIZE gelesen, sofern
+    `postgres_options` sie nicht enthält.
+    """
+    backend = (backend or os.environ.get("STORAGE_BACKEND") or "sqlite").lower()
+    if backend == "sqlite":
+        from .database_manager import DatabaseManager
+        return DatabaseManager(**(sqlite_options or {}))
+    if backend in ("postgres", "postgresql"):
+        from .postgres_storage import PostgresStorage
+        options = {
+            "dsn": os.environ.get("DATABASE_URL"),
+            "min_size": int(os.environ.get("PG_POOL_MIN_SIZE", "1")),
+            "max_size": int(os.environ.get("PG_POOL_MAX_SIZE", "10")),
+            **(postgres_options or {}),
+        }
+        if not options["dsn"]:
+            raise ValueError("STORAGE_BACKEND=postgres benötigt DATABASE_URL (z.B. postgresql://user:pw@host/db).")
+        return PostgresStorage(**options)
+    raise ValueError(f"Unbekanntes STORAGE_BACKEND '{backend}' (erlaubt: {', '.join(STORAGE_BACKENDS)}).")
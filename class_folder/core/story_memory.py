@@ -0,0 +1,412 @@
+# class_folder/core/story_memory.py
+# -*- coding: utf-8 -*-
+
+"""
+Langzeitgedächtnis der Erzählung: findet zu einer Spieleraktion die passendsten
+älteren Events einer Welt, damit der Erzähler sich an Personen, Orte und
+Gegenstände von früher erinnert, ohne dass der Prompt mit der ganzen Geschichte
+wächst (die Prompt-Länge bestimmt die GPU-Zeit).
+
+Relevanz kommt ausschließlich aus vorab gepflegten Indizes:
+- Stichwortsuche mit BM25 über den Volltextindex der Events (`search_events`:
+  FTS5 bei SQLite, tsvector bei PostgreSQL). Der Index wird von der Datenbank
+  selbst bei jedem `save_event` fortgeschrieben (Trigger bzw. generierte Spalte).
+  Archivierte Events (siehe event_archive) werden über den Index ihres Archivs
+  mitgesucht.
+- Optional semantische Suche über Satz-Embeddings eines kleinen CPU-Modells
+  (sentence-transformers) in einem NumPy-Vektorindex pro Welt (exakte Suche per
+  Skalarprodukt, wie ein flacher FAISS-Index). Neue Events werden nach jedem
+  `save_event` in einem Hintergrund-Thread eingebettet und an Dateien im
+  `index_dir` angehängt; ein neu gestarteter Prozess holt fehlende Events nach.
+Beide Ranglisten werden per Reciprocal Rank Fusion zusammengeführt. In den
+Prompt kommen höchstens `top_k` Events innerhalb von `token_budget` Tokens;
+die letzten `recent_window` Events stehen ohnehin im Prompt und zählen nicht.
+Nachträglich korrigierte Texte erreicht der Vektorindex erst nach einem Neuaufbau
+(Dateien der Welt löschen). Vektortreffer auf archivierte Events entfallen, weil
+deren Text nur noch im Archiv steht; sie findet allein die Stichwortsuche.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Any, Dict, Iterable, List, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+from .storage_backend import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 3
+DEFAULT_TOKEN_BUDGET = 300
+DEFAULT_RECENT_WINDOW = 3          # so viele letzte Events baut der Prompt ohnehin ein
+DEFAULT_CANDIDATES = 20            # Kandidaten je Rangliste vor der Fusion
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+CHARS_PER_TOKEN = 4                # grobe Schätzung für deutschen Text (Llama-3-Tokenizer)
+MAX_EVENT_CHARS = 480              # längere Antworten werden für den Prompt gekürzt
+MAX_QUERY_TERMS = 12
+MIN_TERM_LENGTH = 3
+RRF_K = 60
+EMBEDDING_BATCH_SIZE = 64
+
+# Häufige deutsche Wörter ohne Aussagekraft für die Suche
+STOPWORDS = frozenset("""
+aber alle allem allen aller alles also auch auf aus bei bin bis bist damit dann das dass dem den der des
+dich die dies diese diesem diesen dieser dieses dir doch dort durch ein eine einem einen einer eines
+etwas euch euer für gegen habe haben hat hatte hier hin hinter ich ihm ihn ihr ihre ihrem ihren ihrer
+immer ist jetzt kann kein keine mal man mein meine meinem meinen meiner mich mir mit nach nicht nichts
+noch nun nur oder ohne sehr sein seine seinem seinen seiner sich sie sind soll über um und uns unter
+vom von vor war waren was weg weil weiter wenn wer werde werden wie wieder will wir wird wo zu zum zur
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def query_terms(text: str) -> List[str]:
+    """Aussagekräftige Suchwörter eines Textes (ohne Füllwörter und Zahlen, ohne Dubletten)."""
+    terms: List[str] = []
+    for term in re.findall(r"\w+", text.lower()):
+        if len(term) >= MIN_TERM_LENGTH and term not in STOPWORDS and not term.isdigit() and term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def event_text(player_input: Optional[str], ai_output: Optional[str]) -> str:
+    return f"Spieler: {player_input or ''}\nSpielleiter: {ai_output or ''}"
+
+
+def _shorten(text: str, max_chars: int) -> str:
+    text = " ".join((text or "").split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " …"
+
+
+class SentenceEmbedder:
+    """Kleines Satz-Embedding-Modell auf der CPU; liefert normalisierte float32-Vektoren."""
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, device: str = "cpu"):
+        if not (NUMPY_AVAILABLE and SENTENCE_TRANSFORMERS_AVAILABLE):
+            raise ImportError("numpy und sentence-transformers sind für STORY_MEMORY_EMBEDDINGS=1 erforderlich "
+                              "(pip install sentence-transformers).")
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name, device=device)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        logger.info(f"Embedding-Modell '{model_name}' geladen ({self.dimension} Dimensionen, {device}).")
+
+    def encode(self, texts: Sequence[str]) -> "np.ndarray":
+        vectors = self.model.encode(list(texts), batch_size=EMBEDDING_BATCH_SIZE,
+                                    normalize_embeddings=True, convert_to_numpy=True, show_progress_bar=False)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class VectorIndex:
+    """
+    Normalisierte Vektoren der Events einer Welt. Neue Zeilen werden an zwei Dateien
+    angehängt (`.vec` float32, `.ids` int64); beim Laden zählt nur, was in beiden steht.
+    """
+
+    def __init__(self, dimension: int, path: Optional[Path] = None):
+        self.dimension = dimension
+        self.path = path
+        self._vectors = np.empty((0, dimension), dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._size = 0
+        self._lock = threading.Lock()
+        if path is not None:
+            self._load()
+
+    def _files(self) -> Tuple[Path, Path]:
+        return self.path.with_suffix(".vec"), self.path.with_suffix(".ids")
+
+    def _load(self):
+        vec_file, ids_file = self._files()
+        if not (vec_file.exists() and ids_file.exists()):
+            return
+        ids = np.fromfile(ids_file, dtype=np.int64)
+        vectors = np.fromfile(vec_file, dtype=np.float32)
+        rows = min(len(ids), len(vectors) // self.dimension)
+        self._ids = ids[:rows].copy()
+        self._vectors = vectors[:rows * self.dimension].reshape(rows, self.dimension).copy()
+        self._size = rows
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_event_id(self) -> int:
+        with self._lock:
+            return int(self._ids[self._size - 1]) if self._size else 0
+
+    def add(self, event_ids: Sequence[int], vectors: "np.ndarray"):
+        ids = np.asarray(event_ids, dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dimension)
+        with self._lock:
+            needed = self._size + len(ids)
+            if needed > len(self._ids):
+                # Kapazität verdoppeln: Anhängen bleibt im Mittel O(1) pro Event
+                capacity = max(needed, 2 * len(self._ids), 64)
+                grown_vectors = np.empty((capacity, self.dimension), dtype=np.float32)
+                grown_ids = np.empty(capacity, dtype=np.int64)
+                grown_vectors[:self._size] = self._vectors[:self._size]
+                grown_ids[:self._size] = self._ids[:self._size]
+                self._vectors, self._ids = grown_vectors, grown_ids
+            self._vectors[self._size:needed] = vectors
+            self._ids[self._size:needed] = ids
+            self._size = needed
+            if self.path is not None:
+                vec_file, ids_file = self._files()
+                with vec_file.open("ab") as f:
+                    f.write(vectors.tobytes())
+                with ids_file.open("ab") as f:
+                    f.write(ids.tobytes())
+
+    def search(self, query: "np.ndarray", k: int, exclude_ids: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """Die `k` ähnlichsten Events (Kosinus-Ähnlichkeit, größer ist besser)."""
+        exclude = set(exclude_ids)
+        with self._lock:
+            if not self._size or k <= 0:
+                return []
+            scores = self._vectors[:self._size] @ np.asarray(query, dtype=np.float32)
+            ids = self._ids[:self._size]
+        count = min(k + len(exclude), len(scores))
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top])]
+        hits = [(int(ids[i]), float(scores[i])) for i in top if int(ids[i]) not in exclude]
+        return hits[:k]
+
+
+class StoryMemory:
+    """Sucht relevante ältere Events einer Welt für den Erzähl-Prompt."""
+
+    def __init__(self, db_manager: StorageBackend, top_k: int = DEFAULT_TOP_K,
+                 token_budget: int = DEFAULT_TOKEN_BUDGET, recent_window: int = DEFAULT_RECENT_WINDOW,
+                 candidates: int = DEFAULT_CANDIDATES, embedder: Optional[Any] = None,
+                 index_dir: Optional[Path] = None):
+        """
+        Args:
+            db_manager: Speicher mit `search_events` (BM25) und `get_event_texts_page`.
+            top_k: Höchstzahl der eingefügten Events (0 schaltet das Gedächtnis ab).
+            token_budget: Höchstzahl geschätzter Tokens für alle eingefügten Events zusammen.
+            recent_window: Anzahl der letzten Events, die der Prompt ohnehin enthält.
+            candidates: Kandidaten je Rangliste vor der Fusion.
+            embedder: Objekt mit `encode(texts)`, `dimension` und `model_name` (z.B. SentenceEmbedder);
+                      None nutzt nur die Stichwortsuche.
+            index_dir: Ordner für die Vektordateien; None hält den Vektorindex nur im Speicher.
+        """
+        self.db_manager = db_manager
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self.recent_window = recent_window
+        self.candidates = candidates
+        self.embedder = embedder
+        self.index_dir = Path(index_dir) if index_dir and embedder else None
+        self._indexes: Dict[int, VectorIndex] = {}
+        self._scheduled: Set[int] = set()
+        self._lock = threading.Lock()
+        # Ein Thread bettet neue Events ein; der Spielzug wartet nie darauf
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="story-memory") if embedder else None
+        self._stats = {"retrievals": 0, "injected_events": 0, "injected_tokens": 0, "keyword_hits": 0,
+                       "vector_hits": 0, "embedded_events": 0, "errors": 0, "total_seconds": 0.0}
+        if self.index_dir is not None:
+            self._prepare_index_dir()
+        logger.info(f"StoryMemory initialisiert (top_k={top_k}, Budget={token_budget} Tokens, "
+                    f"Vektorindex: {'an' if embedder else 'aus'}).")
+
+    def _prepare_index_dir(self):
+        """Verwirft vorhandene Vektordateien, wenn sie von einem anderen Modell stammen."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        meta_file = self.index_dir / "meta.json"
+        meta = {"model": getattr(self.embedder, "model_name", "unbekannt"), "dimension": self.embedder.dimension}
+        try:
+            current = json.loads(meta_file.read_text(encoding="utf-8")) if meta_file.exists() else None
+        except (OSError, json.JSONDecodeError):
+            current = None
+        if current != meta:
+            for path in list(self.index_dir.glob("world_*.vec")) + list(self.index_dir.glob("world_*.ids")):
+                path.unlink()
+            meta_file.write_text(json.dumps(meta), encoding="utf-8")
+            if current is not None:
+                logger.info(f"Vektorindex wird für Modell '{meta['model']}' neu aufgebaut.")
+
+    # --- Vektorindex ---
+
+    def _world_index(self, world_id: int) -> VectorIndex:
+        with self._lock:
+            index = self._indexes.get(world_id)
+            if index is None:
+                path = self.index_dir / f"world_{world_id}" if self.index_dir else None
+                index = self._indexes[world_id] = VectorIndex(self.embedder.dimension, path)
+            return index
+
+    def sync_world(self, world_id: int) -> int:
+        """Bettet alle Events der Welt ein, die noch nicht im Vektorindex stehen; gibt deren Anzahl zurück."""
+        if not self.embedder:
+            return 0
+        index = self._world_index(world_id)
+        added, cursor = 0, index.last_event_id
+        while cursor is not None:
+            rows, next_cursor = self.db_manager.get_event_texts_page(world_id, after_event_id=cursor,
+                                                                     limit=EMBEDDING_BATCH_SIZE)
+            if rows:
+                vectors = self.embedder.encode([event_text(row["player_input"], row["ai_output"]) for row in rows])
+                index.add([row["event_id"] for row in rows], vectors)
+                added += len(rows)
+            cursor = next_cursor
+        if added:
+            with self._lock:
+                self._stats["embedded_events"] += added
+        return added
+
+    def _schedule_sync(self, world_id: int):
+        with self._lock:
+            if world_id in self._scheduled:
+                return
+            self._scheduled.add(world_id)
+
+        def job():
+            with self._lock:
+                self._scheduled.discard(world_id)
+            try:
+                self.sync_world(world_id)
+            except Exception as e:
+                logger.error(f"Vektorindex für Welt {world_id} konnte nicht aktualisiert werden: {e}", exc_info=True)
+
+        self._executor.submit(job)
+
+    def record_event(self, world_id: int):
+        """
+        Nach `save_event` aufrufen. Der Stichwortindex pflegt die Datenbank selbst; der
+        Vektorindex holt neue Events im Hintergrund nach (auch solche anderer Prozesse).
+        """
+        if self._executor is not None:
+            self._schedule_sync(world_id)
+
+    # --- Suche ---
+
+    def _keyword_candidates(self, world_id: int, terms: List[str]) -> List[Dict[str, Any]]:
+        if not terms:
+            return []
+        # Mindestens ein Wort muss vorkommen; sortiert nach BM25 (bzw. ts_rank), auch über archivierte Events
+        return self.db_manager.search_events(world_id, " ".join(terms), limit=self.candidates,
+                                             match_all=False, include_archive=True)
+
+    def _vector_candidates(self, world_id: int, query_text: str) -> List[int]:
+        index = self._world_index(world_id)
+        self._schedule_sync(world_id)
+        if not len(index):
+            return []
+        query_vector = self.embedder.encode([query_text])[0]
+        return [event_id for event_id, _ in index.search(query_vector, self.candidates)]
+
+    def _event_by_id(self, world_id: int, event_id: int) -> Optional[Dict[str, Any]]:
+        rows, _ = self.db_manager.get_event_texts_page(world_id, after_event_id=event_id - 1, limit=1)
+        # Ein inzwischen archiviertes Event fehlt: dann liefert die Seite ein späteres
+        return rows[0] if rows and rows[0]["event_id"] == event_id else None
+
+    def retrieve(self, world_id: int, query_text: str,
+                 recent_events: Iterable[Tuple[str, str]] = ()) -> List[Dict[str, Any]]:
+        """
+        Die relevantesten älteren Events (event_id, player_input, ai_output, tokens) in
+        chronologischer Reihenfolge, höchstens `top_k` und zusammen im Token-Budget.
+        `recent_events` (Spielereingabe, Antwort) stehen bereits im Prompt und werden übersprungen.
+        """
+        if self.top_k <= 0 or self.token_budget <= 0:
+            return []
+        started_at = time.perf_counter()
+        recent = {(p or "", a or "") for p, a in recent_events}
+        terms = query_terms(query_text)
+
+        keyword_hits = self._keyword_candidates(world_id, terms)
+        events: Dict[int, Dict[str, Any]] = {hit["event_id"]: hit for hit in keyword_hits}
+        rankings = [[hit["event_id"] for hit in keyword_hits]]
+        vector_ids: List[int] = []
+        if self.embedder:
+            vector_ids = self._vector_candidates(world_id, query_text)
+            rankings.append(vector_ids)
+
+        # Reciprocal Rank Fusion: robust gegenüber unterschiedlichen Skalen von BM25 und Kosinus
+        fused: Dict[int, float] = {}
+        for ranking in rankings:
+            for rank, event_id in enumerate(ranking):
+                fused[event_id] = fused.get(event_id, 0.0) + 1.0 / (RRF_K + rank + 1)
+
+        selected, used_tokens = [], 0
+        for event_id in sorted(fused, key=lambda e: (-fused[e], -e)):
+            event = events.get(event_id) or self._event_by_id(world_id, event_id)
+            if event is None or (event["player_input"] or "", event["ai_output"] or "") in recent:
+                continue
+            player_input = _shorten(event["player_input"], MAX_EVENT_CHARS // 3)
+            ai_output = _shorten(event["ai_output"], MAX_EVENT_CHARS)
+            tokens = estimate_tokens(player_input + ai_output) + 8  # + Aufzählungszeichen und Anführungszeichen
+            if used_tokens + tokens > self.token_budget:
+                continue
+            selected.append({"event_id": event_id, "player_input": player_input, "ai_output": ai_output,
+                             "tokens": tokens})
+            used_tokens += tokens
+            if len(selected) >= self.top_k:
+                break
+
+        with self._lock:
+            self._stats["retrievals"] += 1
+            self._stats["injected_events"] += len(selected)
+            self._stats["injected_tokens"] += used_tokens
+            self._stats["keyword_hits"] += len(keyword_hits)
+            self._stats["vector_hits"] += len(vector_ids)
+            self._stats["total_seconds"] += time.perf_counter() - started_at
+        return sorted(selected, key=lambda event: event["event_id"])
+
+    def build_context(self, world_id: int, query_text: str, recent_events: Iterable[Tuple[str, str]] = ()) -> str:
+        """Prompt-Abschnitt mit den erinnerten Events, oder "" wenn nichts Passendes gefunden wurde."""
+        try:
+            memories = self.retrieve(world_id, query_text, recent_events)
+        except Exception as e:
+            # Das Gedächtnis ist eine Ergänzung; ohne es wird trotzdem erzählt
+            with self._lock:
+                self._stats["errors"] += 1
+            logger.warning(f"Langzeitgedächtnis für Welt {world_id} nicht verfügbar: {e}")
+            return ""
+        if not memories:
+            return ""
+        parts = ["**Frühere Ereignisse (Erinnerung):**"]
+        for event in memories:
+            parts.append(f"- Spieler: \"{event['player_input']}\"\n- Spielleiter: \"{event['ai_output']}\"")
+        return "\n".join(parts) + "\n\n"
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            indexed = {world_id: len(index) for world_id, index in self._indexes.items()}
+        retrievals = stats.pop("retrievals")
+        total_seconds = stats.pop("total_seconds")
+        return {
+            "top_k": self.top_k,
+            "token_budget": self.token_budget,
+            "embeddings": getattr(self.embedder, "model_name", None),
+            "retrievals": retrievals,
+            "avg_ms": round(total_seconds / retrievals * 1000, 2) if retrievals else 0.0,
+            "avg_injected_events": round(stats["injected_events"] / retrievals, 2) if retrievals else 0.0,
+            "avg_injected_tokens": round(stats["injected_tokens"] / retrievals, 1) if retrievals else 0.0,
+            **stats,
+            "indexed_events": indexed,
+        }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,105 @@
+# class_folder/core/turn_scheduler.py
+# -*- coding: utf-8 -*-
+
+"""
+Serialisiert Spielzüge pro Welt, ohne verschiedene Welten auszubremsen.
+Züge derselben Welt laufen strikt nacheinander in Ankunftsreihenfolge
+(asyncio.Lock weckt Wartende in FIFO-Reihenfolge), Züge verschiedener
+Welten laufen vollständig parallel. Pro Welt werden Warteschlangenlänge
+und Wartezeiten gezählt, um Engpässe sichtbar zu machen.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+
+class _WorldTurnState:
+    """Lock und Zähler einer einzelnen Welt."""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.queue_depth = 0          # Wartende + laufender Zug
+        self.max_queue_depth = 0
+        self.turns_completed = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.last_wait_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        avg_wait = self.total_wait_seconds / self.turns_completed if self.turns_completed else 0.0
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "turns_completed": self.turns_completed,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+            "avg_wait_seconds": round(avg_wait, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "last_wait_seconds": round(self.last_wait_seconds, 3),
+        }
+
+
+class WorldTurnScheduler:
+    """Führt Züge pro Welt geordnet aus. Nur aus dem Event-Loop verwenden."""
+
+    def __init__(self, slow_wait_warning_seconds: float = 5.0):
+        """
+        Args:
+            slow_wait_warning_seconds: Ab dieser Wartezeit wird eine Warnung geloggt.
+        """
+        self.slow_wait_warning_seconds = slow_wait_warning_seconds
+        self._worlds: Dict[int, _WorldTurnState] = {}
+
+    @asynccontextmanager
+    async def turn(self, world_id: int) -> AsyncIterator[None]:
+        """
+        Reserviert die Welt für die Dauer des `async with`-Blocks.
+
+        Beispiel:
+            async with scheduler.turn(world_id):
+                response = await game_manager.process_player_command(command)
+        """
+        state = self._worlds.get(world_id)
+        if state is None:
+            state = self._worlds[world_id] = _WorldTurnState()
+
+        state.queue_depth += 1
+        state.max_queue_depth = max(state.max_queue_depth, state.queue_depth)
+        enqueued_at = time.monotonic()
+        try:
+            await state.lock.acquire()
+        except BaseException:
+            state.queue_depth -= 1
+            raise
+
+        wait_seconds = time.monotonic() - enqueued_at
+        state.last_wait_seconds = wait_seconds
+        state.total_wait_seconds += wait_seconds
+        state.max_wait_seconds = max(state.max_wait_seconds, wait_seconds)
+        if wait_seconds >= self.slow_wait_warning_seconds:
+            logger.warning(f"Zug für Welt {world_id} wartete {wait_seconds:.2f}s in der Warteschlange "
+                           f"(aktuelle Tiefe: {state.queue_depth}).")
+        try:
+            yield
+        finally:
+            state.turns_completed += 1
+            state.queue_depth -= 1
+            state.lock.release()
+
+    def get_queue_depth(self, world_id: int) -> int:
+        """Gibt die Anzahl wartender und laufender Züge einer Welt zurück."""
+        state = self._worlds.get(world_id)
+        return state.queue_depth if state else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Liefert die Zähler aller Welten, sortiert nach aktueller Warteschlangenlänge."""
+        worlds = sorted(self._worlds.items(), key=lambda item: item[1].queue_depth, reverse=True)
+        return {
+            "active_worlds": sum(1 for _, state in worlds if state.queue_depth > 0),
+            "queued_turns": sum(state.queue_depth for _, state in worlds),
+            "worlds": {str(world_id): state.to_dict() for world_id, state in worlds},
+        }
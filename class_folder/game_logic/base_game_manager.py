@@ -6,6 +6,7 @@ Enthält die gemeinsame Basislogik für den Offline- und Online-Game-Manager,
 um Codeduplizierung zu vermeiden.
 """
 
+import asyncio
 import logging
 import re
 import json
@@ -14,6 +15,8 @@ import difflib
 from typing import Optional, Dict, Any, List
 
 from ..core.database_manager import DatabaseManager
+from ..core.storage_backend import StorageBackend
+from ..core.story_memory import StoryMemory
 from templates.regeln import CREATIVE_PROMPTS, ANALYSIS_PROMPT_TEMPLATE
 
 logger = logging.getLogger(__name__)
@@ -23,10 +26,18 @@ class BaseGameManager:
     Eine Basisklasse, die von beiden GameManager-Varianten (Online/Offline)
     genutzt wird, um geteilte Logik zu kapseln.
     """
-    def __init__(self):
-        """Initialisiert die gemeinsamen Attribute."""
-        self.db_manager = DatabaseManager()
-        self.db_manager.setup_database()
+    def __init__(self, db_manager: Optional[StorageBackend] = None, story_memory: Optional[StoryMemory] = None):
+        """
+        Initialisiert die gemeinsamen Attribute.
+        Ein bereits eingerichteter Speicher (DatabaseManager oder PostgresStorage) kann übergeben werden, damit
+        viele Instanzen (z.B. im Sitzungs-Pool des Servers) eine Verbindung teilen. Dasselbe gilt für das
+        Langzeitgedächtnis; ohne Angabe sucht es nur über den Volltextindex (BM25).
+        """
+        if db_manager is None:
+            db_manager = DatabaseManager()
+            db_manager.setup_database()
+        self.db_manager = db_manager
+        self.story_memory = story_memory if story_memory is not None else StoryMemory(db_manager)
         self.game_state: Dict[str, Any] = {}
         self.is_new_game = False
         self.scene_npcs: List[Dict[str, Any]] = []
@@ -35,30 +46,36 @@ class BaseGameManager:
     def _load_game_state(self, world_id: int, player_id: int):
         """ Lädt den Spielzustand und initialisiert das Szenen-Gedächtnis. """
         logger.info(f"Lade Spielzustand für world_id={world_id}, player_id={player_id}")
-        world_info = self.db_manager.get_world_info(world_id)
-        char_info = self.db_manager.get_full_character_info(player_id)
-        if not world_info or not char_info:
+        # Welt, Spieler, Ort und anwesende NSCs in einem Schnappschuss (zwei Abfragen)
+        snapshot = self.db_manager.load_scene_snapshot(world_id, player_id)
+        if not snapshot:
             logger.error(f"Konnte Spielzustand nicht laden. Welt- oder Charakterinfo fehlt.")
             self.game_state = {}
             return
             
         self.game_state['world_id'] = world_id
-        self.game_state['world_name'] = world_info['world_name']  # Verwendet 'world_name' statt 'name'
-        self.game_state['character_info'] = char_info
-        self.game_state['template_key'] = world_info.get('template_key', 'system_fantasy')
-        
-        loc_id = char_info.get('current_location_id')
-        self.game_state['location_info'] = self.db_manager.get_location_info(loc_id) if loc_id else {}
-
-        if loc_id:
-            npcs_at_location = self.db_manager.get_npcs_at_location(world_id, loc_id)
-            full_npc_info_list = [self.db_manager.get_full_character_info(npc['char_id']) for npc in npcs_at_location]
-            self.scene_npcs = [npc for npc in full_npc_info_list if npc]
-            logger.info(f"Szenen-Gedächtnis geladen: {len(self.scene_npcs)} NSC(s) am Ort {loc_id} gefunden.")
+        self.game_state['world_name'] = snapshot['world_name']
+        self.game_state['character_info'] = snapshot['character_info']
+        self.game_state['template_key'] = snapshot['template_key']
+        self.game_state['location_info'] = snapshot['location_info']
+        self.scene_npcs = snapshot['scene_npcs']
+
+        if snapshot['location_info']:
+            logger.info(f"Szenen-Gedächtnis geladen: {len(self.scene_npcs)} NSC(s) am Ort {snapshot['location_info']['location_id']} gefunden.")
         else:
-            self.scene_npcs = []
             logger.info("Spieler hat keinen gültigen Ort, Szenen-Gedächtnis ist leer.")
 
+    async def _run_blocking(self, label: str, func, *args):
+        """
+        Führt synchrone Datenbankarbeit außerhalb des Event-Loops aus (Online-Modus).
+        `label` benennt den Auftrag in Statistiken; der Online-Manager nutzt dafür den Thread-Pool des Servers.
+        """
+        return await asyncio.to_thread(func, *args)
+
+    async def load_game_state_async(self, world_id: int, player_id: int):
+        """Wie `_load_game_state`, blockiert aber nicht den Event-Loop."""
+        await self._run_blocking("load_game_state", self._load_game_state, world_id, player_id)
+
     def _execute_roll_check(self, roll_data: Dict[str, Any]) -> str:
         """Führt eine Würfelprobe aus und generiert die Ergebnis-Erzählung."""
         try:
@@ -134,6 +151,7 @@ class BaseGameManager:
             for p_input, ai_output in recent_events:
                 history_parts.append(f"- Spieler: \"{p_input}\"\n- Spielleiter: \"{ai_output}\"")
             history_str = "\n".join(history_parts) + "\n\n"
+        memory_str = self._build_story_memory_context(player_command, recent_events)
         
         roll_context_str = f"**Ergebnis der Aktion:** {roll_outcome}\n\n" if roll_outcome else ""
         context_str = "\n".join([
@@ -142,9 +160,15 @@ class BaseGameManager:
             f"- Ort: {loc_info.get('name', 'Unbekannter Ort')}",
             self._build_npc_context()
         ])
-        user_prompt = f"{context_str}\n\n{roll_context_str}{history_str}**Spieler-Aktion:**\n{player_command}"
+        user_prompt = f"{context_str}\n\n{roll_context_str}{memory_str}{history_str}**Spieler-Aktion:**\n{player_command}"
         return self._format_llama3_prompt(system_prompt, user_prompt)
 
+    def _build_story_memory_context(self, player_command: str, recent_events: List) -> str:
+        """Relevante ältere Ereignisse zur Aktion, passend zu Ort und anwesenden Charakteren."""
+        loc_info = self.game_state.get("location_info") or {}
+        query_parts = [player_command, loc_info.get("name", "")] + [npc["name"] for npc in self.scene_npcs]
+        return self.story_memory.build_context(self.game_state["world_id"], " ".join(query_parts), recent_events)
+
     def _build_analysis_prompt(self, player_command: str, narrative_text: str, player_name: str, npc_context: str, char_attributes: str) -> str:
         """ Baut den Prompt für die Analyse-Stufe. """
         analysis_system_prompt = ANALYSIS_PROMPT_TEMPLATE.format(
@@ -191,6 +215,8 @@ class BaseGameManager:
                 updates = cmd_data.get("updates")
                 if isinstance(updates, dict):
                     self.db_manager.update_character_state(player_id, updates)
+                    # Auch den gehaltenen Zustand aktualisieren, damit er nicht veraltet
+                    self.game_state['character_info'].setdefault('state', {}).update(updates)
 
             elif command == "NPC_STATE_UPDATE":
                 npc_name = cmd_data.get("npc_name")
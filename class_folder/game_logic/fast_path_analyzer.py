@@ -0,0 +1,348 @@
+# class_folder/game_logic/fast_path_analyzer.py
+# -*- coding: utf-8 -*-
+
+"""
+Regel- und lexikonbasierte Vorab-Analyse der Spieleraktion (Phase 1).
+Viele Eingaben ("Ich schaue mich um", "Ich gehe zum Hafen", "Ich versuche die Tür
+aufzubrechen") lassen sich ohne Sprachmodell einordnen. Der Analyzer erkennt
+`ROLL_CHECK` und `PLAYER_MOVE` nach denselben Regeln wie ANALYSIS_PROMPT_TEMPLATE
+(Schlüsselwörter "versuche", "will", "möchte", "teste"; nur Attribute aus der
+Attributliste) und liefert zu jedem Ergebnis eine Konfidenz. Nur oberhalb einer
+Schwelle ersetzt das Ergebnis den Aufruf der Analyse-KI. Verneinte Aktionen und
+Aktionen aus mehreren Teilsätzen ("Ich gehe zum Markt und stehle einen Apfel")
+bleiben unter der Schwelle und gehen an die KI. Wortstämme werden nur gegen mögliche
+Verben geprüft: großgeschriebene Wörter im Satzinneren sind Substantive ("Kämpfer",
+"Rätsel") und zählen nicht.
+Die Trefferquote gegen test_data/analysis_test_cases.py zeigt test_suite_fast_path.py.
+"""
+
+import logging
+import re
+from typing import Dict, Any, List, Optional, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Schlüsselwörter aus Regel 1 des Analyse-Prompts: explizite Versuche
+ATTEMPT_KEYWORDS = ("versuche", "versuch", "will", "möchte", "teste", "probiere")
+
+# Wortstämme, die eine Handlung mit ungewissem Ausgang anzeigen, je Attribut.
+# Die Stämme gelten nur am Wortanfang, auch nach einer Vorsilbe ("aufzubrechen", "vorbeizuschleichen").
+ROLL_LEXICON: Dict[str, Iterable[str]] = {
+    "Stärke": ("eintret", "stemm", "zerschlag", "zertrümmer", "angreif", "kämpf", "bekämpf", "überwältig"),
+    "Geschicklichkeit": ("schleich", "knack", "stehl", "stiehl", "entwend", "balancier", "ausweich", "kletter"),
+    "Konstitution": ("widersteh", "durchhalt", "aushalt", "ertrag"),
+    "Intelligenz": ("rätsel", "entziffer", "analysier", "übersetz", "berechn", "knobel"),
+    "Weisheit": ("untersuch", "spür", "durchschau", "erkenn"),
+    "Wahrnehmung": ("durchsuch", "absuch", "späh"),
+    "Charisma": ("überzeug", "überred", "belüg", "lüg", "einschüchter", "bluff", "verhandl",
+                 "feilsch", "bezirz", "betör", "beschwicht", "bestech"),
+}
+
+# Stämme mit auch alltäglicher Bedeutung ("Ich breche das Brot", "Ich schlage das Buch auf"):
+# sicher nur zusammen mit einem Versuchs-Schlüsselwort, sonst entscheidet die KI
+AMBIGUOUS_ROLL_LEXICON: Dict[str, Iterable[str]] = {
+    "Stärke": ("brech", "schlag", "reiß", "schieb"),
+    "Geschicklichkeit": ("spring", "versteck", "ziel"),
+}
+
+# Vorsilben trennbarer Verben, nach denen ein Stamm noch als Wortanfang gilt (optional mit "zu")
+VERB_PREFIXES = ("ab", "an", "auf", "aus", "durch", "ein", "empor", "fort", "heran", "herein", "heraus", "hinauf",
+                 "hinein", "hinaus", "hinüber", "hoch", "los", "nieder", "um", "vorbei", "weg", "zurück", "zu")
+
+# Verneinte Aktionen ("Ich ziele nicht", "Ich will nicht kämpfen") entscheidet immer die KI
+NEGATION_WORDS = frozenset(("nicht", "nichts", "kein", "keine", "keinen", "keinem", "keiner", "keines", "nie", "niemals"))
+
+# Teilsätze werden einzeln eingeordnet ("Ich gehe zum Markt und stehle einen Apfel")
+CLAUSE_SPLIT_PATTERN = re.compile(
+    r"[,;:]|\b(?:und|dann|danach|anschließend|dass|aber|oder|sondern|bevor|nachdem|während)\b", re.IGNORECASE
+)
+# Infinitiv-Ergänzung ohne eigene Handlung ("mir einen Rabatt zu geben")
+COMPLEMENT_PATTERN = re.compile(r"^(?:um\s+)?[^.!?]*\bzu\s+\w+\s*[.!?]?$", re.IGNORECASE)
+# Ein Teilsatz nur aus diesen Wörtern ("Ich versuche,") gehört zum folgenden
+CLAUSE_FILLER_WORDS = frozenset(("ich", "es", "mal", "jetzt", "nun", "gleich", "erst", "einfach"))
+
+# Trennbare Verben, deren Stamm allein zu allgemein ist ("Ich greife den Goblin an", "Ich trete die Tür ein"),
+# und Verb-Substantiv-Paare ("das Rätsel lösen"); geprüft gegen den ganzen Teilsatz
+ROLL_PHRASES = {
+    "Stärke": re.compile(r"\b(?:greife|greift)\b[^.!?]*\ban\s*[.!]?$|\b(?:trete|tritt)\b[^.!?]*\bein\s*[.!]?$"),
+    "Intelligenz": re.compile(r"\brätsel\w*\b[^.!?]*\blösen?\b|\blöse\b[^.!?]*\brätsel"),
+}
+
+# Beim Untersuchen und Suchen verlangt die KI nicht immer eine Probe, daher geringere Konfidenz
+
+UNCERTAIN_ROLL_ATTRIBUTES = {"Weisheit", "Wahrnehmung"}
+
+# Ersatz, falls ein Attribut nicht in der Attributliste des Charakters vorkommt
+ATTRIBUTE_FALLBACKS = {"Wahrnehmung": "Weisheit"}
+
+# Alltägliche Handlungen ohne Probe (am Wortanfang geprüft). Steht im selben Teilsatz
+# auch ein Probe-Stamm ("ich rede mit dem kletterer"), entscheidet die KI
+NO_ROLL_LEXICON = (
+    "schau", "seh", "blick", "beobacht", "atm", "genieß", "bleib", "wart", "wink", "bedank", "dank",
+    "sag", "frag", "sprech", "sprich", "red", "grüß", "nick", "lächel", "setz", "trink", "ess",
+    "kontrollier", "zeig", "betret", "tret", "geh", "lauf", "nehm", "heb", "leg", "hör", "lausch",
+    "denk", "ruh", "schlaf", "öffn", "schließ", "les",
+)
+
+LOCATION_PREPOSITIONS = r"(?:zum|zur|nach|ins|in\s+die|in\s+den|in\s+das|zu\s+den|zu\s+der|zu\s+dem)"
+MOVE_VERBS = r"(?:gehe|laufe|renne|reise|wandere|fahre|reite|eile|kehre|begebe\s+mich|mache\s+mich\s+auf\s+den\s+weg)"
+MOVE_PATTERN = re.compile(
+    rf"\b{MOVE_VERBS}\s+(?:ich\s+)?(?:(?:jetzt|nun|dann|sofort|zurück|weiter)\s+)*{LOCATION_PREPOSITIONS}\s+(?P<ort>[^.,!?;]+)",
+    re.IGNORECASE
+)
+INTENT_MOVE_PATTERN = re.compile(
+    rf"\b(?:will|möchte)\s+(?:(?:jetzt|nun|gleich|sofort)\s+)*{LOCATION_PREPOSITIONS}\s+(?P<ort>.+?)\s+"
+    r"(?:gehen|laufen|reisen|wandern|fahren|reiten|zurückkehren)\b",
+    re.IGNORECASE
+)
+# "Ich frage mich, wie es in der Mühle aussieht" ist keine Bewegung
+REFLECTION_PATTERN = re.compile(r"\b(?:frage|wundere)\s+mich\b|\bdenke\s+(?:an|über)\b", re.IGNORECASE)
+
+DEFAULT_DIFFICULTY = 12
+HARD_WORDS = ("schwer", "massiv", "stark", "verschlossen", "gut bewacht", "unmöglich")
+EASY_WORDS = ("leicht", "einfach", "morsch", "klein")
+
+# Konfidenzen der einzelnen Regeln
+CONFIDENCE_ATTEMPT_WITH_VERB = 0.95
+CONFIDENCE_MOVE = 0.9
+CONFIDENCE_NO_ROLL = 0.9
+CONFIDENCE_ROLL_VERB = 0.85
+CONFIDENCE_QUESTION = 0.85
+CONFIDENCE_INTENT_MOVE = 0.85
+CONFIDENCE_UNCERTAIN_ROLL = 0.75
+CONFIDENCE_AMBIGUOUS_ROLL = 0.65
+CONFIDENCE_ROLL_CONFLICT = 0.65
+CONFIDENCE_FALLBACK_ATTRIBUTE = 0.6
+# Obergrenze bei mehreren Teilsätzen: liegt unter jeder sinnvollen Schwelle
+CONFIDENCE_MULTI_CLAUSE = 0.4
+CONFIDENCE_ATTEMPT_WITHOUT_VERB = 0.3
+CONFIDENCE_NEGATION = 0.3
+
+# Regeln, die nur für einen einzelnen Teilsatz verlässlich sind
+SINGLE_CLAUSE_RULES = ("roll_verb", "move", "intent_move")
+
+
+class FastPathAnalyzer:
+    """
+    Klassifiziert Spieleraktionen ohne KI-Aufruf. Das Ergebnis ist ein Dict mit
+    'commands' (Liste im Format der Analyse-KI), 'confidence' (0..1) und 'rule'.
+    """
+
+    def __init__(self, threshold: float = 0.85):
+        """
+        Args:
+            threshold: Ab dieser Konfidenz wird das Ergebnis anstelle der Analyse-KI verwendet.
+        """
+        self.threshold = threshold
+        self.stats = {"analyzed": 0, "accepted": 0, "deferred_to_ai": 0}
+        self.rule_counts: Dict[str, int] = {}
+
+    def analyze(self, player_command: str, attributes: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Analysiert eine Spieleraktion und gibt Befehle samt Konfidenz zurück."""
+        text = (player_command or "").strip()
+        words = re.findall(r"[a-zäöüß]+", text.lower())
+        attribute_list = list(attributes or [])
+
+        if not words:
+            return self._result([], 0.0, "empty")
+        if NEGATION_WORDS.intersection(words):
+            return self._result([], CONFIDENCE_NEGATION, "negation")
+
+        # "Ich frage mich, wie es in der Mühle aussieht" ist keine Bewegung
+        allow_move = not REFLECTION_PATTERN.search(text)
+        clauses = self._split_clauses(text)
+        clause_results = [self._analyze_clause(clause, attribute_list, allow_move) for clause in clauses]
+        if len(clause_results) == 1:
+            return clause_results[0]
+        return self._combine_clauses(clauses, clause_results)
+
+    def _analyze_clause(self, clause: str, attribute_list: List[str], allow_move: bool) -> Dict[str, Any]:
+        """Ordnet einen einzelnen Teilsatz ein."""
+        lowered = clause.lower()
+        words = self._verb_candidates(clause)
+
+        # PLAYER_MOVE: "Ich gehe (jetzt) zur alten Mühle", "Ich will zum Hafen gehen"
+        if allow_move:
+            move_match = MOVE_PATTERN.search(clause)
+            if move_match:
+                return self._result([self._move_command(move_match.group("ort"))], CONFIDENCE_MOVE, "move")
+            intent_match = INTENT_MOVE_PATTERN.search(clause)
+            if intent_match:
+                return self._result([self._move_command(intent_match.group("ort"))], CONFIDENCE_INTENT_MOVE, "intent_move")
+
+        has_attempt_keyword = any(word in ATTEMPT_KEYWORDS for word in words)
+        action_words = [word for word in words if word not in ATTEMPT_KEYWORDS]
+        has_no_roll_verb = any(word.startswith(stem) for word in action_words for stem in NO_ROLL_LEXICON)
+        phrase_attribute = self._find_phrase_attribute(lowered)
+        attribute = phrase_attribute or self._find_stem_attribute(action_words, ROLL_LEXICON)
+        ambiguous = False
+        if attribute is None:
+            attribute = self._find_stem_attribute(action_words, AMBIGUOUS_ROLL_LEXICON)
+            ambiguous = attribute is not None
+        # Alltagsverb neben einem Probe-Stamm ("ich trinke mit dem kämpfer"): welches das Verb ist, weiß nur die KI
+        conflict = attribute is not None and phrase_attribute is None and has_no_roll_verb
+
+        # ROLL_CHECK: eine Handlung mit ungewissem Ausgang
+        if attribute:
+            resolved = self._resolve_attribute(attribute, attribute_list)
+            command = {"command": "ROLL_CHECK", "attribut": resolved or attribute,
+                       "schwierigkeit": self._estimate_difficulty(lowered)}
+            if resolved is None:
+                return self._result([command], CONFIDENCE_ATTEMPT_WITHOUT_VERB, "roll_unknown_attribute")
+            if resolved != attribute:
+                return self._result([command], CONFIDENCE_FALLBACK_ATTRIBUTE, "roll_fallback_attribute")
+            if conflict:
+                return self._result([command], CONFIDENCE_ROLL_CONFLICT, "roll_conflict")
+            if has_attempt_keyword:
+                return self._result([command], CONFIDENCE_ATTEMPT_WITH_VERB, "roll_attempt")
+            if ambiguous:
+                return self._result([command], CONFIDENCE_AMBIGUOUS_ROLL, "roll_ambiguous")
+            if attribute in UNCERTAIN_ROLL_ATTRIBUTES:
+                return self._result([command], CONFIDENCE_UNCERTAIN_ROLL, "roll_uncertain")
+            return self._result([command], CONFIDENCE_ROLL_VERB, "roll_verb")
+
+        if has_attempt_keyword:
+            # "Ich versuche ..." ohne bekannten Verbstamm: Attribut unklar, die KI entscheidet
+            return self._result([], CONFIDENCE_ATTEMPT_WITHOUT_VERB, "attempt_unknown")
+
+        # Keine Probe: Alltagshandlungen und Fragen
+        if has_no_roll_verb:
+            return self._result([], CONFIDENCE_NO_ROLL, "no_roll_lexicon")
+        if clause.endswith("?"):
+            return self._result([], CONFIDENCE_QUESTION, "question")
+
+        return self._result([], 0.0, "unknown")
+
+    def _combine_clauses(self, clauses: List[str], clause_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Führt die Ergebnisse mehrerer Teilsätze zusammen. Ein Befehl bleibt nur sicher, wenn er
+        nicht aus SINGLE_CLAUSE_RULES stammt und alle übrigen Teilsätze bloße Ergänzungen mit "zu"
+        sind ("..., mir einen Rabatt zu geben"). Sonst entscheidet die KI.
+        """
+        decided = [result for result in clause_results if result["rule"] != "unknown"]
+        if not decided:
+            return self._result([], 0.0, "unknown")
+        with_commands = [result for result in decided if result["commands"]]
+        confidence = min(result["confidence"] for result in decided)
+        if len(with_commands) > 1:
+            commands = [command for result in with_commands for command in result["commands"]]
+            return self._result(commands, min(confidence, CONFIDENCE_MULTI_CLAUSE), "multi_action")
+        if with_commands:
+            main = with_commands[0]
+            only_complements = all(COMPLEMENT_PATTERN.search(clause)
+                                   for clause, result in zip(clauses, clause_results) if result is not main)
+            if main["rule"] in SINGLE_CLAUSE_RULES or not only_complements:
+                confidence = min(confidence, CONFIDENCE_MULTI_CLAUSE)
+            return self._result(main["commands"], confidence, main["rule"])
+        return self._result([], confidence, min(decided, key=lambda result: result["confidence"])["rule"])
+
+    def try_analyze(self, player_command: str, attributes: Optional[Iterable[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Gibt die Befehle zurück, wenn die Konfidenz die Schwelle erreicht, sonst None
+        (dann muss die Analyse-KI gefragt werden). Zählt die Entscheidungen mit.
+        """
+        result = self.analyze(player_command, attributes)
+        self.stats["analyzed"] += 1
+        self.rule_counts[result["rule"]] = self.rule_counts.get(result["rule"], 0) + 1
+        if result["confidence"] >= self.threshold:
+            self.stats["accepted"] += 1
+            logger.info(f"Schnellanalyse übernommen ({result['rule']}, Konfidenz {result['confidence']:.2f}): {result['commands']}")
+            return result["commands"]
+        self.stats["deferred_to_ai"] += 1
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        analyzed = self.stats["analyzed"]
+        return {
+            **self.stats,
+            "threshold": self.threshold,
+            "acceptance_rate": round(self.stats["accepted"] / analyzed, 3) if analyzed else 0.0,
+            "rules": dict(self.rule_counts),
+        }
+
+    @staticmethod
+    def _result(commands: List[Dict[str, Any]], confidence: float, rule: str) -> Dict[str, Any]:
+        return {"commands": commands, "confidence": confidence, "rule": rule}
+
+    @staticmethod
+    def _split_clauses(text: str) -> List[str]:
+        """Zerlegt die Aktion an Satzzeichen und Konjunktionen; "Ich versuche," wird mit dem Folgenden verbunden."""
+        clauses: List[str] = []
+        pending = ""
+        for part in CLAUSE_SPLIT_PATTERN.split(text):
+            part = f"{pending} {part.strip()}".strip() if pending else part.strip()
+            words = re.findall(r"[a-zäöüß]+", part.lower())
+            if not words:
+                continue
+            if all(word in CLAUSE_FILLER_WORDS or word in ATTEMPT_KEYWORDS for word in words):
+                pending = part
+                continue
+            clauses.append(part)
+            pending = ""
+        if pending:
+            clauses.append(pending)
+        return clauses or [text]
+
+    @staticmethod
+    def _verb_candidates(clause: str) -> List[str]:
+        """
+        Kleingeschriebene Wörter des Teilsatzes, die ein Verb sein können. Großgeschriebene
+        Wörter gelten außer am Satzanfang als Substantive ("mit dem Kämpfer", "nach dem Rätsel").
+        """
+        tokens = re.findall(r"[A-Za-zÄÖÜäöüß]+", clause)
+        return [token.lower() for index, token in enumerate(tokens) if index == 0 or not token[0].isupper()]
+
+    @staticmethod
+    def _stem_matches(word: str, stem: str) -> bool:
+        if word.startswith(stem):
+            return True
+        for prefix in VERB_PREFIXES:
+            if word.startswith(prefix):
+                rest = word[len(prefix):]
+                if rest.startswith(stem) or (rest.startswith("zu") and rest[2:].startswith(stem)):
+                    return True
+        return False
+
+    @classmethod
+    def _find_stem_attribute(cls, words: List[str], lexicon: Dict[str, Iterable[str]]) -> Optional[str]:
+        for attribute, stems in lexicon.items():
+            if any(cls._stem_matches(word, stem) for word in words for stem in stems):
+                return attribute
+        return None
+
+    @staticmethod
+    def _find_phrase_attribute(lowered: str) -> Optional[str]:
+        for attribute, pattern in ROLL_PHRASES.items():
+            if pattern.search(lowered):
+                return attribute
+        return None
+
+    @staticmethod
+    def _resolve_attribute(attribute: str, attribute_list: List[str]) -> Optional[str]:
+        """
+        Nur Attribute aus der Liste des Charakters sind erlaubt (Regel 3 des Analyse-Prompts).
+        Gibt None zurück, wenn weder das Attribut noch sein Ersatz in der Liste steht.
+        """
+        if not attribute_list:
+            return attribute
+        by_lower = {name.lower(): name for name in attribute_list}
+        if attribute.lower() in by_lower:
+            return by_lower[attribute.lower()]
+        fallback = ATTRIBUTE_FALLBACKS.get(attribute)
+        if fallback and fallback.lower() in by_lower:
+            return by_lower[fallback.lower()]
+        return None
+
+    @staticmethod
+    def _estimate_difficulty(lowered: str) -> int:
+        if any(word in lowered for word in HARD_WORDS):
+            return DEFAULT_DIFFICULTY + 3
+        if any(word in lowered for word in EASY_WORDS):
+            return DEFAULT_DIFFICULTY - 3
+        return DEFAULT_DIFFICULTY
+
+    @staticmethod
+    def _move_command(raw_location: str) -> Dict[str, Any]:
+        location = re.sub(r"\s+(?:zurück|hin|hinüber|weiter)$", "", raw_location.strip(), flags=re.IGNORECASE)
+        location = location[:1].upper() + location[1:]
+        return {"command": "PLAYER_MOVE", "location_name": location}
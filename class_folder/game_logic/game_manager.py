@@ -77,13 +77,17 @@ class GameManager(BaseGameManager):
         try:
             match = re.search(r'\[.*\]', npc_command_json_str, re.DOTALL)
             npc_commands = json.loads(match.group(0)) if match else []
-            self._process_commands_with_logic(npc_commands)
-            all_commands.extend(npc_commands)
-        except json.JSONDecodeError: pass
-
-        # Speichern und XP
-        involved_npc_ids = [npc['char_id'] for npc in self.scene_npcs]
-        self.db_manager.save_event(self.game_state['world_id'], char_info['char_id'], command, narrative_text, involved_npc_ids, all_commands)
+        except json.JSONDecodeError:
+            npc_commands = None
+
+        # Zustandsänderungen und Ereignis in einer Transaktion speichern, danach XP
+        with self.db_manager.unit_of_work():
+            if npc_commands is not None:
+                self._process_commands_with_logic(npc_commands)
+                all_commands.extend(npc_commands)
+            involved_npc_ids = [npc['char_id'] for npc in self.scene_npcs]
+            self.db_manager.save_event(self.game_state['world_id'], char_info['char_id'], command, narrative_text, involved_npc_ids, all_commands)
+        self.story_memory.record_event(self.game_state['world_id'])
         self._grant_xp(parent_widget, xp_amount=10)
 
         return f"{roll_feedback}\n\n{narrative_text}".strip()
@@ -7,31 +7,148 @@ Erbt die Kernlogik von BaseGameManager und interagiert mit dem
 Backend-Server über eine asynchrone `ai_caller`-Funktion.
 """
 
+import asyncio
 import logging
 import re
 import json
-from typing import Optional, Dict, Any, List, Callable, Coroutine
+import time
+from typing import Optional, Dict, Any, List, Callable, Coroutine, AsyncIterator
 
 # KORREKTUR: Importiere die neue Basisklasse
 from .base_game_manager import BaseGameManager
+from .fast_path_analyzer import FastPathAnalyzer
+from ..core.storage_backend import StorageBackend
+from ..core.async_database import AsyncDatabaseManager
+from ..core.consequence_worker import WorldConsequenceWorker
+from ..core.story_memory import StoryMemory
 from templates.regeln import CREATIVE_PROMPTS
 
 logger = logging.getLogger(__name__)
 
+
+class SpeculationStats:
+    """
+    Zählt Treffer und Fehlschläge der spekulativen Erzählung.
+    Eine Instanz kann von allen GameManagern des Servers geteilt werden.
+    """
+
+    def __init__(self):
+        self.hits = 0                 # Keine Würfelprobe: spekulative Erzählung übernommen
+        self.misses = 0               # Würfelprobe: Erzählung verworfen und neu generiert
+        self.overlap_seconds = 0.0    # Bei Treffern parallel zur Analyse gewonnene Zeit
+        self.wasted_seconds = 0.0     # Bei Fehlschlägen vergeblich in die Spekulation investierte Zeit
+
+    def record_hit(self, overlap_seconds: float):
+        self.hits += 1
+        self.overlap_seconds += overlap_seconds
+
+    def record_miss(self, wasted_seconds: float):
+        self.misses += 1
+        self.wasted_seconds += wasted_seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "speculative_turns": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "overlap_seconds_total": round(self.overlap_seconds, 3),
+            "avg_overlap_seconds_per_hit": round(self.overlap_seconds / self.hits, 3) if self.hits else 0.0,
+            "wasted_seconds_total": round(self.wasted_seconds, 3),
+        }
+
+class SummaryCacheStats:
+    """Zählt Treffer und Fehlschläge des Zusammenfassungs-Caches (server-weit teilbar)."""
+
+    def __init__(self):
+        self.hits = 0              # Zusammenfassung ohne KI-Aufruf aus dem Cache geliefert
+        self.misses = 0            # Zusammenfassung musste generiert werden
+        self.pregenerated = 0      # Im Leerlauf vorab erzeugt
+        self.saved_seconds = 0.0   # Summe der KI-Dauer, die bei Treffern nicht anfiel (geschätzt)
+        self.generation_seconds = 0.0
+        self.generations = 0
+
+    def record_generation(self, seconds: float):
+        self.generations += 1
+        self.generation_seconds += seconds
+
+    def record_hit(self):
+        self.hits += 1
+        if self.generations:
+            self.saved_seconds += self.generation_seconds / self.generations
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "pregenerated": self.pregenerated,
+            "avg_generation_seconds": round(self.generation_seconds / self.generations, 3) if self.generations else 0.0,
+            "estimated_saved_seconds": round(self.saved_seconds, 3),
+        }
+
 # KORREKTUR: Die Klasse erbt nun von BaseGameManager
 class GameManagerOnline(BaseGameManager):
     """
     Orchestriert den Spielfluss im Online-Modus.
     """
-    def __init__(self, ai_caller: Callable[[str, str, str], Coroutine[Any, Any, str]]):
-        super().__init__() # Ruft den Konstruktor der Basisklasse auf
+    def __init__(
+        self,
+        ai_caller: Callable[[str, str, str], Coroutine[Any, Any, str]],
+        db_manager: Optional[StorageBackend] = None,
+        speculative_narrative: bool = False,
+        speculation_stats: Optional[SpeculationStats] = None,
+        ai_stream_caller: Optional[Callable[[str, str, str], AsyncIterator[str]]] = None,
+        consequence_worker: Optional[WorldConsequenceWorker] = None,
+        fast_path_analyzer: Optional[FastPathAnalyzer] = None,
+        summary_adapter_version: str = "default",
+        summary_cache_stats: Optional[SummaryCacheStats] = None,
+        story_memory: Optional[StoryMemory] = None,
+        async_db: Optional[AsyncDatabaseManager] = None
+    ):
+        """
+        Args:
+            ai_caller: Asynchrone Funktion (prompt, world_name, adapter_type) -> Text.
+            db_manager: Optional geteilter Speicher (DatabaseManager oder PostgresStorage).
+            speculative_narrative: Startet die Erzählung bereits parallel zur Analyse der Spieleraktion.
+            speculation_stats: Optional geteilte Zähler für Treffer/Fehlschläge der Spekulation.
+            ai_stream_caller: Wie ai_caller, liefert den Text aber stückweise (für Token-Streaming).
+            consequence_worker: Falls gesetzt, läuft Phase 4 nach der Antwort im Hintergrund (pro Welt geordnet).
+            fast_path_analyzer: Regelbasierte Vorab-Analyse; ersetzt bei hoher Konfidenz den Phase-1-KI-Aufruf.
+            summary_adapter_version: Teil des Cache-Schlüssels der Lade-Zusammenfassung; bei neuem Adapter ändern.
+            summary_cache_stats: Optional geteilte Zähler für den Zusammenfassungs-Cache.
+            story_memory: Optional geteiltes Langzeitgedächtnis (relevante ältere Ereignisse im Prompt).
+            async_db: Thread-Pool für die Datenbankzugriffe eines Zuges; ohne ihn laufen sie per asyncio.to_thread.
+        """
+        super().__init__(db_manager, story_memory) # Ruft den Konstruktor der Basisklasse auf
         self.ai_caller = ai_caller
+        self.speculative_narrative = speculative_narrative
+        self.speculation_stats = speculation_stats or SpeculationStats()
+        self.ai_stream_caller = ai_stream_caller
+        self.consequence_worker = consequence_worker
+        self.fast_path_analyzer = fast_path_analyzer
+        self.summary_adapter_version = summary_adapter_version
+        self.summary_cache_stats = summary_cache_stats or SummaryCacheStats()
+        self.async_db = async_db
         logger.info("GameManagerOnline initialisiert.")
 
+    async def _run_blocking(self, label: str, func, *args):
+        """Datenbankarbeit läuft im Thread-Pool des Servers; der Event-Loop wartet nie auf SQL oder Sperren."""
+        if self.async_db is not None:
+            return await self.async_db.run_in_worker(label, func, *args)
+        return await super()._run_blocking(label, func, *args)
+
+    async def _build_creative_prompt(self, player_command: str, roll_outcome: Optional[str] = None) -> str:
+        """`_build_creative_rag_prompt` im Thread-Pool (liest letzte Ereignisse und das Langzeitgedächtnis)."""
+        return await self._run_blocking("build_creative_prompt", self._build_creative_rag_prompt, player_command, roll_outcome)
+
     async def process_player_command(self, command: str) -> Dict[str, Any]:
         """Verarbeitet einen Spielerbefehl im Online-Modus asynchron."""
         if not self.game_state.get("world_id"):
             return {"event_type": "ERROR", "response": "Fehler: Kein Spielstand geladen."}
+        await self._wait_for_pending_consequences()
 
         world_name = self.game_state.get('world_name', 'default')
         char_info = self.game_state.get("character_info", {})
@@ -39,10 +156,178 @@ class GameManagerOnline(BaseGameManager):
         npc_context = self._build_npc_context()
         attributes_str = ", ".join(char_info.get("attributes", {}).keys())
 
-        # Phase 1: Analyse der Spieleraktion
+        # Phase 1 (Analyse der Spieleraktion) und Phase 3 (Kreative Erzählung)
         analysis_prompt = self._build_analysis_prompt(command, "", player_name, npc_context, attributes_str)
-        command_json_str = await self.ai_caller(analysis_prompt, world_name, 'ANALYSIS')
-        
+        fast_commands = self._fast_path_commands(command)
+        if fast_commands is None and self.speculative_narrative:
+            roll_check_command, roll_feedback, narrative_text = await self._analyze_and_narrate_speculative(
+                command, analysis_prompt, world_name)
+        else:
+            if fast_commands is not None:
+                command_json_str = json.dumps(fast_commands, ensure_ascii=False)
+            else:
+                command_json_str = await self.ai_caller(analysis_prompt, world_name, 'ANALYSIS')
+            roll_check_command, roll_outcome, roll_feedback = self._resolve_roll_check(command_json_str)
+            creative_prompt = await self._build_creative_prompt(command, roll_outcome)
+            narrative_text = await self.ai_caller(creative_prompt, world_name, 'NARRATIVE')  # Cloud-Service verwendet 'NARRATIVE'
+
+        if self.consequence_worker:
+            return await self._defer_consequences(command, narrative_text, roll_check_command, roll_feedback)
+        response, _ = await self._analyze_consequences(command, narrative_text, roll_check_command, roll_feedback)
+        return response
+
+    async def process_player_command_stream(self, command: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Wie process_player_command, liefert die Erzählung aber Stück für Stück.
+        Erzeugt nacheinander die Ereignisse:
+            {"event": "roll", "text": ...}      - nur bei einer Würfelprobe
+            {"event": "token", "text": ...}     - beliebig oft während der Erzählung
+            {"event": "final", "result": ..., "commands": [...]}
+        Die Konsequenz-Analyse (Phase 4) läuft erst, nachdem die Erzählung vollständig ist;
+        ihr Ergebnis und die angewendeten Zustandsänderungen stehen im letzten Ereignis.
+        """
+        if not self.game_state.get("world_id"):
+            yield {"event": "final", "result": {"event_type": "ERROR", "response": "Fehler: Kein Spielstand geladen."}, "commands": []}
+            return
+        await self._wait_for_pending_consequences()
+
+        world_name = self.game_state.get('world_name', 'default')
+        char_info = self.game_state.get("character_info", {})
+        player_name = char_info.get("name", "")
+        npc_context = self._build_npc_context()
+        attributes_str = ", ".join(char_info.get("attributes", {}).keys())
+
+        # Phase 1: Analyse der Spieleraktion (das Würfelergebnis gehört in den Erzähl-Prompt)
+        fast_commands = self._fast_path_commands(command)
+        if fast_commands is not None:
+            command_json_str = json.dumps(fast_commands, ensure_ascii=False)
+        else:
+            analysis_prompt = self._build_analysis_prompt(command, "", player_name, npc_context, attributes_str)
+            command_json_str = await self.ai_caller(analysis_prompt, world_name, 'ANALYSIS')
+        roll_check_command, roll_outcome, roll_feedback = self._resolve_roll_check(command_json_str)
+        if roll_feedback:
+            yield {"event": "roll", "text": roll_feedback}
+
+        # Phase 3: Kreative Erzählung, gestreamt
+        creative_prompt = await self._build_creative_prompt(command, roll_outcome)
+        if self.ai_stream_caller:
+            chunks = []
+            async for chunk in self.ai_stream_caller(creative_prompt, world_name, 'NARRATIVE'):
+                chunks.append(chunk)
+                yield {"event": "token", "text": chunk}
+            narrative_text = "".join(chunks).strip()
+        else:
+            narrative_text = await self.ai_caller(creative_prompt, world_name, 'NARRATIVE')
+            yield {"event": "token", "text": narrative_text}
+
+        # Phase 4: Konsequenzen, als abschließendes Ereignis
+        response, all_commands = await self._analyze_consequences(command, narrative_text, roll_check_command, roll_feedback)
+        yield {"event": "final", "result": response, "commands": all_commands}
+
+    async def _analyze_consequences(self, command: str, narrative_text: str,
+                                    roll_check_command: Optional[Dict[str, Any]], roll_feedback: str):
+        """
+        Phase 4: Analysiert die neue Erzählung, wendet die Zustandsänderungen an,
+        speichert das Ereignis und vergibt XP. Gibt (Antwort, alle Befehle) zurück.
+        """
+        npc_commands = await self._analyze_narrative(narrative_text)
+        all_commands, level_up_signal = await self._run_blocking(
+            "commit_turn", self._commit_turn, command, narrative_text, roll_check_command, npc_commands, True)
+        response = level_up_signal or {"event_type": "STORY", "response": f"{roll_feedback}\n\n{narrative_text}".strip()}
+        return response, all_commands
+
+    async def _defer_consequences(self, command: str, narrative_text: str,
+                                  roll_check_command: Optional[Dict[str, Any]], roll_feedback: str) -> Dict[str, Any]:
+        """
+        Gibt die Erzählung sofort zurück und reiht Analyse, Zustandsänderungen und
+        Speichern als Hintergrund-Auftrag der Welt ein. Die XP-Vergabe bleibt hier,
+        weil ein Level-Up Teil der Antwort an den Client ist.
+        """
+        level_up_signal = await self._run_blocking("grant_xp", self._grant_xp, 10)
+        world_id = self.game_state['world_id']
+        self.consequence_worker.submit(
+            world_id,
+            lambda: self._apply_narrative_consequences(command, narrative_text, roll_check_command),
+            label=f"Konsequenzen für '{command[:40]}'"
+        )
+        return level_up_signal or {"event_type": "STORY", "response": f"{roll_feedback}\n\n{narrative_text}".strip()}
+
+    async def _wait_for_pending_consequences(self):
+        """Wartet auf Hintergrund-Aufträge früherer Züge, damit der Prompt den aktuellen Zustand sieht."""
+        if self.consequence_worker:
+            await self.consequence_worker.wait_for_world(self.game_state["world_id"])
+
+    async def _apply_narrative_consequences(self, command: str, narrative_text: str,
+                                            roll_check_command: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analysiert die Erzählung, wendet die Befehle an und speichert das Ereignis."""
+        npc_commands = await self._analyze_narrative(narrative_text)
+        all_commands, _ = await self._run_blocking(
+            "commit_turn", self._commit_turn, command, narrative_text, roll_check_command, npc_commands, False)
+        return all_commands
+
+    async def _analyze_narrative(self, narrative_text: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Phase 4: Analyse der neuen Erzählung. Gibt None zurück, wenn die Antwort kein gültiges
+        JSON ist oder der KI-Aufruf scheitert: der Spieler kennt die Erzählung bereits, also wird
+        das Ereignis in jedem Fall gespeichert, nur ohne die Zustandsänderungen.
+        """
+        world_name = self.game_state.get('world_name', 'default')
+        char_info = self.game_state.get("character_info", {})
+        player_name = char_info.get("name", "")
+        npc_context = self._build_npc_context()
+        attributes_str = ", ".join(char_info.get("attributes", {}).keys())
+
+        npc_analysis_prompt = self._build_analysis_prompt("", narrative_text, player_name, npc_context, attributes_str)
+        try:
+            npc_command_json_str = await self.ai_caller(npc_analysis_prompt, world_name, 'ANALYSIS')
+        except Exception as e:
+            logger.error(f"Analyse der Erzählung fehlgeschlagen, Ereignis wird ohne Konsequenzen gespeichert: {e}")
+            return None
+        try:
+            match = re.search(r'\[.*\]', npc_command_json_str, re.DOTALL)
+            return json.loads(match.group(0)) if match else []
+        except json.JSONDecodeError:
+            return None
+
+    def _commit_turn(self, command: str, narrative_text: str, roll_check_command: Optional[Dict[str, Any]],
+                     npc_commands: Optional[List[Dict[str, Any]]], grant_xp: bool):
+        """
+        Alle Schreibzugriffe des Zuges (Befehle, Ereignis, ggf. XP) in einer Transaktion.
+        Synchron und als Ganzes in einem Worker-Thread, damit die Schreibsperre nie den
+        Event-Loop blockiert. Gibt (alle Befehle, Level-Up-Signal oder None) zurück.
+        """
+        with self.db_manager.unit_of_work():
+            all_commands = self._apply_turn_commands(command, narrative_text, roll_check_command, npc_commands)
+            level_up_signal = self._grant_xp(xp_amount=10) if grant_xp else None
+        self.story_memory.record_event(self.game_state['world_id'])
+        return all_commands, level_up_signal
+
+    def _apply_turn_commands(self, command: str, narrative_text: str, roll_check_command: Optional[Dict[str, Any]],
+                             npc_commands: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Wendet die Befehle der Phase 4 an und speichert das Ereignis. Synchron, damit der
+        Aufrufer alles in eine Arbeitseinheit (`unit_of_work`) fassen kann.
+        """
+        char_info = self.game_state.get("character_info", {})
+        all_commands = []
+        if roll_check_command: all_commands.append(roll_check_command)
+        if npc_commands is not None:
+            self._process_commands_with_logic(npc_commands)
+            all_commands.extend(npc_commands)
+
+        involved_npc_ids = [npc['char_id'] for npc in self.scene_npcs]
+        self.db_manager.save_event(self.game_state['world_id'], char_info['char_id'], command, narrative_text, involved_npc_ids, all_commands)
+        return all_commands
+
+    def _fast_path_commands(self, command: str) -> Optional[List[Dict[str, Any]]]:
+        """Phase-1-Befehle aus der regelbasierten Analyse, oder None, wenn die KI entscheiden soll."""
+        if not self.fast_path_analyzer:
+            return None
+        attributes = self.game_state.get("character_info", {}).get("attributes", {}).keys()
+        return self.fast_path_analyzer.try_analyze(command, attributes)
+
+    def _resolve_roll_check(self, command_json_str: str):
+        """Sucht in der Analyse nach einem ROLL_CHECK und würfelt ihn gegebenenfalls aus."""
         roll_check_command, roll_outcome, roll_feedback = None, None, ""
         try:
             match = re.search(r'\[.*\]', command_json_str, re.DOTALL)
@@ -52,35 +337,50 @@ class GameManagerOnline(BaseGameManager):
                 roll_feedback = self._execute_roll_check(roll_check_command)
                 roll_outcome = "Erfolg" if "Erfolg" in roll_feedback else "Misserfolg"
         except (json.JSONDecodeError, StopIteration): pass
+        return roll_check_command, roll_outcome, roll_feedback
 
-        # Phase 3: Kreative Erzählung
-        creative_prompt = self._build_creative_rag_prompt(command, roll_outcome)
-        narrative_text = await self.ai_caller(creative_prompt, world_name, 'NARRATIVE')  # Cloud-Service verwendet 'NARRATIVE'
-
-        # Phase 4: Analyse der neuen Erzählung
-        npc_analysis_prompt = self._build_analysis_prompt("", narrative_text, player_name, npc_context, attributes_str)
-        npc_command_json_str = await self.ai_caller(npc_analysis_prompt, world_name, 'ANALYSIS')
-        
-        all_commands = []
-        if roll_check_command: all_commands.append(roll_check_command)
+    async def _analyze_and_narrate_speculative(self, command: str, analysis_prompt: str, world_name: str):
+        """
+        Startet die Erzählung ohne Würfelergebnis gleichzeitig mit der Analyse.
+        Findet die Analyse keinen ROLL_CHECK, ist der Prompt identisch zum
+        sequentiellen Ablauf und die spekulative Erzählung wird übernommen.
+        Andernfalls wird sie abgebrochen und mit dem Würfelergebnis neu generiert.
+        """
+        speculative_prompt = await self._build_creative_prompt(command, None)
+        started_at = time.perf_counter()
+        narrative_task = asyncio.create_task(self.ai_caller(speculative_prompt, world_name, 'NARRATIVE'))
         try:
-            match = re.search(r'\[.*\]', npc_command_json_str, re.DOTALL)
-            npc_commands = json.loads(match.group(0)) if match else []
-            self._process_commands_with_logic(npc_commands)
-            all_commands.extend(npc_commands)
-        except json.JSONDecodeError: pass
+            command_json_str = await self.ai_caller(analysis_prompt, world_name, 'ANALYSIS')
+        except BaseException:
+            self._discard_task(narrative_task)
+            raise
+        analysis_seconds = time.perf_counter() - started_at
 
-        involved_npc_ids = [npc['char_id'] for npc in self.scene_npcs]
-        self.db_manager.save_event(self.game_state['world_id'], char_info['char_id'], command, narrative_text, involved_npc_ids, all_commands)
-        
-        level_up_signal = self._grant_xp(xp_amount=10)
-        return level_up_signal or {"event_type": "STORY", "response": f"{roll_feedback}\n\n{narrative_text}".strip()}
+        roll_check_command, roll_outcome, roll_feedback = self._resolve_roll_check(command_json_str)
+        if roll_check_command is None:
+            narrative_text = await narrative_task
+            self.speculation_stats.record_hit(analysis_seconds)
+            logger.info(f"Spekulative Erzählung übernommen ({analysis_seconds:.2f}s parallel zur Analyse).")
+            return None, roll_feedback, narrative_text
+
+        self._discard_task(narrative_task)
+        self.speculation_stats.record_miss(analysis_seconds)
+        logger.info("Spekulative Erzählung verworfen (ROLL_CHECK), generiere mit Würfelergebnis neu.")
+        creative_prompt = await self._build_creative_prompt(command, roll_outcome)
+        narrative_text = await self.ai_caller(creative_prompt, world_name, 'NARRATIVE')
+        return roll_check_command, roll_feedback, narrative_text
+
+    @staticmethod
+    def _discard_task(task: asyncio.Task):
+        """Bricht eine nicht mehr benötigte Anfrage ab, ohne dass ihr Fehler unbeachtet verloren geht."""
+        task.cancel()
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
 
     async def get_initial_story_prompt(self) -> Dict[str, Any]:
         """Generiert die erste Story-Antwort für den Online-Modus."""
         logger.info("Generiere initiale Story für neues Spiel (Online).")
         char_info = self.game_state.get("character_info", {})
-        world_lore = self.db_manager.get_world_lore(self.game_state["world_id"])
+        world_lore = await self._run_blocking("get_world_lore", self.db_manager.get_world_lore, self.game_state["world_id"])
         intro_command = f"""
         Das Abenteuer beginnt für {char_info.get('name', 'N/A')}.
         Welt-Information: {world_lore}
@@ -131,13 +431,39 @@ class GameManagerOnline(BaseGameManager):
         if not world_id:
             return static_summary + "Was möchtest du als Nächstes tun?"
 
-        recent_events = self.db_manager.get_last_events(world_id, limit=3)
-        if not recent_events:
+        last_event_id = await self._run_blocking("get_last_event_id", self.db_manager.get_last_event_id, world_id)
+        if last_event_id is None:
             return static_summary + "Was möchtest du als Nächstes tun?"
 
+        # Zwischengespeicherte Zusammenfassung für genau diesen Spielstand sofort verwenden
+        summary_text = await self._run_blocking("get_cached_summary", self.db_manager.get_cached_summary,
+                                                world_id, last_event_id, self.summary_adapter_version)
+        if summary_text:
+            self.summary_cache_stats.record_hit()
+            logger.info(f"Zusammenfassung für Welt {world_id} aus dem Cache (Event {last_event_id}).")
+        else:
+            self.summary_cache_stats.misses += 1
+            summary_text = await self._generate_event_summary(world_id, last_event_id)
+
+        # --- Teil 3: Alles kombinieren ---
+        full_summary = (
+            f"{static_summary}"
+            f"**Zusammenfassung der letzten Ereignisse:**\n{summary_text}\n\n"
+            "Was möchtest du als Nächstes tun?"
+        )
+        
+        return full_summary
+
+    async def _generate_event_summary(self, world_id: int, last_event_id: int) -> str:
+        """
+        Erzeugt die Zusammenfassung der letzten Ereignisse. Eine KI-Zusammenfassung wird
+        im Cache abgelegt; die lokale Ersatz-Zusammenfassung nicht, damit beim nächsten
+        Laden erneut die KI versucht wird.
+        """
+        recent_events = await self._run_blocking("get_last_events", self.db_manager.get_last_events, world_id, 3)
+
         # Erstelle lokale Zusammenfassung als Standardverhalten
-        local_summary = self._create_local_event_summary(recent_events)
-        summary_text = local_summary
+        summary_text = self._create_local_event_summary(recent_events)
 
         # Versuche AI-Service zu nutzen falls verfügbar
         if hasattr(self, 'ai_caller') and self.ai_caller:
@@ -160,12 +486,18 @@ class GameManagerOnline(BaseGameManager):
                 
                 world_name = self.game_state.get('world_name', 'default')
                 # Rufe den entfernten KI-Dienst auf
+                started_at = time.perf_counter()
                 ai_summary = await self.ai_caller(summary_prompt, world_name, 'NARRATIVE')
                 
                 # Verwende AI-Zusammenfassung wenn verfügbar und nicht leer
                 if ai_summary and ai_summary.strip():
                     summary_text = ai_summary
                     logger.info("AI-Service Zusammenfassung erfolgreich erhalten")
+                    # Fehlermeldungen des Dienstes ("[Fehler: ...]") nicht zwischenspeichern
+                    if not ai_summary.lstrip().startswith("["):
+                        self.summary_cache_stats.record_generation(time.perf_counter() - started_at)
+                        await self._run_blocking("save_cached_summary", self.db_manager.save_cached_summary,
+                                                 world_id, last_event_id, self.summary_adapter_version, summary_text)
                 else:
                     logger.warning("AI-Service gab leere Antwort - verwende lokale Zusammenfassung")
                     
@@ -173,15 +505,26 @@ class GameManagerOnline(BaseGameManager):
                 logger.error(f"Fehler beim AI-Service - verwende lokale Zusammenfassung: {e}")
         else:
             logger.info("AI-Service nicht verfügbar - verwende lokale Zusammenfassung")
+        return summary_text
 
-        # --- Teil 3: Alles kombinieren ---
-        full_summary = (
-            f"{static_summary}"
-            f"**Zusammenfassung der letzten Ereignisse:**\n{summary_text}\n\n"
-            "Was möchtest du als Nächstes tun?"
-        )
-        
-        return full_summary
+    async def pregenerate_load_game_summary(self) -> bool:
+        """
+        Erzeugt die Lade-Zusammenfassung vorab (z.B. wenn die Sitzung in den Leerlauf geht),
+        damit das nächste Laden sie sofort aus dem Cache bekommt.
+        Gibt True zurück, wenn eine neue Zusammenfassung generiert wurde.
+        """
+        world_id = self.game_state.get("world_id")
+        if not world_id:
+            return False
+        last_event_id = await self._run_blocking("get_last_event_id", self.db_manager.get_last_event_id, world_id)
+        if last_event_id is None:
+            return False
+        if await self._run_blocking("get_cached_summary", self.db_manager.get_cached_summary,
+                                    world_id, last_event_id, self.summary_adapter_version):
+            return False
+        await self._generate_event_summary(world_id, last_event_id)
+        self.summary_cache_stats.pregenerated += 1
+        return True
 
     def _create_local_event_summary(self, recent_events: List[tuple]) -> str:
         """Erstellt eine lokale Zusammenfassung der Events falls AI-Service nicht verfügbar ist."""
@@ -248,6 +591,7 @@ class GameManagerOnline(BaseGameManager):
         
         # Lade Charakterdaten neu, um aktuelle Attribute zu erhalten
         char_info = self.db_manager.get_full_character_info(char_id) or char_info
+        self.game_state["character_info"] = char_info
         
         return {
             "event_type": "LEVEL_UP",
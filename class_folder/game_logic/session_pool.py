@@ -0,0 +1,193 @@
+# class_folder/game_logic/session_pool.py
+# -*- coding: utf-8 -*-
+
+"""
+Hält pro aktiver Spielsitzung (world_id, char_id) eine eigene GameManager-Instanz
+im Speicher. Heiße Sitzungen müssen ihren Spielzustand nicht bei jedem Zug neu
+aus der Datenbank laden, und gleichzeitige Spieler überschreiben sich nicht
+mehr gegenseitig `game_state` oder `scene_npcs`.
+Sitzungen werden nach Leerlaufzeit, nach LRU-Reihenfolge oder bei Überschreiten
+der Speichergrenze verdrängt.
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, List, Tuple
+
+from .base_game_manager import BaseGameManager
+
+logger = logging.getLogger(__name__)
+
+SessionKey = Tuple[int, int]
+
+
+class _PooledSession:
+    """Ein Eintrag im Pool: der GameManager plus Verwaltungsdaten."""
+
+    def __init__(self, manager: BaseGameManager):
+        self.manager = manager
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.size_bytes = 0
+        self.hits = 0
+        self.idle_reported = False  # Bereits von take_newly_idle gemeldet
+
+
+class GameSessionPool:
+    """
+    LRU-Pool von GameManager-Instanzen, geschlüsselt nach (world_id, char_id).
+    Der Pool wird ausschließlich aus dem Event-Loop des Backends benutzt und
+    benötigt daher keine eigenen Locks.
+    """
+
+    def __init__(
+        self,
+        manager_factory: Callable[[], BaseGameManager],
+        max_sessions: int = 200,
+        idle_timeout_seconds: float = 1800.0,
+        max_memory_bytes: int = 64 * 1024 * 1024
+    ):
+        """
+        Args:
+            manager_factory: Erzeugt eine neue, noch leere GameManager-Instanz.
+            max_sessions: Maximale Anzahl gleichzeitig gehaltener Sitzungen.
+            idle_timeout_seconds: Sitzungen ohne Zugriff werden danach verdrängt.
+            max_memory_bytes: Obergrenze für den geschätzten Speicherbedarf aller Sitzungen.
+        """
+        self.manager_factory = manager_factory
+        self.max_sessions = max_sessions
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.max_memory_bytes = max_memory_bytes
+        self._sessions: "OrderedDict[SessionKey, _PooledSession]" = OrderedDict()
+        self._total_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "load_failures": 0, "evictions_idle": 0,
+                      "evictions_lru": 0, "evictions_memory": 0, "invalidations": 0}
+        logger.info(f"GameSessionPool initialisiert (max {max_sessions} Sitzungen, "
+                    f"Leerlauf {idle_timeout_seconds:.0f}s, Speicher {max_memory_bytes // (1024 * 1024)} MB).")
+
+    async def get_session(self, world_id: int, char_id: int) -> Optional[BaseGameManager]:
+        """
+        Gibt den GameManager der Sitzung zurück. Bei einem Treffer wird der
+        bereits geladene Zustand wiederverwendet, sonst wird er einmalig aus
+        der Datenbank geladen (außerhalb des Event-Loops). Gibt None zurück,
+        wenn der Spielstand nicht existiert.
+        """
+        key = (world_id, char_id)
+        entry = self._sessions.get(key)
+        if entry:
+            return self._touch(key, entry)
+
+        manager = self.manager_factory()
+        await manager.load_game_state_async(world_id, char_id)
+        # Während des Ladens kann dieselbe Sitzung von einer anderen Anfrage angelegt worden sein
+        entry = self._sessions.get(key)
+        if entry:
+            return self._touch(key, entry)
+        if not manager.game_state:
+            self.stats["load_failures"] += 1
+            return None
+
+        entry = _PooledSession(manager)
+        self._sessions[key] = entry
+        self._update_size(entry)
+        self.stats["misses"] += 1
+        logger.info(f"Neue Sitzung im Pool angelegt: Welt {world_id}, Charakter {char_id} ({len(self._sessions)} aktiv).")
+        self._enforce_limits(keep=key)
+        return manager
+
+    def _touch(self, key: SessionKey, entry: _PooledSession) -> BaseGameManager:
+        entry.last_used = time.monotonic()
+        entry.hits += 1
+        entry.idle_reported = False
+        self._sessions.move_to_end(key)
+        self._update_size(entry)
+        self.stats["hits"] += 1
+        self._enforce_limits(keep=key)
+        return entry.manager
+
+    def invalidate(self, world_id: int, char_id: Optional[int] = None) -> int:
+        """
+        Entfernt die Sitzung(en) einer Welt, z.B. nachdem deren Daten außerhalb
+        eines Zuges geändert wurden. Der nächste Zugriff lädt den Zustand neu.
+        """
+        keys = [k for k in self._sessions if k[0] == world_id and (char_id is None or k[1] == char_id)]
+        for key in keys:
+            self._remove(key)
+        self.stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def invalidate_character(self, char_id: int) -> int:
+        """Entfernt alle Sitzungen, die zu einem bestimmten Charakter gehören."""
+        keys = [k for k in self._sessions if k[1] == char_id]
+        for key in keys:
+            self._remove(key)
+        self.stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def evict_idle(self) -> int:
+        """Verdrängt alle Sitzungen, die länger als das Leerlauf-Limit unbenutzt sind."""
+        now = time.monotonic()
+        idle_keys = [k for k, e in self._sessions.items() if now - e.last_used > self.idle_timeout_seconds]
+        for key in idle_keys:
+            self._remove(key)
+        if idle_keys:
+            self.stats["evictions_idle"] += len(idle_keys)
+            logger.info(f"{len(idle_keys)} inaktive Sitzung(en) aus dem Pool entfernt.")
+        return len(idle_keys)
+
+    def take_newly_idle(self, idle_seconds: float) -> List[Tuple[SessionKey, BaseGameManager]]:
+        """
+        Gibt die Sitzungen zurück, die seit mindestens `idle_seconds` unbenutzt sind und
+        seit ihrem letzten Zugriff noch nicht gemeldet wurden (z.B. für Vorab-Arbeiten im Leerlauf).
+        """
+        now = time.monotonic()
+        newly_idle = []
+        for key, entry in self._sessions.items():
+            if not entry.idle_reported and now - entry.last_used >= idle_seconds:
+                entry.idle_reported = True
+                newly_idle.append((key, entry.manager))
+        return newly_idle
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Liefert Kennzahlen des Pools für Monitoring-Endpunkte."""
+        return {
+            **self.stats,
+            "active_sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "estimated_bytes": self._total_bytes,
+            "max_memory_bytes": self.max_memory_bytes,
+        }
+
+    def _enforce_limits(self, keep: Optional[SessionKey] = None):
+        """Verdrängt die am längsten unbenutzten Sitzungen, bis alle Grenzen eingehalten sind."""
+        while len(self._sessions) > self.max_sessions:
+            if not self._evict_oldest(keep, "evictions_lru"):
+                break
+        while self._total_bytes > self.max_memory_bytes and len(self._sessions) > 1:
+            if not self._evict_oldest(keep, "evictions_memory"):
+                break
+
+    def _evict_oldest(self, keep: Optional[SessionKey], stat_key: str) -> bool:
+        for key in self._sessions:
+            if key != keep:
+                self._remove(key)
+                self.stats[stat_key] += 1
+                return True
+        return False
+
+    def _remove(self, key: SessionKey):
+        entry = self._sessions.pop(key, None)
+        if entry:
+            self._total_bytes -= entry.size_bytes
+
+    def _update_size(self, entry: _PooledSession):
+        """Schätzt den Speicherbedarf einer Sitzung anhand ihres serialisierten Zustands."""
+        manager = entry.manager
+        try:
+            size = len(json.dumps([manager.game_state, manager.scene_npcs], default=str))
+        except (TypeError, ValueError):
+            size = 0
+        self._total_bytes += size - entry.size_bytes
+        entry.size_bytes = size
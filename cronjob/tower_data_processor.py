@@ -31,6 +31,9 @@ logger = logging.getLogger(__name__)
 TOWER_CONFIG_FILE = Path(__file__).resolve().parent / "app_settings_tower.json"
 DOWNLOAD_TEMP_DIR = Path(__file__).resolve().parent / "tower_data_inbox_temp"
 DOWNLOAD_TEMP_DIR.mkdir(parents=True, exist_ok=True)
+IMPORT_CHUNK_SIZE = 5000  # Rows per import transaction
+# Batch files above this size are imported without indexes, which are rebuilt once afterwards
+IMPORT_REBUILD_INDEXES_MIN_BYTES = 50 * 1024 * 1024
 
 def load_tower_config() -> Dict[str, Any]:
     """Loads the tower's configuration from a JSON file."""
@@ -123,16 +126,19 @@ def group_files_by_world(batch_files: List[str]) -> Dict[str, List[str]]:
 def import_data_into_tower_db(db_manager: DatabaseManager, world_id: int, file_path: Path) -> bool:
     """
     Imports data from a single JSONL file into the tower's database for a specific world.
-    This is a placeholder for the actual import logic.
+    Uses the chunked bulk importer; very large files are loaded without indexes.
     """
-    try:
-        logger.info(f"Importing data from '{file_path.name}' for world_id {world_id} into tower database...")
-        stats = db_manager.import_events_from_jsonl(world_id, file_path)
-        logger.info(f"Import successful.'{stats}")
-        return True
-    except requests.RequestException as e:
-        logger.error(f"Failed to import '{file_path.name}' as processed: {e}", exc_info=True)
+    rebuild_indexes = file_path.stat().st_size >= IMPORT_REBUILD_INDEXES_MIN_BYTES
+    logger.info(f"Importing data from '{file_path.name}' for world_id {world_id} into tower database...")
+    report = db_manager.bulk_import_events_from_jsonl(
+        world_id, file_path, chunk_size=IMPORT_CHUNK_SIZE, rebuild_indexes=rebuild_indexes
+    )
+    if report.error:
+        logger.error(f"Failed to import '{file_path.name}': {report.error}")
         return False
+    logger.info(f"Import successful: {report.inserted} new, {report.duplicates} duplicates, "
+                f"{report.skipped_lines} skipped lines, {report.rows_per_second:.0f} rows/s.")
+    return True
 
 def mark_batch_processed_on_server(server_url: str, api_key: str, world_name: str, filename: str) -> bool:
     """Notifies the server that a batch has been successfully processed."""
@@ -182,7 +188,7 @@ def main_data_ingestion() -> Dict[str, Any]:
     for world_name, filenames in worlds_with_new_data.items():
         logger.info(f"--- Processing data for world: {world_name} ---")
         
-        tower_db = DatabaseManager(db_path=Path(tower_db_path /  f"{world_name}_laststrawberry.db"))
+        tower_db = DatabaseManager(db_path=Path(tower_db_path) / f"{world_name}_laststrawberry.db")
         tower_db.setup_database() # Ensure tables exist
 
         world_info = tower_db.get_or_create_world(world_name)
@@ -6,9 +6,16 @@ This DB aggregates training data from all worlds.
 """
 import sqlite3
 import logging
+import sys
 from pathlib import Path
-import json
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, Iterator, List, Tuple
+
+# Add project root to path to allow importing project classes
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from class_folder.core.bulk_import import bulk_import_events, ImportReport, DEFAULT_CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +66,10 @@ class TowerDatabaseManager:
                     FOREIGN KEY (world_id) REFERENCES worlds (world_id)
                 );
             """)
+            # Keyset pagination over the training events of a world
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_events_world_quality_event ON events (world_id, quality_label, event_id)"
+            )
             conn.commit()
             logger.info("Tower database schema is set up.")
         except sqlite3.Error as e:
@@ -84,50 +95,48 @@ class TowerDatabaseManager:
             return None
 
     def import_events_from_jsonl(self, world_id: int, file_path: Path) -> int:
-        """Imports events from a JSONL file into the tower database."""
-        imported_count = 0
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            with file_path.open("r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        event = json.loads(line)
-                        # Use INSERT OR IGNORE to avoid duplicates
-                        cursor.execute(
-                            """
-                            INSERT OR IGNORE INTO events (event_id, world_id, player_input, ai_output, quality_label)
-                            VALUES (?, ?, ?, ?, ?)
-                            """,
-                            (
-                                event['event_id'],
-                                world_id,
-                                event['player_input'],
-                                event['ai_output'],
-                                event.get('quality_label', 'gut (Training)')
-                            )
-                        )
-                        if cursor.rowcount > 0:
-                            imported_count += 1
-                    except (json.JSONDecodeError, KeyError) as e:
-                        logger.warning(f"Skipping malformed line in {file_path.name}: {e}")
-            conn.commit()
-            logger.info(f"Imported {imported_count} new events from '{file_path.name}'.")
-        except sqlite3.Error as e:
-            logger.error(f"DB error during import from '{file_path.name}': {e}", exc_info=True)
-            conn.rollback()
-        return imported_count
+        """Imports events from a JSONL file into the tower database and returns the number of new events."""
+        return self.bulk_import_events_from_jsonl(world_id, file_path).inserted
+
+    def bulk_import_events_from_jsonl(self, world_id: int, file_path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                      rebuild_indexes: bool = False) -> ImportReport:
+        """Imports a JSONL file in chunked executemany transactions and reports rows/s and skipped lines."""
+        report = bulk_import_events(self._get_connection(), world_id, file_path, chunk_size, rebuild_indexes)
+        logger.info(f"Import finished: {report}")
+        return report
 
     def get_events_for_training(self, world_id: int) -> List[Dict[str, Any]]:
         """Fetches all 'good' events for a specific world for training."""
+        return [
+            {"player_input": event["player_input"], "ai_output": event["ai_output"]}
+            for event in self.iter_events_for_training(world_id)
+        ]
+
+    def iter_events_for_training(self, world_id: int, page_size: int = 500,
+                                 after_event_id: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yields the 'good' events of a world page by page (keyset pagination on event_id)."""
+        cursor: Optional[int] = after_event_id
+        while cursor is not None:
+            events, cursor = self.get_events_for_training_page(world_id, cursor, page_size)
+            yield from events
+
+    def get_events_for_training_page(self, world_id: int, after_event_id: int = 0,
+                                     limit: int = 500) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Fetches one page of 'good' events after `after_event_id`. Returns (events, next_cursor)."""
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT player_input, ai_output FROM events WHERE world_id = ? AND quality_label = 'gut (Training)'",
-                (world_id,)
+                "SELECT event_id, player_input, ai_output FROM events "
+                "WHERE world_id = ? AND quality_label = 'gut (Training)' AND event_id > ? "
+                "ORDER BY event_id ASC LIMIT ?",
+                (world_id, after_event_id, limit + 1)
             )
-            return [dict(row) for row in cursor.fetchall()]
+            events = [dict(row) for row in cursor.fetchall()]
+            if len(events) > limit:
+                events = events[:limit]
+                return events, events[-1]["event_id"]
+            return events, None
         except sqlite3.Error as e:
             logger.error(f"Error fetching training events for world {world_id}: {e}")
-            return []
+            return [], None
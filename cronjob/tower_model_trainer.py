@@ -56,13 +56,14 @@ def main_training_for_world(world_id: int, world_name: str) -> Path | None:
     try:
         logger.info(f"=== Starting Fine-Tuning for World: '{world_name}' (ID: {world_id}) ===")
 
-        events_for_training = db_manager.get_events_for_review(label='gut (Training)', world_id=world_id)
-        if not events_for_training:
+        # Only check that there is anything to train on; the fine tuner pages through the events itself
+        first_page, _ = db_manager.get_events_for_review_page(
+            label='gut (Training)', world_id=world_id, limit=1, include_archive=True
+        )
+        if not first_page:
             logger.warning(f"No events marked as 'gut (Training)' found for world '{world_name}'. Skipping training.")
             return None
 
-        logger.info(f"Found {len(events_for_training)} high-quality events for training.")
-
         config = load_tower_config()
         training_hyperparams = config.get("training_hyperparameters", {})
         
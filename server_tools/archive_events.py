@@ -0,0 +1,68 @@
+# server_tools/archive_events.py
+# -*- coding: utf-8 -*-
+
+"""
+Verschiebt alte Events in die Archivdateien der Welten (eine SQLite-Datei pro Welt).
+Die jüngsten Events jeder Welt bleiben in der Hauptdatenbank; Export und
+Training lesen die Archive automatisch mit. Gedacht für einen nächtlichen Cronjob.
+
+Aufruf:
+    python server_tools/archive_events.py --all --keep-recent 1000 --older-than-days 30
+    python server_tools/archive_events.py --world-id 3 --dry-run
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Python-Pfad hinzu
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from class_folder.core.database_manager import DatabaseManager
+from class_folder.core import event_archive
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alte Events in Archivdateien pro Welt verschieben.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--world-id", type=int, help="Nur diese Welt archivieren.")
+    target.add_argument("--all", action="store_true", help="Alle Welten archivieren.")
+    parser.add_argument("--keep-recent", type=int, default=event_archive.DEFAULT_KEEP_RECENT,
+                        help=f"Jüngste Events pro Welt, die bleiben (mindestens {event_archive.MIN_KEEP_RECENT}).")
+    parser.add_argument("--older-than-days", type=float, default=None,
+                        help="Nur Events archivieren, die älter als so viele Tage sind.")
+    parser.add_argument("--batch-size", type=int, default=event_archive.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Nur zählen, nichts verschieben.")
+    parser.add_argument("--vacuum", action="store_true", help="Hauptdatenbank danach verkleinern (VACUUM).")
+    parser.add_argument("--db", type=Path, default=None, help="Pfad zur Datenbank (Standard: Server-Datenbank).")
+    parser.add_argument("--archive-dir", type=Path, default=None, help="Ordner der Archivdateien.")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db, archive_dir=args.archive_dir)
+    try:
+        db_manager.setup_database()
+        options = {"keep_recent": args.keep_recent, "older_than_days": args.older_than_days,
+                   "batch_size": args.batch_size, "dry_run": args.dry_run}
+        if args.all:
+            reports = db_manager.archive_all_worlds(**options)
+        else:
+            reports = [db_manager.archive_world_events(args.world_id, **options)]
+
+        total = 0
+        for report in reports:
+            count = report["candidates"] if args.dry_run else report["archived"]
+            total += count
+            status = f"FEHLER: {report['error']}" if report.get("error") else f"{count} Events"
+            print(f"Welt {report['world_id']:>4}: {status} (bis Event #{report['cutoff_event_id']}) -> {report['archive_path']}")
+        print(f"{'Zu archivieren' if args.dry_run else 'Archiviert'}: {total} Events in {len(reports)} Welt(en).")
+
+        if args.vacuum and not args.dry_run and total:
+            print("Verkleinere die Hauptdatenbank (VACUUM)...")
+            db_manager.vacuum()
+    finally:
+        db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,23 @@
 Dieses Skript liest alle als "human_corrected" markierten Events aus der
 Datenbank und generiert daraus eine Trainingsdatei im JSONL-Format,
 die für das Fine-Tuning des Analyse-Modells verwendet werden kann.
+Mit `--snapshot` (Pfad oder "latest") wird statt der Live-Datenbank ein
+Snapshot gelesen (siehe server_tools/snapshot_database.py).
 """
 
 import sys
 import json
 import logging
+import argparse
 from pathlib import Path
+from typing import Optional
 
 # Füge das Projektverzeichnis zum Python-Pfad hinzu
 project_root = Path(__file__).resolve().parent.parent
 sys.path.append(str(project_root))
 
 from class_folder.core.database_manager import DatabaseManager
+from class_folder.core import db_snapshot
 from templates.regeln import ANALYSIS_PROMPT_TEMPLATE
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -49,9 +54,30 @@ def create_training_example(event: dict, char_attributes: str, player_name: str,
     )
     return json.dumps({"text": full_prompt}) + "\n"
 
-def main():
-    db_manager = DatabaseManager()
-    
+def main(snapshot: Optional[str] = None):
+    if not snapshot:
+        db_manager = DatabaseManager()
+        try:
+            generate_from(db_manager)
+        finally:
+            db_manager.close_connection()
+        return
+
+    live_db = DatabaseManager()
+    snapshot_path = db_snapshot.latest_snapshot(live_db.snapshot_dir) if snapshot == "latest" else Path(snapshot)
+    if snapshot_path is None or not snapshot_path.exists():
+        logger.error(f"Snapshot '{snapshot}' nicht gefunden (Ordner: {live_db.snapshot_dir}).")
+        return
+    logger.info(f"Lese Trainingsdaten aus Snapshot '{snapshot_path.name}' statt aus der Live-Datenbank.")
+    with db_snapshot.opened_snapshot(snapshot_path) as db_path:
+        # Archivdateien werden nach dem Verschieben nicht mehr geändert und direkt gelesen
+        db_manager = DatabaseManager(db_path, archive_dir=live_db.archive_dir)
+        try:
+            generate_from(db_manager)
+        finally:
+            db_manager.close_connection()
+
+def generate_from(db_manager: DatabaseManager):
     logger.info("Suche nach von Menschen korrigierten Events ('human_corrected')...")
     # Wir holen uns die korrigierten Events aus ALLEN Welten
     corrected_events = db_manager.get_events_for_review(label='human_corrected')
@@ -84,4 +110,7 @@ def main():
     logger.info("Trainingsdatei wurde erfolgreich erstellt/aktualisiert.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Trainingsdaten für das Analyse-Modell aus DM-Korrekturen erzeugen.")
+    parser.add_argument("--snapshot", default=None,
+                        help='Snapshot-Datei (.db.gz) oder "latest" statt der Live-Datenbank lesen.')
+    main(parser.parse_args().snapshot)
@@ -0,0 +1,46 @@
+# server_tools/rebuild_world_stats.py
+# -*- coding: utf-8 -*-
+
+"""
+Berechnet die Tabelle world_stats neu aus events und characters.
+Die Statistiken werden im laufenden Betrieb von save_event und den XP-/Level-
+Änderungen fortgeschrieben; dieses Skript füllt sie für bestehende Welten
+nach oder repariert sie nach manuellen Eingriffen in die Datenbank.
+
+Aufruf:
+    python server_tools/rebuild_world_stats.py              # alle Welten
+    python server_tools/rebuild_world_stats.py --world-id 3
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Python-Pfad hinzu
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from class_folder.core.database_manager import DatabaseManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Welt-Statistiken (world_stats) neu berechnen.")
+    parser.add_argument("--world-id", type=int, default=None, help="Nur diese Welt neu berechnen.")
+    parser.add_argument("--db", type=Path, default=None, help="Pfad zur Datenbank (Standard: Server-Datenbank).")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db)
+    try:
+        # Stellt sicher, dass alle Migrationen (und damit world_stats) angewendet sind
+        db_manager.setup_database()
+        rebuilt = db_manager.rebuild_world_stats(args.world_id)
+        scope = f"Welt {args.world_id}" if args.world_id is not None else "alle Welten"
+        print(f"Statistiken neu berechnet ({scope}): {rebuilt} Welt(en) geschrieben.")
+        if args.world_id is not None:
+            print(db_manager.get_world_statistics(args.world_id))
+    finally:
+        db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    main()
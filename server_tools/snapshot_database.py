@@ -0,0 +1,79 @@
+# server_tools/snapshot_database.py
+# -*- coding: utf-8 -*-
+
+"""
+Erstellt im laufenden Betrieb einen komprimierten Snapshot der Server-Datenbank
+samt Manifest (Prüfsummen, Schema-Version, Zeilenzahlen). Die Kopie läuft in
+kleinen Schritten mit Pausen; Spielzüge schreiben währenddessen weiter.
+Gedacht für einen Cronjob vor dem Training bzw. als Sicherung.
+
+Aufruf:
+    python server_tools/snapshot_database.py                 # Snapshot erstellen, 7 behalten
+    python server_tools/snapshot_database.py --keep 3 --step-sleep-ms 10
+    python server_tools/snapshot_database.py --list
+    python server_tools/snapshot_database.py --restore snapshots/laststrawberry_20250101-030000.db.gz --to kopie.db
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Python-Pfad hinzu
+project_root = Path(__file__).resolve().parent.parent
+sys.path.append(str(project_root))
+
+from class_folder.core.database_manager import DatabaseManager
+from class_folder.core import db_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Online-Snapshot der Datenbank erstellen, auflisten oder entpacken.")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--list", action="store_true", help="Vorhandene Snapshots auflisten.")
+    action.add_argument("--restore", type=Path, default=None, help="Diesen Snapshot entpacken und prüfen (mit --to).")
+    parser.add_argument("--to", type=Path, default=None, help="Zieldatei für --restore.")
+    parser.add_argument("--keep", type=int, default=db_snapshot.DEFAULT_KEEP, help="Anzahl der aufbewahrten Snapshots.")
+    parser.add_argument("--pages-per-step", type=int, default=db_snapshot.DEFAULT_PAGES_PER_STEP,
+                        help="Seiten pro Kopierschritt.")
+    parser.add_argument("--step-sleep-ms", type=float, default=db_snapshot.DEFAULT_STEP_SLEEP * 1000,
+                        help="Pause zwischen zwei Kopierschritten in Millisekunden.")
+    parser.add_argument("--db", type=Path, default=None, help="Pfad zur Datenbank (Standard: Server-Datenbank).")
+    parser.add_argument("--snapshot-dir", type=Path, default=None, help="Ordner der Snapshots.")
+    args = parser.parse_args()
+
+    if args.restore:
+        if not args.to:
+            parser.error("--restore benötigt --to")
+        if args.to.exists():
+            parser.error(f"Zieldatei '{args.to}' existiert bereits.")
+        db_snapshot.restore_snapshot(args.restore, args.to)
+        print(f"Snapshot '{args.restore.name}' nach '{args.to}' entpackt, Prüfsumme in Ordnung.")
+        return
+
+    db_manager = DatabaseManager(args.db, snapshot_dir=args.snapshot_dir)
+    try:
+        if args.list:
+            for manifest in db_manager.list_snapshots():
+                counts = ", ".join(f"{table}={count}" for table, count in manifest["row_counts"].items())
+                print(f"{manifest['file']}: {manifest['compressed_bytes']} Bytes, Schema v{manifest['schema_version']}, {counts}")
+            return
+
+        if not db_manager.db_path.exists():
+            print(f"Datenbank '{db_manager.db_path}' nicht gefunden.")
+            sys.exit(1)
+        manifest = db_manager.create_snapshot(args.pages_per_step, args.step_sleep_ms / 1000, args.keep)
+        if manifest is None:
+            print("Snapshot fehlgeschlagen, Details im Log.")
+            sys.exit(1)
+        backup = manifest["backup"]
+        print(f"Snapshot erstellt: {db_manager.snapshot_dir / manifest['file']}")
+        print(f"  {manifest['size_bytes']} Bytes -> {manifest['compressed_bytes']} Bytes komprimiert, "
+              f"{backup['steps']} Schritte in {backup['seconds']}s, Integrität: {manifest['integrity']}")
+        for name in manifest.get("pruned", []):
+            print(f"  Alter Snapshot gelöscht: {name}")
+    finally:
+        db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# test_suite_archive.py
+# -*- coding: utf-8 -*-
+
+"""
+Prüft die Archivierung alter Events in die Archivdateien pro Welt:
+  - nur Events außerhalb des jüngsten Fensters werden verschoben,
+  - Export (Story-Events) und Training (bewertete Events) lesen Haupt- und
+    Archivdatenbank gemeinsam und liefern dieselben Events wie vorher,
+  - die Zugabfragen laufen danach nur noch gegen die kleine Hauptdatenbank,
+  - neu berechnete Welt-Statistiken zählen die archivierten Events mit,
+  - die Volltextsuche findet mit include_archive auch archivierte Events (eigener
+    Index je Archiv), bleibt in ihrer Welt und meldet Doppelte nur einmal,
+  - ein wiederholter Lauf (z.B. nach einem Abbruch) verdoppelt nichts und hält
+    den Archivindex konsistent,
+  - ein älterer Volltextindex ohne Welt-Spalte wird beim Start ersetzt.
+Benötigt kein Modell und keinen laufenden Dienst.
+"""
+
+import logging
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from class_folder.core.database_manager import DatabaseManager
+from class_folder.core import event_archive
+from class_folder.core.db_migrations import FULLTEXT_TABLE
+
+# --- KONFIGURATION ---
+EVENTS_PER_WORLD = 400
+KEEP_RECENT = 100
+
+
+def seed_world(db: DatabaseManager, name: str) -> int:
+    ids = db.create_world_and_player(name, "Lore", "system_fantasy", 1, "Held", "Hintergrund",
+                                     {"Stärke": 12}, "Marktplatz", "Ein belebter Platz.", {"health": 100})
+    for i in range(EVENTS_PER_WORLD):
+        db.save_event(ids["world_id"], ids["player_id"], f"{name}: Aktion {i}", f"Antwort {i}", [], [])
+    return ids["world_id"]
+
+
+def snapshot(db: DatabaseManager, world_id: int) -> dict:
+    return {
+        "story": [e["event_id"] for e in db.iter_story_events_for_world(world_id, page_size=64, include_archive=True)],
+        "training": [e["event_id"] for e in db.iter_events_for_review("gut (Training)", world_id, page_size=64,
+                                                                     include_archive=True)],
+        "count": db.count_story_events(world_id, include_archive=True),
+        "last_events": db.get_last_events(world_id, limit=3),
+        "stats": db.get_world_statistics(world_id),
+    }
+
+
+def search_ids(db: DatabaseManager, world_id: int, query: str, **options) -> list:
+    return [hit["event_id"] for hit in db.search_events(world_id, query, limit=50, match_all=True, **options)]
+
+
+def archive_index_ok(db: DatabaseManager, world_id: int) -> bool:
+    """FTS5-Integritätsprüfung des Archivindex (schlägt fehl, wenn Index und Archivtabelle abweichen)."""
+    conn = db._get_connection()
+    with event_archive.attached_archive(conn, event_archive.archive_path(db.archive_dir, world_id)):
+        try:
+            conn.execute(f"INSERT INTO {event_archive.ARCHIVE_SCHEMA}.{FULLTEXT_TABLE} ({FULLTEXT_TABLE}, rank) "
+                         f"VALUES ('integrity-check', 1)")
+            return True
+        except sqlite3.DatabaseError:
+            return False
+
+
+def check_legacy_fulltext(tmp_dir: str) -> bool:
+    """Ein Index im alten Format (ohne world_id) wird beim nächsten Start ersetzt und neu gefüllt."""
+    path = Path(tmp_dir) / "legacy.db"
+    db = DatabaseManager(path)
+    db.setup_database()
+    world_id = seed_world(db, "Altwelt")
+    db.close_connection()
+    conn = sqlite3.connect(path)
+    for trigger in ("events_fts_insert", "events_fts_delete", "events_fts_update"):
+        conn.execute(f"DROP TRIGGER {trigger}")
+    conn.execute(f"DROP TABLE {FULLTEXT_TABLE}")
+    conn.execute(f"CREATE VIRTUAL TABLE {FULLTEXT_TABLE} USING fts5(player_input, ai_output, "
+                 f"content='events', content_rowid='event_id', tokenize='unicode61 remove_diacritics 2')")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(path)
+    db.setup_database()
+    columns = [row[1] for row in db._get_connection().execute(f"PRAGMA table_info({FULLTEXT_TABLE})")]
+    found = search_ids(db, world_id, "altwelt aktion 399")
+    db.close_connection()
+    return "world_id" in columns and len(found) == 1
+
+
+def run_checks() -> bool:
+    logging.disable(logging.INFO)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(Path(tmp_dir) / "archive_test.db")
+        db.setup_database()
+        world_ids = [seed_world(db, "Nordwelt"), seed_world(db, "Südwelt")]
+        for world_id in world_ids:
+            for event in db.get_story_events_for_world(world_id)[::7]:
+                db.update_event_quality(event["event_id"], "gut (Training)")
+        before = {world_id: snapshot(db, world_id) for world_id in world_ids}
+
+        print("\n" + "=" * 60)
+        print(" " * 14 + "ARCHIVIERUNG ALTER EVENTS (HEISS/KALT)")
+        print("=" * 60)
+
+        dry_run = db.archive_world_events(world_ids[0], keep_recent=KEEP_RECENT, dry_run=True)
+        results.append(("Probelauf zählt, verschiebt aber nichts",
+                        dry_run["candidates"] == EVENTS_PER_WORLD - KEEP_RECENT and dry_run["archived"] == 0
+                        and not Path(dry_run["archive_path"]).exists()))
+
+        reports = db.archive_all_worlds(keep_recent=KEEP_RECENT, batch_size=64)
+        results.append(("Nur Events außerhalb des jüngsten Fensters verschoben",
+                        all(r["archived"] == EVENTS_PER_WORLD - KEEP_RECENT for r in reports)))
+        hot_counts = [db.count_story_events(world_id) for world_id in world_ids]
+        results.append(("Hauptdatenbank hält nur noch das Fenster", hot_counts == [KEEP_RECENT] * len(world_ids)))
+
+        after = {world_id: snapshot(db, world_id) for world_id in world_ids}
+        results.append(("Export und Training lesen das Archiv mit",
+                        all(after[w][key] == before[w][key] for w in world_ids
+                            for key in ("story", "training", "count", "last_events"))))
+
+        db.rebuild_world_stats()
+        rebuilt = {world_id: db.get_world_statistics(world_id) for world_id in world_ids}
+        results.append(("Neu berechnete Statistik zählt archivierte Events",
+                        all(rebuilt[w]["total_events"] == before[w]["stats"]["total_events"] for w in world_ids)))
+
+        # Volltextsuche: "Aktion 12" und "Aktion 120"-"129" liegen alle im Archiv
+        archived_hits = search_ids(db, world_ids[0], "nordwelt aktion 12", include_archive=True)
+        results.append(("Suche ohne Archiv nur im aktiven Fenster", search_ids(db, world_ids[0], "nordwelt aktion 12") == []))
+        results.append(("Suche findet archivierte Events", len(archived_hits) == 11
+                        and search_ids(db, world_ids[1], "nordwelt", include_archive=True) == []))
+
+        # Abbruch simulieren: ein Event steht in beiden Dateien; der nächste Lauf räumt auf
+        world_id = world_ids[0]
+        path = event_archive.archive_path(db.archive_dir, world_id)
+        conn = db._get_connection()
+        with event_archive.attached_archive(conn, path):
+            conn.execute("INSERT INTO archive.events (event_id, world_id, player_input) "
+                         "SELECT event_id, world_id, player_input FROM main.events WHERE world_id = ? "
+                         "ORDER BY event_id LIMIT 1", (world_id,))
+            conn.commit()
+        first_hot = EVENTS_PER_WORLD - KEEP_RECENT
+        duplicate_query = f"nordwelt aktion {first_hot}"
+        results.append(("Doppelte Events werden beim Lesen ausgeblendet",
+                        snapshot(db, world_id)["story"] == before[world_id]["story"]
+                        and len(search_ids(db, world_id, duplicate_query, include_archive=True)) == 1))
+        db.archive_world_events(world_id, keep_recent=KEEP_RECENT - 1)
+        results.append(("Wiederholter Lauf verdoppelt nichts",
+                        snapshot(db, world_id)["story"] == before[world_id]["story"]
+                        and len(search_ids(db, world_id, duplicate_query, include_archive=True)) == 1
+                        and archive_index_ok(db, world_id)))
+        db.close_connection()
+
+        results.append(("Alter Volltextindex wird ersetzt", check_legacy_fulltext(tmp_dir)))
+
+    for name, ok in results:
+        print(f"  {'✅' if ok else '❌'} {name}")
+    all_ok = all(ok for _, ok in results)
+    print("=" * 60 + "\n")
+    return all_ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
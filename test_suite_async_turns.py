@@ -0,0 +1,134 @@
+# test_suite_async_turns.py
+# -*- coding: utf-8 -*-
+
+"""
+Prüft, dass ein Spielzug im Online-Modus den Event-Loop nicht blockiert: Laden der
+Sitzung, Prompt-Aufbau und die Schreibtransaktion des Zuges laufen im Thread-Pool
+(AsyncDatabaseManager.run_in_worker). Hält eine andere Verbindung die Schreibsperre,
+wartet nur der Zug, während andere Coroutinen weiterlaufen.
+Außerdem: ein geteilter Speicher wird beim Schließen genau einmal geschlossen.
+Benötigt kein Modell und keinen laufenden Dienst.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from class_folder.core.database_manager import DatabaseManager
+from class_folder.core.async_database import AsyncDatabaseManager
+from class_folder.game_logic.game_manager_online import GameManagerOnline
+from class_folder.game_logic.session_pool import GameSessionPool
+
+# --- KONFIGURATION ---
+LOCK_HOLD_SECONDS = 0.6
+HEARTBEAT_SECONDS = 0.01
+MAX_LOOP_STALL_SECONDS = 0.2   # längste erlaubte Pause des Event-Loops während des Zuges
+
+
+class CountingDatabaseManager(DatabaseManager):
+    """Zählt die Aufrufe von close_connection und die Threads, die den Spielstand laden."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.close_calls = 0
+        self.load_threads = []
+
+    def load_scene_snapshot(self, world_id, player_id):
+        self.load_threads.append(threading.current_thread().name)
+        return super().load_scene_snapshot(world_id, player_id)
+
+    def close_connection(self):
+        self.close_calls += 1
+        super().close_connection()
+
+
+async def fake_ai(prompt: str, world_name: str, adapter_type: str) -> str:
+    await asyncio.sleep(0)
+    return "[]" if adapter_type == "ANALYSIS" else "Der Wind streicht über die Felder."
+
+
+def hold_write_lock(db_path: Path, ready: threading.Event):
+    conn = sqlite3.connect(db_path)
+    conn.execute("BEGIN IMMEDIATE")
+    ready.set()
+    time.sleep(LOCK_HOLD_SECONDS)
+    conn.rollback()
+    conn.close()
+
+
+async def heartbeat(stop: asyncio.Event, gaps: list):
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        now = time.perf_counter()
+        gaps.append(now - last - HEARTBEAT_SECONDS)
+        last = now
+
+
+async def play_turn_behind_lock(pool: GameSessionPool, db: DatabaseManager, ids) -> dict:
+    game_manager = await pool.get_session(ids["world_id"], ids["player_id"])
+    ready = threading.Event()
+    holder = threading.Thread(target=hold_write_lock, args=(db.db_path, ready))
+    holder.start()
+    await asyncio.to_thread(ready.wait)
+
+    stop, gaps = asyncio.Event(), []
+    beat = asyncio.create_task(heartbeat(stop, gaps))
+    started_at = time.perf_counter()
+    response = await game_manager.process_player_command("Ich schaue mich um.")
+    turn_seconds = time.perf_counter() - started_at
+    stop.set()
+    await beat
+    await asyncio.to_thread(holder.join)
+    return {"response": response, "turn_seconds": turn_seconds, "max_gap": max(gaps) if gaps else 0.0,
+            "same_session": await pool.get_session(ids["world_id"], ids["player_id"]) is game_manager}
+
+
+def run_checks() -> bool:
+    logging.disable(logging.WARNING)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = CountingDatabaseManager(Path(tmp_dir) / "turns.db")
+        db.setup_database()
+        ids = db.create_world_and_player("Schleifenwelt", "lore", "system_fantasy", 1, "Held", "bs",
+                                         {"Stärke": 12}, "Feld", "desc", {"health": 100})
+        async_db = AsyncDatabaseManager(max_workers=2, storage=db)
+        pool = GameSessionPool(lambda: GameManagerOnline(fake_ai, db_manager=db, async_db=async_db))
+        outcome = asyncio.run(play_turn_behind_lock(pool, db, ids))
+        events = db.get_last_events(ids["world_id"], limit=1)
+        methods = async_db.get_stats()["methods"]
+
+        print("\n" + "=" * 78)
+        print(" " * 22 + "SPIELZUG OHNE BLOCKIERTEN EVENT-LOOP")
+        print("=" * 78)
+        print(f"  Zug hinter gesperrter Datenbank: {outcome['turn_seconds'] * 1000:.0f} ms, "
+              f"längste Pause des Event-Loops {outcome['max_gap'] * 1000:.1f} ms")
+        print(f"  Aufträge im Thread-Pool: {', '.join(sorted(methods))}")
+        results.append(("Zug wartet auf die Sperre", outcome["turn_seconds"] >= LOCK_HOLD_SECONDS * 0.5))
+        results.append(("Event-Loop läuft währenddessen weiter", outcome["max_gap"] < MAX_LOOP_STALL_SECONDS))
+        results.append(("Ereignis gespeichert", outcome["response"].get("event_type") == "STORY"
+                        and events == [("Ich schaue mich um.", "Der Wind streicht über die Felder.")]))
+        results.append(("Laden, Prompt und Transaktion im Pool", {"load_game_state", "build_creative_prompt",
+                                                                 "commit_turn"} <= set(methods)
+                        and all(name.startswith("db-worker") for name in db.load_threads)))
+        results.append(("Sitzung wiederverwendet", outcome["same_session"] and len(db.load_threads) == 1))
+
+        async_db.close()
+        results.append(("Geteilter Speicher einmal geschlossen", db.close_calls == 1))
+
+    for name, ok in results:
+        print(f"  {name:<44} {'✅' if ok else '❌'}")
+    print("=" * 78 + "\n")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
@@ -0,0 +1,122 @@
+# test_suite_bulk_import.py
+# -*- coding: utf-8 -*-
+
+"""
+Vergleicht den Import von JSONL-Batch-Dateien auf drei Wegen:
+  - Zeilenweise: ein execute und eine rowcount-Prüfung pro Zeile (alter Weg)
+  - Blockweise:  executemany in Transaktionen zu je CHUNK_SIZE Zeilen
+  - Blockweise ohne Indizes: Indizes vorher entfernen, danach neu aufbauen
+Zuerst wird geprüft, dass alle Wege dieselben Events importieren und Duplikate
+sowie fehlerhafte Zeilen gleich behandeln, danach wird der Durchsatz gemessen.
+Benötigt kein Modell und keinen laufenden Dienst.
+"""
+
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from class_folder.core.database_manager import DatabaseManager
+from class_folder.core.bulk_import import ImportReport
+
+# --- KONFIGURATION ---
+ROWS = 50000
+CHUNK_SIZE = 5000
+MALFORMED_EVERY = 1000   # Jede n-te Zeile ist fehlerhaft
+
+
+def write_batch_file(path: Path, rows: int, first_event_id: int = 1):
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(rows):
+            if i % MALFORMED_EVERY == MALFORMED_EVERY - 1:
+                f.write("{kein gültiges json\n")
+                continue
+            event = {"event_id": first_event_id + i, "player_input": f"Ich gehe nach Norden ({i}).",
+                     "ai_output": "Der Weg führt dich durch einen dunklen Wald. " * 5}
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+def import_line_by_line(db: DatabaseManager, world_id: int, file_path: Path) -> ImportReport:
+    """Der alte Weg, zum Vergleich nachgebaut."""
+    report = ImportReport(file_path.name)
+    started_at = time.perf_counter()
+    conn = db._get_connection()
+    cursor = conn.cursor()
+    with file_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+                cursor.execute(
+                    "INSERT OR IGNORE INTO events (event_id, world_id, player_input, ai_output, quality_label) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (event['event_id'], world_id, event['player_input'], event['ai_output'],
+                     event.get('quality_label', 'gut (Training)'))
+                )
+                report.rows_read += 1
+                if cursor.rowcount > 0:
+                    report.inserted += 1
+            except (json.JSONDecodeError, KeyError):
+                report.skipped_lines += 1
+    conn.commit()
+    report.seconds = time.perf_counter() - started_at
+    return report
+
+
+def fresh_database(tmp_dir: str, name: str):
+    db = DatabaseManager(Path(tmp_dir) / f"{name}.db")
+    db.setup_database()
+    world_id = db.get_or_create_world("Importwelt")
+    return db, world_id
+
+
+def event_fingerprint(db: DatabaseManager):
+    return db._get_connection().execute(
+        "SELECT COUNT(*), SUM(event_id), SUM(LENGTH(ai_output)) FROM events").fetchone()[:]
+
+
+def run_benchmark() -> bool:
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        batch_file = Path(tmp_dir) / "batch.jsonl"
+        write_batch_file(batch_file, ROWS)
+
+        runs = {
+            "Zeilenweise (alt)": lambda db, wid: import_line_by_line(db, wid, batch_file),
+            "Blockweise": lambda db, wid: db.bulk_import_events_from_jsonl(wid, batch_file, CHUNK_SIZE),
+            "Blockweise ohne Indizes": lambda db, wid: db.bulk_import_events_from_jsonl(
+                wid, batch_file, CHUNK_SIZE, rebuild_indexes=True),
+        }
+
+        print("\n" + "=" * 78)
+        print(" " * 18 + f"JSONL-IMPORT: {ROWS} ZEILEN, BLOCKGRÖSSE {CHUNK_SIZE}")
+        print("=" * 78)
+        print(f"  {'Weg':<26} | {'neu':>6} | {'doppelt':>7} | {'übersprungen':>12} | {'Zeit':>7} | {'Zeilen/s':>9}")
+        print("  " + "-" * 76)
+
+        fingerprints, all_ok = [], True
+        for name, run in runs.items():
+            db, world_id = fresh_database(tmp_dir, name.replace(" ", "_"))
+            report = run(db, world_id)
+            # Zweiter Durchlauf: alle Zeilen sind Duplikate
+            repeat = run(db, world_id)
+            fingerprints.append(event_fingerprint(db))
+            all_ok &= report.error is None and repeat.inserted == 0 and repeat.duplicates == report.rows_read
+            print(f"  {name:<26} | {report.inserted:>6} | {report.duplicates:>7} | {report.skipped_lines:>12} | "
+                  f"{report.seconds:>6.2f}s | {report.rows_per_second:>9.0f}")
+            db.close_connection()
+
+        same_result = all(fp == fingerprints[0] for fp in fingerprints)
+        all_ok &= same_result
+        print(f"\n  Gleiche Events auf allen Wegen: {'✅' if same_result else '❌'}")
+        print(f"  Duplikate beim zweiten Import erkannt: {'✅' if all_ok else '❌'}")
+    print("=" * 78 + "\n")
+    return all_ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
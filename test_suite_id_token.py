@@ -0,0 +1,146 @@
+# test_suite_id_token.py
+# -*- coding: utf-8 -*-
+
+"""
+Prüft den Zwischenspeicher für ID-Tokens (class_folder/core/id_token_provider.py)
+offline mit dem FakeIdTokenIssuer: Wiederverwendung, Erneuerung im Hintergrund
+vor Ablauf, Abruf nach Ablauf und Verwerfen nach einer 401-Antwort. `invalidate`
+darf dabei nicht auf einen laufenden Abruf warten, weil es aus dem Event-Loop kommt.
+Der CloudInferenceService verwirft ein abgelehntes Token und wiederholt genau einmal.
+Benötigt kein Netzwerk und keine Google-Credentials.
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import requests
+
+from class_folder.core.id_token_provider import IdTokenProvider, FakeIdTokenIssuer, _decode_expiry
+from class_folder.core.cloud_inference_service import CloudInferenceService
+
+# --- KONFIGURATION ---
+AUDIENCE = "https://ki-dienst.example"
+CLOUD_URL = "https://ki-dienst-abc123.a.run.app"
+SLOW_FETCH_SECONDS = 0.4
+MAX_INVALIDATE_SECONDS = 0.05
+
+
+class SlowIssuer(FakeIdTokenIssuer):
+    """Wie der Fake-Aussteller, braucht aber für jeden Abruf eine Weile (wie ein Netzwerk-Roundtrip)."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+
+    def __call__(self, audience: str) -> str:
+        self.started.set()
+        time.sleep(SLOW_FETCH_SECONDS)
+        return super().__call__(audience)
+
+
+class RejectingSession:
+    """Ersatz für requests.Session: lehnt die ersten `rejections` Anfragen mit 401 ab."""
+
+    def __init__(self, rejections: int):
+        self.rejections = rejections
+        self.tokens = []
+
+    def request(self, method: str, url: str, headers=None, **kwargs) -> requests.Response:
+        self.tokens.append(headers.get("Authorization"))
+        response = requests.Response()
+        response.url = url
+        response.status_code = 401 if len(self.tokens) <= self.rejections else 200
+        response._content = json.dumps({"generated_text": "Der Nebel lichtet sich."}).encode()
+        return response
+
+    def close(self):
+        pass
+
+
+def check_cloud_retry(rejections: int):
+    """Gibt (Antwort oder None, gesendete Tokens, ausgestellte Tokens) zurück."""
+    issuer = FakeIdTokenIssuer(lifetime_seconds=3600)
+    service = CloudInferenceService(CLOUD_URL)
+    service.token_provider = IdTokenProvider(CLOUD_URL, fetcher=issuer)
+    service.session = RejectingSession(rejections)
+    try:
+        text = service.generate_text("Hallo")
+    except Exception:
+        text = None
+    return text, service.session.tokens, issuer.issued_count
+
+
+def run_checks() -> bool:
+    logging.disable(logging.WARNING)
+    results = []
+
+    issuer = FakeIdTokenIssuer(lifetime_seconds=3600)
+    provider = IdTokenProvider(AUDIENCE, fetcher=issuer)
+    first = provider.get_token()
+    second = provider.get_token()
+    results.append(("Token wird wiederverwendet", first == second and issuer.issued_count == 1
+                    and provider.stats["cache_hits"] == 1))
+    results.append(("Ablaufzeit aus dem Token", abs(_decode_expiry(first) - time.time() - 3600) < 5))
+    results.append(("Asynchroner Zugriff aus dem Cache", asyncio.run(provider.get_token_async()) == first))
+
+    # Innerhalb der Erneuerungsspanne: altes Token sofort, neues im Hintergrund
+    refreshing = IdTokenProvider(AUDIENCE, fetcher=FakeIdTokenIssuer(lifetime_seconds=3600),
+                                 refresh_margin_seconds=4000)
+    old = refreshing.get_token()
+    refreshing.get_token()
+    served_from_cache = refreshing.stats["cache_hits"] == 1 and refreshing._background_refresh is not None
+    refreshing._background_refresh.join(timeout=5)
+    results.append(("Erneuerung im Hintergrund", served_from_cache and refreshing.stats["background_refreshes"] >= 1
+                    and refreshing._token != old))
+
+    # Kürzer gültig als der Sicherheitsabstand: jedes Token gilt sofort als abgelaufen
+    expiring_issuer = FakeIdTokenIssuer(lifetime_seconds=20)
+    expiring = IdTokenProvider(AUDIENCE, fetcher=expiring_issuer, expiry_safety_seconds=30)
+    expiring.get_token()
+    expiring.get_token()
+    results.append(("Abgelaufenes Token wird neu geholt", expiring_issuer.issued_count == 2))
+
+    provider.invalidate()
+    results.append(("Nach invalidate neues Token", provider.get_token() != first and issuer.issued_count == 2))
+
+    # invalidate während eines laufenden Abrufs (der Abruf hält den Lock)
+    slow_issuer = SlowIssuer()
+    slow = IdTokenProvider(AUDIENCE, fetcher=slow_issuer)
+    slow.prefetch()
+    slow_issuer.started.wait(timeout=5)
+    started_at = time.perf_counter()
+    slow.invalidate()
+    invalidate_seconds = time.perf_counter() - started_at
+    slow._background_refresh.join(timeout=5)
+    results.append(("invalidate wartet nicht auf den Abruf", invalidate_seconds < MAX_INVALIDATE_SECONDS))
+    results.append(("Verworfener Abruf wird nicht verwendet", not slow.get_stats()["has_token"]))
+    slow.get_token()
+    results.append(("Danach wird neu geholt", slow_issuer.issued_count == 2 and slow.get_stats()["has_token"]))
+
+    # Cloud-Dienst: abgelehntes Token verwerfen, einmal mit neuem Token wiederholen
+    text, tokens, issued = check_cloud_retry(rejections=1)
+    results.append(("401: neues Token, einmal wiederholt", text == "Der Nebel lichtet sich." and issued == 2
+                    and len(tokens) == 2 and tokens[0] != tokens[1]))
+    text, tokens, issued = check_cloud_retry(rejections=5)
+    results.append(("Wiederholte 401: kein zweiter Versuch", text is None and len(tokens) == 2))
+
+    print("\n" + "=" * 78)
+    print(" " * 26 + "ID-TOKEN-ZWISCHENSPEICHER")
+    print("=" * 78)
+    print(f"  invalidate während eines Abrufs ({SLOW_FETCH_SECONDS * 1000:.0f} ms): {invalidate_seconds * 1000:.2f} ms")
+    for name, ok in results:
+        print(f"  {name:<44} {'✅' if ok else '❌'}")
+    print("=" * 78 + "\n")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
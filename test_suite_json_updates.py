@@ -0,0 +1,115 @@
+# test_suite_json_updates.py
+# -*- coding: utf-8 -*-
+
+"""
+Vergleicht die Aktualisierung der JSON-Spalten von Charakteren auf zwei Wegen:
+  - Python: Spalte lesen, dekodieren, ändern, kodieren, zurückschreiben (alter Weg)
+  - JSON1:  eine einzige UPDATE-Anweisung mit json_set/json_insert/json_remove
+Zuerst wird geprüft, dass beide Wege dasselbe Ergebnis liefern, danach werden
+update_character_state, update_npc_state und update_character_inventory auf
+Charakteren mit großen Zustandsobjekten gemessen.
+Benötigt kein Modell und keinen laufenden Dienst.
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from class_folder.core.database_manager import DatabaseManager
+
+# --- KONFIGURATION ---
+STATE_SIZES = [10, 200, 2000]   # Anzahl der Schlüssel im Zustand
+INVENTORY_SIZE = 500
+ITERATIONS = 300
+
+
+def build_state(size: int) -> Dict[str, Any]:
+    state = {f"eigenschaft_{i}": {"wert": i, "beschreibung": "x" * 40, "tags": ["a", "b", "c"]} for i in range(size)}
+    state["notes"] = [f"Notiz {i}" for i in range(20)]
+    return state
+
+
+def create_character(db: DatabaseManager, world_id: int, state: Dict[str, Any]) -> int:
+    npc_id = db.create_npc(world_id, f"NSC {time.perf_counter_ns()}", "Ein Testcharakter.", state)
+    for i in range(INVENTORY_SIZE):
+        db.update_character_inventory(npc_id, "ADD", f"Gegenstand {i}")
+    return npc_id
+
+
+def apply_sample_updates(db: DatabaseManager, char_id: int):
+    db.update_character_state(char_id, {"status": "verletzt", "eigenschaft_1": {"wert": -1}, "neu": [1, 2]})
+    db.update_npc_state(char_id, {"stimmung": "misstrauisch", "notes_add": "Hat den Spieler bestohlen"})
+    db.update_npc_state(char_id, {"notes_add": "Hat den Spieler bestohlen"})  # Duplikat wird ignoriert
+    db.update_npc_state(char_id, {"notes_add": "Grüßt höflich"})
+    db.update_character_inventory(char_id, "ADD", "Schwert")
+    db.update_character_inventory(char_id, "REMOVE", "Gegenstand 3")
+    db.update_character_inventory(char_id, "REMOVE", "Gibt es nicht")
+
+
+def check_equivalence(db: DatabaseManager, world_id: int) -> bool:
+    """Beide Wege müssen für dieselben Änderungen denselben Zustand ergeben."""
+    results = []
+    for use_json1 in (False, True):
+        db._json1 = use_json1
+        char_id = create_character(db, world_id, build_state(10))
+        apply_sample_updates(db, char_id)
+        info = db.get_full_character_info(char_id)
+        results.append((info["state"], info["inventory"]))
+    db._json1 = None
+    return results[0] == results[1]
+
+
+def measure(db: DatabaseManager, use_json1: bool, char_id: int, update: Callable[[int, int], None]) -> float:
+    db._json1 = use_json1
+    started_at = time.perf_counter()
+    for i in range(ITERATIONS):
+        update(char_id, i)
+    db._json1 = None
+    return (time.perf_counter() - started_at) / ITERATIONS * 1000
+
+
+def run_benchmark() -> bool:
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(Path(tmp_dir) / "json_updates.db")
+        db.setup_database()
+        ids = db.create_world_and_player("Benchmarkwelt", "Lore", "system_fantasy", 1, "Held", "Hintergrund",
+                                         {"Stärke": 12}, "Marktplatz", "Ein belebter Platz.", {"health": 100})
+        world_id = ids["world_id"]
+
+        print("\n" + "=" * 70)
+        print(" " * 14 + "JSON-SPALTEN: PYTHON-WEG VS. JSON1 (ms pro Aufruf)")
+        print("=" * 70)
+        equivalent = check_equivalence(db, world_id)
+        print(f"  Gleiches Ergebnis auf beiden Wegen: {'✅' if equivalent else '❌'}")
+        print(f"  JSON1 verfügbar: {db._json1_supported(db._get_connection())}\n")
+
+        updates = {
+            "update_character_state": lambda cid, i: db.update_character_state(cid, {"status": f"runde {i}"}),
+            "update_npc_state": lambda cid, i: db.update_npc_state(cid, {"stimmung": i, "notes_add": f"Notiz {i % 50}"}),
+            "update_character_inventory": lambda cid, i: db.update_character_inventory(
+                cid, "ADD" if i % 2 == 0 else "REMOVE", "Fackel"),
+        }
+        print(f"  {'Methode':<28} | {'Schlüssel':>9} | {'Python':>8} | {'JSON1':>8} | {'Faktor':>6}")
+        print("  " + "-" * 68)
+        for size in STATE_SIZES:
+            for name, update in updates.items():
+                timings = {}
+                for use_json1 in (False, True):
+                    char_id = create_character(db, world_id, build_state(size))
+                    timings[use_json1] = measure(db, use_json1, char_id, update)
+                factor = timings[False] / timings[True] if timings[True] else 0.0
+                print(f"  {name:<28} | {size:>9} | {timings[False]:>8.3f} | {timings[True]:>8.3f} | {factor:>5.1f}x")
+        db.close_connection()
+    print("=" * 70 + "\n")
+    return equivalent
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
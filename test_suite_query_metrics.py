@@ -0,0 +1,136 @@
+# test_suite_query_metrics.py
+# -*- coding: utf-8 -*-
+
+"""
+Prüft die Messung der SQL-Anweisungen (class_folder/core/query_metrics.py):
+Zuordnung zur aufrufenden DatabaseManager-Methode, Zeilenzahlen, Wartezeit auf
+die Schreibsperre, das Slow-Query-Log mit Plan, das Prometheus-Format und den
+Mehraufwand gegenüber ungemessenen Verbindungen.
+Benötigt kein Modell und keinen laufenden Dienst.
+"""
+
+import logging
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from class_folder.core.database_manager import DatabaseManager
+
+# --- KONFIGURATION ---
+EVENTS = 50
+LOCK_HOLD_SECONDS = 0.15
+OVERHEAD_CALLS = 2000
+MAX_OVERHEAD_US = 50     # Grenze für den Mehraufwand pro Methodenaufruf
+
+
+def create_game(db: DatabaseManager):
+    ids = db.create_world_and_player("Messwelt", "lore", "system_fantasy", 1, "Held", "bs",
+                                     {"Stärke": 12}, "Ort", "desc", {"health": 100})
+    for i in range(EVENTS):
+        db.save_event(ids["world_id"], ids["player_id"], f"Eingabe {i}", f"Antwort {i}", [], [])
+    return ids
+
+
+def hold_write_lock(db_path: Path, ready: threading.Event):
+    conn = sqlite3.connect(db_path)
+    conn.execute("BEGIN IMMEDIATE")
+    ready.set()
+    time.sleep(LOCK_HOLD_SECONDS)
+    conn.rollback()
+    conn.close()
+
+
+def measure_calls(db: DatabaseManager, char_id: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(OVERHEAD_CALLS):
+        db.get_full_character_info(char_id)
+    return (time.perf_counter() - started_at) / OVERHEAD_CALLS
+
+
+def run_checks() -> bool:
+    logging.disable(logging.WARNING)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(Path(tmp_dir) / "metrics.db", slow_query_ms=100)
+        db.setup_database()
+        ids = create_game(db)
+        metrics = db.query_metrics
+
+        metrics.reset()
+        last_events = db.get_last_events(ids["world_id"], 4)
+        info = db.get_full_character_info(ids["player_id"])
+        stats = metrics.get_stats()["methods"]
+        results.append(("Anweisungen der Methode zugeordnet", set(stats) == {"get_last_events", "get_full_character_info"}))
+        results.append(("Gelesene Zeilen gezählt", stats["get_last_events"]["rows"] == len(last_events) == 4
+                        and stats["get_full_character_info"]["rows"] == 1))
+        results.append(("Ergebnisse unverändert", info["state"] == {"health": 100}
+                        and last_events[-1] == (f"Eingabe {EVENTS - 1}", f"Antwort {EVENTS - 1}")))
+
+        # Ein zweiter Prozess (hier: Verbindung) hält die Schreibsperre
+        metrics.reset()
+        ready = threading.Event()
+        holder = threading.Thread(target=hold_write_lock, args=(db.db_path, ready))
+        holder.start()
+        ready.wait()
+        db.save_event(ids["world_id"], ids["player_id"], "warten", "gewartet", [], [])
+        holder.join()
+        save_stats = metrics.get_stats()["methods"]["save_event"]
+        slow = metrics.get_stats()["slow_queries"]
+        print("\n" + "=" * 78)
+        print(" " * 24 + "MESSUNG DER SQL-ANWEISUNGEN")
+        print("=" * 78)
+        print(f"  save_event hinter gesperrter Datenbank: Sperre {save_stats['lock_wait_ms']} ms, "
+              f"Anweisungen {save_stats['statements']}, max {save_stats['max_ms']} ms")
+        results.append(("Wartezeit auf die Sperre getrennt gemessen",
+                        save_stats["lock_waits"] == 1 and save_stats["lock_wait_ms"] >= LOCK_HOLD_SECONDS * 1000 * 0.6
+                        and save_stats["max_ms"] < LOCK_HOLD_SECONDS * 1000 * 0.6))
+        results.append(("Sperrwartezeit im Slow-Query-Log", any(entry["method"] == "save_event"
+                                                                 and entry["lock_wait_ms"] > 0 for entry in slow)))
+
+        metrics.reset()
+        metrics.slow_query_ms = 0  # jede Anweisung gilt als langsam
+        db.get_events_for_review_page("neutral", world_id=ids["world_id"], limit=10)
+        metrics.slow_query_ms = 100
+        entries = [entry for entry in metrics.get_stats()["slow_queries"]
+                   if entry["method"] == "get_events_for_review_page" and entry["sql"].startswith("SELECT")]
+        plan = entries[0]["plan"] if entries else []
+        for line in plan:
+            print(f"  Plan: {line}")
+        results.append(("Langsame Abfrage mit Plan protokolliert", bool(plan) and any("events" in line for line in plan)))
+
+        with db.unit_of_work():
+            db.update_character_state(ids["player_id"], {"mood": "froh"})
+        prometheus = metrics.to_prometheus()
+        count_line = next(line for line in prometheus.splitlines()
+                          if line.startswith('laststrawberry_db_statement_duration_seconds_count{method="unit_of_work"}'))
+        inf_line = next(line for line in prometheus.splitlines()
+                        if line.startswith('laststrawberry_db_statement_duration_seconds_bucket{method="unit_of_work",le="+Inf"}'))
+        results.append(("Prometheus-Histogramm vollständig", count_line.split()[-1] == inf_line.split()[-1] == "1"
+                        and 'laststrawberry_db_lock_wait_seconds_total{method="unit_of_work"}' in prometheus))
+
+        plain = DatabaseManager(db.db_path, instrument_queries=False)
+        measure_calls(db, ids["player_id"])
+        measure_calls(plain, ids["player_id"])
+        with_metrics = min(measure_calls(db, ids["player_id"]) for _ in range(3))
+        without_metrics = min(measure_calls(plain, ids["player_id"]) for _ in range(3))
+        overhead_us = (with_metrics - without_metrics) * 1e6
+        print(f"  get_full_character_info: {without_metrics * 1e6:.1f} µs ohne, {with_metrics * 1e6:.1f} µs mit Messung "
+              f"(+{overhead_us:.1f} µs)")
+        results.append(("Mehraufwand pro Aufruf gering", overhead_us <= MAX_OVERHEAD_US))
+        plain.close_connection()
+        db.close_connection()
+
+    for name, ok in results:
+        print(f"  {name:<44} {'✅' if ok else '❌'}")
+    print("=" * 78 + "\n")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
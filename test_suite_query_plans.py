@@ -0,0 +1,120 @@
+# test_suite_query_plans.py
+# -*- coding: utf-8 -*-
+
+"""
+Prüft mit EXPLAIN QUERY PLAN, dass die Abfragen eines Spielzugs Indizes benutzen.
+Die SQL-Anweisungen werden nicht kopiert, sondern beim Aufruf der echten
+DatabaseManager-Methoden mitgeschnitten (sqlite3 Trace-Callback) und
+anschließend erklärt. Ein vollständiger Tabellenscan ("SCAN <tabelle>") oder
+eine zusätzliche Sortierung ("USE TEMP B-TREE") gilt als Fehler.
+Benötigt kein Modell und keinen laufenden Dienst.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Any, Callable
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from class_folder.core.database_manager import DatabaseManager
+from class_folder.core.db_migrations import MIGRATIONS, get_schema_version
+
+# --- KONFIGURATION ---
+SCANNED_TABLES = ("events", "characters")
+
+
+def seed_database(db: DatabaseManager) -> Dict[str, int]:
+    """Legt eine kleine Welt mit NSCs und Events an."""
+    ids = db.create_world_and_player("Testwelt", "Lore", "system_fantasy", 1, "Held", "Hintergrund",
+                                     {"Stärke": 12}, "Marktplatz", "Ein belebter Platz.", {"health": 100})
+    for i in range(5):
+        db.create_npc(ids["world_id"], f"NSC {i}", "Ein Händler.", {"status": "neutral"})
+    for i in range(20):
+        db.save_event(ids["world_id"], ids["player_id"], f"Aktion {i}", f"Antwort {i}", [], [])
+    return ids
+
+
+def hot_path_calls(ids: Dict[str, int]) -> List[tuple]:
+    """(Name, Aufruf) der Abfragen, die pro Zug oder pro Anfrage laufen."""
+    world_id, player_id, location_id = ids["world_id"], ids["player_id"], ids["location_id"]
+    return [
+        ("get_last_events", lambda db: db.get_last_events(world_id, limit=3)),
+        ("get_npcs_at_location", lambda db: db.get_npcs_at_location(world_id, location_id)),
+        ("get_player_location", lambda db: db.get_player_location(world_id)),
+        ("get_events_for_review", lambda db: db.get_events_for_review(label="neutral", world_id=world_id)),
+        ("get_events_for_review_page (alle Welten)",
+         lambda db: db.get_events_for_review_page(label="neutral", after_event_id=5, limit=5)),
+        ("is_user_authorized_for_player", lambda db: db.is_user_authorized_for_player(1, player_id)),
+        ("get_last_event_with_npcs", lambda db: db.get_last_event_with_npcs(world_id)),
+        ("get_last_event_for_world_player", lambda db: db.get_last_event_for_world_player(world_id, player_id)),
+        ("get_story_events_for_world", lambda db: db.get_story_events_for_world(world_id)),
+        ("get_story_events_page", lambda db: db.get_story_events_page(world_id, after_event_id=5, limit=5)),
+        ("load_scene_snapshot", lambda db: db.load_scene_snapshot(world_id, player_id)),
+        ("search_events", lambda db: db.search_events(world_id, "Antwort", limit=5)),
+    ]
+
+
+def explain_call(db: DatabaseManager, call: Callable[[DatabaseManager], Any]) -> List[Dict[str, Any]]:
+    """Führt den Aufruf aus und liefert für jede SELECT-Anweisung deren Abfrageplan."""
+    conn = db._get_connection()
+    # Berichtsabfragen laufen über die schreibgeschützte Verbindung
+    traced = [conn, db._get_read_connection()]
+    statements: List[str] = []
+    for traced_conn in traced:
+        traced_conn.set_trace_callback(statements.append)
+    try:
+        call(db)
+    finally:
+        for traced_conn in traced:
+            traced_conn.set_trace_callback(None)
+
+    plans = []
+    for sql in statements:
+        if not sql.lstrip().upper().startswith("SELECT"):
+            continue
+        details = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()]
+        problems = [d for d in details
+                    if "TEMP B-TREE" in d
+                    or any(d == f"SCAN {table}" or d.startswith(f"SCAN {table} ") for table in SCANNED_TABLES)]
+        plans.append({"sql": " ".join(sql.split()), "plan": details, "problems": problems})
+    return plans
+
+
+def run_checks() -> bool:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(Path(tmp_dir) / "query_plans.db")
+        db.setup_database()
+        ids = seed_database(db)
+        version = get_schema_version(db._get_connection())
+
+        print("\n" + "=" * 60)
+        print(" " * 16 + "ABFRAGEPLÄNE DER SPIELZUG-ABFRAGEN")
+        print("=" * 60)
+        print(f"  Schema-Version: {version} (neueste Migration: {max(m[0] for m in MIGRATIONS)})\n")
+
+        all_ok = version == max(m[0] for m in MIGRATIONS)
+        for name, call in hot_path_calls(ids):
+            plans = explain_call(db, call)
+            ok = bool(plans) and not any(p["problems"] for p in plans)
+            all_ok &= ok
+            print(f"  {'✅' if ok else '❌'} {name}")
+            for p in plans:
+                for detail in p["plan"]:
+                    marker = "  <- Problem" if detail in p["problems"] else ""
+                    print(f"        {detail}{marker}")
+                if p["problems"]:
+                    print(f"        > SQL: {p['sql']}")
+            if not plans:
+                print("        > Keine SELECT-Anweisung mitgeschnitten.")
+        db.close_connection()
+
+    print("\n" + "=" * 60)
+    print(f"  Ergebnis: {'ALLE ABFRAGEN INDEXGESTÜTZT' if all_ok else 'FEHLER GEFUNDEN'}")
+    print("=" * 60 + "\n")
+    return all_ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
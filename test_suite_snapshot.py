@@ -0,0 +1,132 @@
+# test_suite_snapshot.py
+# -*- coding: utf-8 -*-
+
+"""
+Prüft die Online-Snapshots der Datenbank (class_folder/core/db_snapshot.py):
+Während ein Schreiber-Thread laufend Events speichert, wird ein Snapshot
+erstellt. Gemessen wird die längste Wartezeit eines Schreibzugriffs; danach
+wird geprüft, dass der Snapshot einen festen, vollständigen Stand enthält,
+das Manifest zu den Daten passt und eine beschädigte Datei erkannt wird.
+Benötigt kein Modell und keinen laufenden Dienst.
+"""
+
+import gzip
+import logging
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from class_folder.core.database_manager import DatabaseManager
+from class_folder.core import db_snapshot
+
+# --- KONFIGURATION ---
+EVENTS = 20000
+PAGES_PER_STEP = 64
+STEP_SLEEP = 0.002
+MAX_WRITER_WAIT_MS = 50   # Grenze für die längste Wartezeit eines Schreibzugriffs
+
+
+def fill_database(db: DatabaseManager) -> int:
+    ids = db.create_world_and_player("Snapshotwelt", "lore", "system_fantasy", 1, "Held", "bs",
+                                     {"Stärke": 12}, "Ort", "desc", {"health": 100})
+    conn = db._get_connection()
+    conn.executemany(
+        "INSERT INTO events (world_id, char_id, player_input, ai_output) VALUES (?, ?, ?, ?)",
+        [(ids["world_id"], ids["player_id"], f"Eingabe {i}", "Eine lange Antwort der Erzählung. " * 20)
+         for i in range(EVENTS)]
+    )
+    conn.commit()
+    return ids
+
+
+def run_checks() -> bool:
+    logging.disable(logging.WARNING)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(Path(tmp_dir) / "live.db")
+        db.setup_database()
+        ids = fill_database(db)
+
+        stop = threading.Event()
+        waits, written = [], []
+
+        def writer():
+            while not stop.is_set():
+                started_at = time.perf_counter()
+                db.save_event(ids["world_id"], ids["player_id"], "weiter", "Es geht weiter.", [], [])
+                waits.append(time.perf_counter() - started_at)
+                written.append(1)
+                time.sleep(0.001)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        time.sleep(0.05)
+        written_before = len(written)
+        manifest = db.create_snapshot(pages_per_step=PAGES_PER_STEP, step_sleep=STEP_SLEEP, keep=2)
+        written_during = len(written) - written_before
+        stop.set()
+        thread.join()
+
+        print("\n" + "=" * 78)
+        print(" " * 22 + f"ONLINE-SNAPSHOT MIT {EVENTS} EVENTS")
+        print("=" * 78)
+        if manifest is None:
+            print("  ❌ Snapshot fehlgeschlagen")
+            return False
+        backup = manifest["backup"]
+        max_wait_ms = max(waits) * 1000
+        print(f"  Schritte: {backup['steps']}, Neustarts: {backup['restarts']}, Dauer: {backup['seconds']}s, "
+              f"{manifest['size_bytes']} -> {manifest['compressed_bytes']} Bytes")
+        print(f"  Schreibzugriffe während der Kopie: {written_during}, längste Wartezeit: {max_wait_ms:.1f} ms")
+        results.append(("Schreiber nie länger blockiert", max_wait_ms <= MAX_WRITER_WAIT_MS and written_during > 0))
+        results.append(("Kopie ohne Neustart (fester Lesestand)", backup["restarts"] == 0 and backup["consistent_read"]))
+
+        snapshot_path = db.snapshot_dir / manifest["file"]
+        with db_snapshot.opened_snapshot(snapshot_path) as restored:
+            conn = sqlite3.connect(restored)
+            events = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            max_event_id = conn.execute("SELECT MAX(event_id) FROM events").fetchone()[0]
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            conn.close()
+        results.append(("Manifest passt zum Inhalt", events == manifest["row_counts"]["events"]
+                        and max_event_id == manifest["max_event_id"] and manifest["integrity"] == "ok"))
+        results.append(("Snapshot ist eigenständige Datei", journal_mode == "delete"))
+        results.append(("Stand liegt zwischen Start und Ende",
+                        EVENTS + written_before <= events <= EVENTS + written_before + written_during))
+
+        # Beschädigter Snapshot: gleiche Länge, ein anderes Byte
+        with gzip.open(snapshot_path, "rb") as f:
+            data = bytearray(f.read())
+        data[len(data) // 2] ^= 0xFF
+        with gzip.open(snapshot_path, "wb") as f:
+            f.write(bytes(data))
+        try:
+            db_snapshot.restore_snapshot(snapshot_path, Path(tmp_dir) / "kaputt.db")
+            detected = False
+        except ValueError:
+            detected = not (Path(tmp_dir) / "kaputt.db").exists()
+        results.append(("Beschädigung erkannt", detected))
+
+        # Direkt nacheinander, also meist in derselben Sekunde: keiner darf den anderen überschreiben
+        quick = [db.create_snapshot(keep=None)["file"] for _ in range(2)]
+        results.append(("Snapshots derselben Sekunde getrennt", len(set(quick)) == 2
+                        and {m["file"] for m in db.list_snapshots()} >= set(quick)))
+        db.create_snapshot(keep=2)
+        newest = [m["file"] for m in db.list_snapshots()]
+        results.append(("Nur die neuesten Snapshots bleiben", len(newest) == 2 and newest[1] == quick[1]))
+        db.close_connection()
+
+    for name, ok in results:
+        print(f"  {name:<44} {'✅' if ok else '❌'}")
+    print("=" * 78 + "\n")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
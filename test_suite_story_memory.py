@@ -0,0 +1,141 @@
+# test_suite_story_memory.py
+# -*- coding: utf-8 -*-
+
+"""
+Prüft das Langzeitgedächtnis der Erzählung (class_folder/core/story_memory.py):
+ein altes, passendes Ereignis gelangt in den Erzähl-Prompt, die letzten Ereignisse
+werden nicht doppelt eingefügt, Token-Budget und top_k werden eingehalten, und
+neue Ereignisse sind ohne Neuaufbau sofort auffindbar.
+Der Vektorindex wird nur geprüft, wenn numpy installiert ist (mit einem einfachen
+Buchstaben-Embedding statt eines Modells).
+Benötigt kein Modell und keinen laufenden Dienst.
+"""
+
+import logging
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from class_folder.core.database_manager import DatabaseManager
+from class_folder.core.story_memory import StoryMemory, NUMPY_AVAILABLE, estimate_tokens
+from class_folder.game_logic.base_game_manager import BaseGameManager
+
+# --- KONFIGURATION ---
+FILLER_EVENTS = 200
+TOKEN_BUDGET = 120
+OLD_INPUT = "Ich verstecke das Drachenei im hohlen Baum am Mühlbach."
+OLD_OUTPUT = "Du schiebst das schimmernde Drachenei tief in den hohlen Baum. Niemand hat dich gesehen."
+QUERY = "Ich gehe zurück zum hohlen Baum und hole das Drachenei."
+
+
+class HashEmbedder:
+    """Wort-Hashing als Ersatz für ein Satzmodell: gleiche Wörter ergeben ähnliche Vektoren."""
+    model_name = "test-hash"
+    dimension = 64
+
+    def encode(self, texts):
+        import numpy as np
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.strip('.,"').encode()) % self.dimension] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-9)
+
+
+def create_game(db: DatabaseManager):
+    ids = db.create_world_and_player("Gedächtniswelt", "lore", "system_fantasy", 1, "Held", "bs",
+                                     {"Stärke": 12}, "Mühlbach", "desc", {"health": 100})
+    db.save_event(ids["world_id"], ids["player_id"], OLD_INPUT, OLD_OUTPUT, [], [])
+    for i in range(FILLER_EVENTS):
+        db.save_event(ids["world_id"], ids["player_id"], f"Ich wandere weiter nach Osten ({i}).",
+                      f"Der Weg führt durch Felder und Hügel, Abschnitt {i}.", [], [])
+    return ids
+
+
+def run_checks() -> bool:
+    logging.disable(logging.WARNING)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(Path(tmp_dir) / "memory.db")
+        db.setup_database()
+        ids = create_game(db)
+        world_id = ids["world_id"]
+
+        memory = StoryMemory(db, top_k=3, token_budget=TOKEN_BUDGET)
+        recent = db.get_last_events(world_id, limit=3)
+        memories = memory.retrieve(world_id, QUERY, recent)
+        results.append(("Altes Ereignis gefunden (BM25)", bool(memories) and memories[0]["player_input"] == OLD_INPUT))
+        results.append(("Token-Budget und top_k eingehalten", len(memories) <= 3
+                        and sum(m["tokens"] for m in memories) <= TOKEN_BUDGET))
+        results.append(("Chronologisch sortiert", [m["event_id"] for m in memories]
+                        == sorted(m["event_id"] for m in memories)))
+
+        # Die letzten Ereignisse stehen ohnehin im Prompt
+        db.save_event(world_id, ids["player_id"], "Ich klettere auf den Baum.", "Die Rinde ist feucht und glatt.", [], [])
+        recent = db.get_last_events(world_id, limit=3)
+        memories = memory.retrieve(world_id, "klettere Rinde Baum", recent)
+        results.append(("Letzte Ereignisse nicht doppelt", all(m["player_input"] != "Ich klettere auf den Baum."
+                                                              for m in memories)))
+        # Sofort auffindbar, sobald es nicht mehr zu den letzten gehört
+        for i in range(3):
+            db.save_event(world_id, ids["player_id"], f"Ich warte ({i}).", f"Zeit vergeht ({i}).", [], [])
+        recent = db.get_last_events(world_id, limit=3)
+        memories = memory.retrieve(world_id, "klettere Rinde Baum", recent)
+        results.append(("Neues Ereignis ohne Neuaufbau auffindbar", any(m["player_input"] == "Ich klettere auf den Baum."
+                                                                        for m in memories)))
+
+        off = StoryMemory(db, top_k=0)
+        results.append(("Abgeschaltet liefert nichts", off.build_context(world_id, QUERY, recent) == ""))
+        results.append(("Keine Treffer liefert nichts", memory.build_context(world_id, "Raumschiff Laserkanone", recent) == ""))
+
+        manager = BaseGameManager(db, story_memory=memory)
+        manager._load_game_state(world_id, ids["player_id"])
+        prompt = manager._build_creative_rag_prompt(QUERY)
+        memory_pos = prompt.find("**Frühere Ereignisse (Erinnerung):**")
+        results.append(("Erinnerung im Erzähl-Prompt", memory_pos != -1 and OLD_OUTPUT in prompt
+                        and memory_pos < prompt.find("**Letzte Ereignisse:**")))
+        manager.story_memory = off
+        extra_tokens = estimate_tokens(prompt) - estimate_tokens(manager._build_creative_rag_prompt(QUERY))
+        results.append(("Prompt wächst höchstens um das Budget", 0 < extra_tokens <= TOKEN_BUDGET + 20))
+        stats = memory.get_stats()
+
+        print("\n" + "=" * 78)
+        print(" " * 22 + "LANGZEITGEDÄCHTNIS DER ERZÄHLUNG")
+        print("=" * 78)
+        print(f"  {FILLER_EVENTS + 5} Ereignisse, {stats['retrievals']} Suchen, im Mittel {stats['avg_ms']} ms, "
+              f"{stats['avg_injected_events']} Ereignisse / {stats['avg_injected_tokens']} Tokens eingefügt")
+        print(f"  Erzähl-Prompt mit Erinnerung: +{extra_tokens} Tokens (Budget {TOKEN_BUDGET})")
+
+        if NUMPY_AVAILABLE:
+            index_dir = Path(tmp_dir) / "story_memory"
+            vector_memory = StoryMemory(db, top_k=3, token_budget=TOKEN_BUDGET, embedder=HashEmbedder(),
+                                        index_dir=index_dir)
+            indexed = vector_memory.sync_world(world_id)
+            # Ohne gemeinsames Stichwort findet nur der Vektorindex etwas
+            results.append(("Vektorindex vollständig aufgebaut", indexed == FILLER_EVENTS + 5))
+            db.save_event(world_id, ids["player_id"], "Ich füttere das Pony.", "Das Pony schnaubt zufrieden.", [], [])
+            vector_memory.record_event(world_id)
+            vector_memory.close()
+            reloaded = StoryMemory(db, top_k=3, token_budget=TOKEN_BUDGET, embedder=HashEmbedder(), index_dir=index_dir)
+            results.append(("Vektorindex inkrementell und persistent", reloaded.sync_world(world_id) == 0
+                            and len(reloaded._world_index(world_id)) == FILLER_EVENTS + 6))
+            memories = reloaded.retrieve(world_id, QUERY, db.get_last_events(world_id, limit=3))
+            results.append(("Altes Ereignis gefunden (BM25 + Vektor)", any(m["player_input"] == OLD_INPUT for m in memories)))
+            reloaded.close()
+        else:
+            print("  numpy nicht installiert: Vektorindex übersprungen")
+        db.close_connection()
+
+    for name, ok in results:
+        print(f"  {name:<44} {'✅' if ok else '❌'}")
+    print("=" * 78 + "\n")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
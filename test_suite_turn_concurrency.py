@@ -0,0 +1,215 @@
+# test_suite_turn_concurrency.py
+# -*- coding: utf-8 -*-
+
+"""
+Prüft die Nebenläufigkeit der Spielzüge im Backend ohne Modell und ohne Dienst:
+  - WorldTurnScheduler: Züge einer Welt strikt nacheinander in Ankunftsreihenfolge,
+    andere Welten laufen währenddessen weiter,
+  - WorldConsequenceWorker: Aufträge einer Welt in Einreichungsreihenfolge,
+    `wait_for_world` wartet auf sie, ein fehlgeschlagener Auftrag hält die Welt
+    nicht an, `drain` wartet auf alle Welten (mit Zeitlimit),
+  - GameSessionPool: Wiederverwendung, Verdrängung nach LRU, Leerlauf und Speicher,
+  - GameManagerOnline mit Hintergrund-Konsequenzen: der nächste Zug sieht das
+    Ereignis des vorigen, und scheitert die Analyse der Erzählung, wird das
+    Ereignis trotzdem gespeichert.
+"""
+
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from class_folder.core.database_manager import DatabaseManager
+from class_folder.core.turn_scheduler import WorldTurnScheduler
+from class_folder.core.consequence_worker import WorldConsequenceWorker
+from class_folder.game_logic.game_manager_online import GameManagerOnline
+from class_folder.game_logic.session_pool import GameSessionPool
+
+# --- KONFIGURATION ---
+TURN_SECONDS = 0.05
+TURNS_PER_WORLD = 4
+NARRATIVES = ["Der Wind streicht über die Felder.", "Ein Rabe krächzt im alten Turm."]
+
+
+async def check_scheduler() -> list:
+    scheduler = WorldTurnScheduler()
+    log, running = [], {1: 0, 2: 0}
+    overlap = {"max": 0}
+
+    async def turn(world_id: int, number: int):
+        async with scheduler.turn(world_id):
+            running[world_id] += 1
+            overlap["max"] = max(overlap["max"], running[world_id])
+            log.append((world_id, number, "start"))
+            await asyncio.sleep(TURN_SECONDS)
+            log.append((world_id, number, "end"))
+            running[world_id] -= 1
+
+    tasks = [asyncio.create_task(turn(1, n)) for n in range(TURNS_PER_WORLD)]
+    await asyncio.sleep(0)
+    depth_while_busy = scheduler.get_queue_depth(1)
+    started_at = time.perf_counter()
+    await turn(2, 0)
+    other_world_seconds = time.perf_counter() - started_at
+    await asyncio.gather(*tasks)
+    world_one = [number for world_id, number, event in log if world_id == 1 and event == "start"]
+    stats = scheduler.get_stats()["worlds"]["1"]
+    return [
+        ("Züge einer Welt nacheinander", overlap["max"] == 1),
+        ("Ankunftsreihenfolge (FIFO)", world_one == list(range(TURNS_PER_WORLD))),
+        ("Andere Welt wartet nicht", other_world_seconds < TURN_SECONDS * 2),
+        ("Warteschlange gezählt", depth_while_busy == TURNS_PER_WORLD and stats["max_queue_depth"] == TURNS_PER_WORLD
+         and stats["turns_completed"] == TURNS_PER_WORLD and stats["queue_depth"] == 0),
+    ]
+
+
+async def check_consequence_worker() -> list:
+    worker = WorldConsequenceWorker()
+    done = []
+
+    def job(world_id: int, number: int, fail: bool = False):
+        async def run():
+            await asyncio.sleep(TURN_SECONDS / 5)
+            if fail:
+                raise RuntimeError("Analyse nicht erreichbar")
+            done.append((world_id, number))
+        return run
+
+    for number in range(TURNS_PER_WORLD):
+        worker.submit(1, job(1, number, fail=number == 1), label=f"Zug {number}")
+    worker.submit(2, job(2, 0))
+    pending_before = worker.has_pending(1)
+    await worker.wait_for_world(1)
+    world_one = [number for world_id, number in done if world_id == 1]
+    stats = worker.get_stats()["worlds"]["1"]
+
+    # drain: wartet auf alle Welten; mit Zeitlimit kehrt es auch bei hängenden Aufträgen zurück
+    worker.submit(3, job(3, 0))
+    await worker.drain(timeout=5)
+    drained = (3, 0) in done and worker.get_stats()["pending_jobs"] == 0
+
+    hanging = asyncio.Event()
+
+    async def hang():
+        await hanging.wait()
+
+    worker.submit(4, hang)
+    started_at = time.perf_counter()
+    await worker.drain(timeout=TURN_SECONDS)
+    drain_timed_out = time.perf_counter() - started_at < 1.0 and worker.has_pending(4)
+    hanging.set()
+    await worker.wait_for_world(4)
+    return [
+        ("Aufträge in Einreichungsreihenfolge", world_one == [0, 2, 3]),
+        ("wait_for_world wartet auf die Welt", pending_before and not worker.has_pending(1)),
+        ("Fehler hält die Welt nicht an", stats["jobs_failed"] == 1 and stats["jobs_completed"] == TURNS_PER_WORLD - 1),
+        ("drain wartet auf alle Welten", drained and (2, 0) in done),
+        ("drain mit Zeitlimit", drain_timed_out and not worker.has_pending(4)),
+    ]
+
+
+async def check_session_pool(db: DatabaseManager, players) -> list:
+    pool = GameSessionPool(lambda: GameManagerOnline(fake_ai(), db_manager=db), max_sessions=2)
+    first = await pool.get_session(*players[0])
+    reused = await pool.get_session(*players[0]) is first
+    await pool.get_session(*players[1])
+    await pool.get_session(*players[0])          # players[0] ist jetzt der jüngste Zugriff
+    await pool.get_session(*players[2])          # verdrängt players[1]
+    lru_ok = (pool.get_stats()["evictions_lru"] == 1 and pool.get_stats()["active_sessions"] == 2
+              and await pool.get_session(*players[0]) is first)
+    missing = await pool.get_session(9999, 9999)
+
+    idle_pool = GameSessionPool(lambda: GameManagerOnline(fake_ai(), db_manager=db), idle_timeout_seconds=0.01)
+    await idle_pool.get_session(*players[0])
+    await asyncio.sleep(0.05)
+    evicted_idle = idle_pool.evict_idle()
+
+    memory_pool = GameSessionPool(lambda: GameManagerOnline(fake_ai(), db_manager=db), max_memory_bytes=1)
+    for world_id, char_id in players:
+        await memory_pool.get_session(world_id, char_id)
+
+    invalidated = pool.invalidate(players[0][0])
+    return [
+        ("Sitzung wiederverwendet", reused and pool.get_stats()["hits"] >= 2),
+        ("LRU-Verdrängung", lru_ok),
+        ("Fehlender Spielstand", missing is None and pool.get_stats()["load_failures"] == 1),
+        ("Leerlauf-Verdrängung", evicted_idle == 1 and idle_pool.get_stats()["active_sessions"] == 0),
+        ("Speichergrenze", memory_pool.get_stats()["active_sessions"] == 1
+         and memory_pool.get_stats()["evictions_memory"] == len(players) - 1),
+        ("Invalidierung", invalidated == 1 and await pool.get_session(*players[0]) is not first),
+    ]
+
+
+def fake_ai(prompts: list = None, fail_narrative_analysis: bool = False):
+    """KI-Ersatz: Phase-1-Analyse ohne Befehle, Erzählung nach Reihenfolge, Phase-4-Analyse optional fehlerhaft."""
+    narratives = iter(NARRATIVES * 10)
+
+    async def call(prompt: str, world_name: str, adapter_type: str) -> str:
+        await asyncio.sleep(0)
+        if prompts is not None:
+            prompts.append((adapter_type, prompt))
+        if adapter_type == "NARRATIVE":
+            return next(narratives)
+        if fail_narrative_analysis and any(text in prompt for text in NARRATIVES):
+            raise RuntimeError("503 Service Unavailable")
+        return "[]"
+    return call
+
+
+async def check_deferred_turns(db: DatabaseManager, world_id: int, char_id: int) -> list:
+    worker = WorldConsequenceWorker()
+    prompts = []
+    manager = GameManagerOnline(fake_ai(prompts, fail_narrative_analysis=True), db_manager=db,
+                                consequence_worker=worker)
+    await manager.load_game_state_async(world_id, char_id)
+    first = await manager.process_player_command("Ich schaue mich um.")
+    second = await manager.process_player_command("Ich lausche.")
+    await worker.wait_for_world(world_id)
+    narrative_prompts = [prompt for adapter, prompt in prompts if adapter == "NARRATIVE"]
+    stats = worker.get_stats()["worlds"][str(world_id)]
+    return [
+        ("Erzählung sofort zurück", first["response"] == NARRATIVES[0] and second["response"] == NARRATIVES[1]),
+        ("Nächster Zug sieht das vorige Ereignis", NARRATIVES[0] in narrative_prompts[1]),
+        ("Gescheiterte Analyse: Ereignis gespeichert", stats["jobs_failed"] == 0
+         and db.get_last_events(world_id, limit=2) == [("Ich schaue mich um.", NARRATIVES[0]),
+                                                       ("Ich lausche.", NARRATIVES[1])]),
+    ]
+
+
+def run_checks() -> bool:
+    logging.disable(logging.WARNING)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(Path(tmp_dir) / "turns.db")
+        db.setup_database()
+        players = []
+        for name in ("Nordwelt", "Südwelt", "Ostwelt"):
+            ids = db.create_world_and_player(name, "lore", "system_fantasy", 1, "Held", "bs",
+                                             {"Stärke": 12}, "Feld", "desc", {"health": 100})
+            players.append((ids["world_id"], ids["player_id"]))
+
+        async def run_all():
+            results.extend(await check_scheduler())
+            results.extend(await check_consequence_worker())
+            results.extend(await check_session_pool(db, players))
+            results.extend(await check_deferred_turns(db, *players[0]))
+
+        asyncio.run(run_all())
+        db.close_connection()
+
+    print("\n" + "=" * 78)
+    print(" " * 20 + "ZÜGE, HINTERGRUND-AUFTRÄGE UND SITZUNGEN")
+    print("=" * 78)
+    for name, ok in results:
+        print(f"  {name:<44} {'✅' if ok else '❌'}")
+    print("=" * 78 + "\n")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
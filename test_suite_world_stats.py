@@ -0,0 +1,71 @@
+# test_suite_world_stats.py
+# -*- coding: utf-8 -*-
+
+"""
+Prüft die laufend gepflegte Welt-Statistik (world_stats) gegen eine Neuberechnung
+(rebuild_world_stats): auch mit zwei Spielercharakteren in derselben Welt wird jedes
+Event genau einmal gezählt, und Level/XP stammen von demselben Charakter.
+Benötigt kein Modell und keinen laufenden Dienst.
+"""
+
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Pfad hinzu
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from class_folder.core.database_manager import DatabaseManager
+
+# --- KONFIGURATION ---
+EVENTS = 6
+
+
+def add_second_player(db: DatabaseManager, world_id: int, location_id: int) -> int:
+    """Zweiter Spielercharakter in derselben Welt (die Spiel-API legt nur einen pro Welt an)."""
+    conn = db._get_connection()
+    cursor = conn.execute(
+        "INSERT INTO characters (world_id, user_id, name, is_player, backstory, current_location_id, "
+        "level, xp) VALUES (?, 1, 'Gefährtin', 1, 'bs', ?, 4, 320)", (world_id, location_id))
+    conn.commit()
+    return cursor.lastrowid
+
+
+def run_checks() -> bool:
+    logging.disable(logging.WARNING)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(Path(tmp_dir) / "stats.db")
+        db.setup_database()
+        ids = db.create_world_and_player("Zweierwelt", "lore", "system_fantasy", 1, "Held", "bs",
+                                         {"Stärke": 12}, "Lager", "desc", {"health": 100})
+        world_id = ids["world_id"]
+        second_id = add_second_player(db, world_id, db.get_player_location(world_id))
+
+        for i in range(EVENTS):
+            char_id = ids["player_id"] if i % 2 else second_id
+            db.save_event(world_id, char_id, "" if i == 0 else f"Aktion {i}", f"Antwort {i}", [], [])
+        incremental = db.get_world_statistics(world_id)
+        db.rebuild_world_stats(world_id)
+        rebuilt = db.get_world_statistics(world_id)
+        db.close_connection()
+
+    print("\n" + "=" * 78)
+    print(" " * 22 + "WELT-STATISTIK MIT ZWEI SPIELERN")
+    print("=" * 78)
+    for label, stats in (("laufend", incremental), ("neu berechnet", rebuilt)):
+        print(f"  {label:<14} {stats.get('total_events')} Events, {stats.get('player_actions')} Aktionen, "
+              f"Level {stats.get('character_level')} / {stats.get('character_xp')} XP")
+    results.append(("Jedes Event genau einmal gezählt", incremental.get("total_events") == EVENTS
+                    and incremental.get("player_actions") == EVENTS - 1))
+    results.append(("Gleich wie die Neuberechnung", incremental == rebuilt))
+
+    for name, ok in results:
+        print(f"  {name:<44} {'✅' if ok else '❌'}")
+    print("=" * 78 + "\n")
+    return all(ok for _, ok in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
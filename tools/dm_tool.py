@@ -11,6 +11,7 @@ import sys
 import logging
 from pathlib import Path
 import textwrap
+import itertools
 
 # Add the project root to the system path to allow imports from the 'class' package
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -50,19 +51,21 @@ def review_events():
     db_manager = DatabaseManager()
     
     try:
-        events_to_review = db_manager.get_events_for_review(label='neutral')
+        # Read page by page so the first event shows up immediately, even for long queues
+        events_to_review = db_manager.iter_events_for_review(label='neutral')
+        first_event = next(events_to_review, None)
     except Exception as e:
         logger.error(f"Failed to connect to the database or fetch events: {e}")
         return
 
-    if not events_to_review:
+    if first_event is None:
         print("Keine neuen Ereignisse zum Bewerten gefunden. Alles ist auf dem neuesten Stand!")
         return
 
-    print_header(f"{len(events_to_review)} Ereignisse warten auf eine Bewertung.")
+    print_header("Ereignisse warten auf eine Bewertung.")
     
     reviewed_count = 0
-    for event in events_to_review:
+    for event in itertools.chain([first_event], events_to_review):
         event_id = event['event_id']
         player_input = event['player_input']
         ai_output = event['ai_output']
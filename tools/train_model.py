@@ -81,7 +81,7 @@ def run_training(world_id: int):
 
         world_name = world_info.get('name', f'world_{world_id}').replace(" ", "_")
         
-        events_for_training = db_manager.get_events_for_review(label='gut (Training)', world_id=world_id)
+        events_for_training = db_manager.get_events_for_review(label='gut (Training)', world_id=world_id, include_archive=True)
         if not events_for_training:
             print(f"\nFehler: Keine als 'gut (Training)' markierten Ereignisse für Welt '{world_name}' (ID: {world_id}) gefunden.")
             return
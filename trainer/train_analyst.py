@@ -7,6 +7,7 @@ Dieses Skript führt den gesamten Prozess des Analyse-Modell-Trainings aus:
    und löscht den alten.
 """
 import logging
+import os
 import sys
 import shutil
 import datetime
@@ -33,7 +34,8 @@ def main():
     if CAN_GENERATE_DATA:
         print("-" * 50)
         logger.info("Aktualisiere Trainingsdaten aus DM-Korrekturen...")
-        generate_data()
+        # TRAINING_SNAPSHOT=latest liest den neuesten Snapshot statt der Live-Datenbank
+        generate_data(os.environ.get("TRAINING_SNAPSHOT"))
         logger.info("Aktualisierung der DM-Daten abgeschlossen.")
         print("-" * 50)
     else:
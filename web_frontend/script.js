@@ -270,6 +270,16 @@ document.addEventListener('DOMContentLoaded', () => {
         chatContainer.appendChild(messageDiv);
         feather.replace();
         chatContainer.scrollTop = chatContainer.scrollHeight;
+        return messageDiv;
+    }
+
+    // Ersetzt den Text einer bestehenden Story-Nachricht (z.B. während des Streamings)
+    function updateStoryMessage(messageDiv, text) {
+        let processedContent = escapeHTML(text);
+        processedContent = processedContent.replace(/\*\*(.*?)\*\*/g, '<b>$1</b>');
+        processedContent = processedContent.replace(/\*(.*?)\*/g, '<i>$1</i>');
+        messageDiv.innerHTML = processedContent.split('\n').map(p => `<p>${p}</p>`).join('');
+        chatContainer.scrollTop = chatContainer.scrollHeight;
     }
 
     // --- Authentication ---
@@ -614,14 +624,51 @@ document.addEventListener('DOMContentLoaded', () => {
         sendButton.innerHTML = '<i data-feather="loader" class="w-5 h-5 animate-spin"></i>';
         feather.replace();
 
+        const commandBody = {
+            command,
+            world_id: activeWorld.world_id,
+            player_id: activeWorld.player_id
+        };
+
         try {
-            const data = await apiRequestWithWarmup('/command', 'POST', {
-                command,
-                world_id: activeWorld.world_id,
-                player_id: activeWorld.player_id
-            });
-            
-            if (!data.response) {
+            let data = null;
+            let storyDiv = null;
+            let rollText = '';
+            let narrativeText = '';
+
+            try {
+                // Erzählung Token für Token anzeigen, sobald sie generiert wird
+                await streamCommand(commandBody, (eventName, event) => {
+                    if (eventName === 'roll') {
+                        rollText = event.text;
+                    } else if (eventName === 'token') {
+                        narrativeText += event.text;
+                    } else if (eventName === 'final') {
+                        data = event.result;
+                        return;
+                    } else if (eventName === 'error') {
+                        throw new Error(event.detail || 'Fehler im Antwort-Stream.');
+                    } else {
+                        return;
+                    }
+                    const text = rollText ? `${rollText}\n\n${narrativeText}` : narrativeText;
+                    if (!storyDiv) {
+                        storyDiv = displayMessage(text, 'story');
+                    } else {
+                        updateStoryMessage(storyDiv, text);
+                    }
+                });
+            } catch (streamError) {
+                // Ohne empfangenen Text auf den klassischen Endpunkt zurückfallen
+                if (storyDiv || data) throw streamError;
+                console.warn('⚠️ Streaming fehlgeschlagen, verwende /command:', streamError);
+                data = await apiRequestWithWarmup('/command', 'POST', commandBody);
+            }
+
+            if (data && data.event_type === 'LEVEL_UP' && !data.response) {
+                data.response = data.message;
+            }
+            if (!data || !data.response) {
                 throw new Error('Keine Antwort vom Server erhalten.');
             }
 
@@ -632,7 +679,9 @@ document.addEventListener('DOMContentLoaded', () => {
                 raw_data: data
             };
 
-            if (data.event_type === 'STORY') {
+            if (storyDiv && data.event_type === 'STORY') {
+                updateStoryMessage(storyDiv, data.response);
+            } else if (data.event_type === 'STORY') {
                 displayMessage(data.response, 'story');
             } else if (data.event_type === 'LEVEL_UP') {
                 displayMessage(data.response, 'event');
@@ -971,6 +1020,51 @@ document.addEventListener('DOMContentLoaded', () => {
     }
     
     // Erweiterte apiRequest-Funktion mit Warmup
+    // Liest einen Server-Sent-Events-Stream und ruft onEvent(eventName, data) pro Ereignis auf
+    async function readEventStream(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                let eventName = 'message';
+                const dataLines = [];
+                for (const line of rawEvent.split('\n')) {
+                    if (line.startsWith('event:')) eventName = line.slice(6).trim();
+                    else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+                }
+                if (dataLines.length) onEvent(eventName, JSON.parse(dataLines.join('\n')));
+            }
+        }
+    }
+
+    // Sendet einen Befehl an /command/stream (POST mit Token, daher fetch statt EventSource)
+    async function streamCommand(body, onEvent) {
+        await warmupServerIfNeeded();
+        const response = await fetch(`${API_BASE_URL}/command/stream`, {
+            method: 'POST',
+            headers: {
+                'Authorization': `Bearer ${authToken}`,
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            body: JSON.stringify(body)
+        });
+        if (!response.ok || !response.body) {
+            let detail = 'Ein Server-Fehler ist aufgetreten.';
+            try { detail = (await response.json()).detail || detail; } catch (e) { /* keine JSON-Antwort */ }
+            throw new Error(detail);
+        }
+        await readEventStream(response, onEvent);
+        lastServerActivity = Date.now();
+    }
+
     async function apiRequestWithWarmup(endpoint, method = 'GET', body = null) {
         // Warmup nur bei wichtigen API-Calls (nicht bei ping selbst)
         if (endpoint !== '/ping') {